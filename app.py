@@ -4,20 +4,18 @@ import streamlit as st
 
 st.set_page_config(page_title="이삿날 포장이사 견적서", layout="wide", page_icon="🚚")
 
-import pandas as pd
+import time
 from datetime import datetime, date
 import pytz
-import math
 import traceback
-import io
+
+_app_import_start = time.perf_counter()
 
 try:
     import data
     import utils
     import calculations
-    import google_drive_helper as gdrive
-    import pdf_generator
-    import excel_filler
+    import lazy_modules
 except ImportError as ie:
     st.error(f"메인 앱: 필수 유틸리티 모듈 로딩 실패 - {ie}.")
     st.stop()
@@ -32,7 +30,6 @@ try:
     import ui_tab1
     import ui_tab2
     import ui_tab3
-    import email_utils
 except ImportError as ie:
     st.error(f"메인 앱: 필수 UI/상태 모듈 로딩 실패 - {ie}.")
     if hasattr(ie, 'name') and ie.name:
@@ -43,6 +40,16 @@ except Exception as e:
     traceback.print_exc()
     st.stop()
 
+_app_import_seconds = time.perf_counter() - _app_import_start
+
+# 무거운 라이브러리(reportlab, openpyxl, Pillow, pandas, Google API)를 쓰는 모듈은 첫 사용 때 로드 (첫 화면 출력을 막지 않음)
+gdrive = lazy_modules.lazy_import("google_drive_helper")
+pdf_generator = lazy_modules.lazy_import("pdf_generator")
+excel_filler = lazy_modules.lazy_import("excel_filler")
+image_generator = lazy_modules.lazy_import("image_generator")
+email_utils = lazy_modules.lazy_import("email_utils")
+document_pipeline = lazy_modules.lazy_import("document_pipeline")
+
 st.markdown("<h1 style='text-align: center; color: #1E90FF;'>🚚 이삿날 스마트 견적 🚚</h1>", unsafe_allow_html=True)
 st.write("")
 
@@ -76,4 +83,17 @@ with tab3:
     if hasattr(ui_tab3, 'render_tab3') and callable(ui_tab3.render_tab3):
         ui_tab3.render_tab3()
     else:
-        st.error("Tab 3 UI를 로드할 수 없습니다.")
\ No newline at end of file
+        st.error("Tab 3 UI를 로드할 수 없습니다.")
+
+# 첫 화면을 그린 뒤 문서 생성/Drive 모듈과 PDF 폰트(나눔고딕)를 백그라운드에서 미리 로드 (프로세스당 한 번)
+lazy_modules.preload_in_background(
+    (gdrive, pdf_generator, excel_filler, image_generator, email_utils, document_pipeline),
+    after_load=lambda: pdf_generator.warm_up_pdf_fonts(background=False)
+)
+
+# 모듈 로드 시간 보고 (주소 끝에 ?debug=imports)
+if st.query_params.get("debug") == "imports":
+    with st.expander("모듈 로드 시간", expanded=True):
+        st.write(f"앱 시작 시 모듈 로드: {_app_import_seconds * 1000:.0f} ms")
+        for module_name, elapsed_ms, load_reason in lazy_modules.import_time_report():
+            st.write(f"- {module_name}: {elapsed_ms} ms ({load_reason})")
@@ -0,0 +1,48 @@
+# backfill_drive_app_properties.py
+"""
+기존 견적 JSON 파일에 검색용 appProperties(phone_last4, moving_date, contract_date, move_type)를 일괄 기록하는 1회성 작업.
+새로 저장되는 견적은 google_drive_helper.save_json_file 이 자동으로 기록하므로, 도입 전에 저장된 파일에만 필요합니다.
+
+    python backfill_drive_app_properties.py --dry-run
+    python backfill_drive_app_properties.py --folder-id <폴더 ID> --workers 8
+
+Streamlit 없이 .streamlit/secrets.toml 의 서비스 계정을 읽어 실행합니다.
+완료 후 google_drive_helper.PHONE_SUFFIX_SEARCH_MODE 를 "app_properties" 로 바꾸면 전화번호 검색이 Drive 서버 쿼리로 동작합니다.
+"""
+import argparse
+import logging
+import sys
+
+import notifier
+import secret_provider
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기존 견적 JSON 에 검색용 appProperties 를 기록합니다.")
+    parser.add_argument("--folder-id", default=None, help="대상 Drive 폴더 ID (기본: secrets 의 gcp_service_account.drive_folder_id)")
+    parser.add_argument("--secrets", default=secret_provider.DEFAULT_SECRETS_TOML_PATH, help="secrets.toml 경로")
+    parser.add_argument("--workers", type=int, default=8, help="동시 다운로드/기록 수")
+    parser.add_argument("--dry-run", action="store_true", help="기록하지 않고 대상 파일 수만 확인")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    notifier.set_notifier(notifier.LoggingNotifier())
+    secret_provider.set_secret_provider(secret_provider.TomlFileSecretProvider(args.secrets))
+
+    import google_drive_helper as gdrive
+    folder_id = args.folder_id or secret_provider.get_section("gcp_service_account").get("drive_folder_id")
+
+    def report_progress(done_count, total_count):
+        if done_count % 100 == 0 or done_count == total_count:
+            print(f"  {done_count}/{total_count} 기록")
+
+    counts = gdrive.backfill_quote_app_properties(folder_id=folder_id, dry_run=args.dry_run,
+                                                  max_workers=args.workers, progress_callback=report_progress)
+    action_label = "기록 예정" if args.dry_run else "기록"
+    print(f"JSON {counts['listed']}개: 최신 {counts['up_to_date']}, {action_label} {counts['stamped']}, "
+          f"기록 실패 {counts['failed']}, 읽기 실패 {counts['load_failed']}")
+    return 1 if counts["failed"] or counts["load_failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
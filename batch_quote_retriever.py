@@ -4,125 +4,21 @@ import pandas as pd
 import os
 from datetime import date, datetime, timedelta 
 import pytz
-import math 
 import io 
 
 # 기존 프로젝트 모듈 임포트
 try:
-    import google_drive_helper as gdrive
-    import calculations
-    import data 
+    import quote_store # 로컬 SQLite 견적 저장소 (Drive 와 동기화, 사용할 수 없으면 Drive 직접 검색)
+    import quote_summary # 저장 시 기록된 요약(appProperties)을 읽고, 없으면 견적 내용으로 계산
 except ImportError as e:
-    st.error(f"오류: 필요한 모듈(google_drive_helper, calculations, data)을 찾을 수 없습니다: {e}")
+    st.error(f"오류: 필요한 모듈(quote_store, quote_summary)을 찾을 수 없습니다: {e}")
     st.stop()
 
-# 시간대 및 기본값
+# 시간대
 try:
     KST = pytz.timezone("Asia/Seoul")
 except pytz.UnknownTimeZoneError:
     KST = pytz.utc
-TODAY_DATE_OBJECT = datetime.now(KST).date()
-
-if 'MOVE_TYPE_OPTIONS_BR' not in globals() and hasattr(data, 'item_definitions'): 
-    MOVE_TYPE_OPTIONS_BR = list(data.item_definitions.keys()) if data.item_definitions and isinstance(data.item_definitions, dict) else ["가정 이사 🏠", "사무실 이사 🏢"]
-elif 'MOVE_TYPE_OPTIONS_BR' not in globals():
-    MOVE_TYPE_OPTIONS_BR = ["가정 이사 🏠", "사무실 이사 🏢"]
-
-DEFAULT_METHOD_BR = data.METHOD_OPTIONS[0] if hasattr(data, 'METHOD_OPTIONS') and data.METHOD_OPTIONS else "계단 🚶"
-DEFAULT_STORAGE_TYPE_BR = data.DEFAULT_STORAGE_TYPE if hasattr(data, 'DEFAULT_STORAGE_TYPE') else "컨테이너 보관 📦"
-
-
-def get_minimal_default_state_for_calc():
-    """calculations.py가 요구하는 최소한의 기본 상태값 반환"""
-    return {
-        "base_move_type": MOVE_TYPE_OPTIONS_BR[0],
-        "is_storage_move": False, "apply_long_distance": False, "has_via_point": False,
-        "moving_date": TODAY_DATE_OBJECT, 
-        "arrival_date": TODAY_DATE_OBJECT,
-        "contract_date": TODAY_DATE_OBJECT, # 계약일 기본값 추가
-        "from_floor": "1", "to_floor": "1",
-        "from_method": DEFAULT_METHOD_BR, "to_method": DEFAULT_METHOD_BR,
-        "via_point_method": DEFAULT_METHOD_BR,
-        "final_selected_vehicle": "1톤", 
-        "add_men": 0, "add_women": 0,
-        "remove_base_housewife": False, "remove_base_man": False,
-        "sky_hours_from": 1, "sky_hours_final": 1,
-        "adjustment_amount": 0,
-        "departure_ladder_surcharge_manual": 0, "arrival_ladder_surcharge_manual": 0,
-        "storage_duration": 1, "storage_type": DEFAULT_STORAGE_TYPE_BR,
-        "storage_use_electricity": False,
-        "long_distance_selector": data.long_distance_options[0] if hasattr(data, 'long_distance_options') and data.long_distance_options else "선택 안 함",
-        "has_waste_check": False, "waste_tons_input": 0.5,
-        "date_opt_0_widget": False, "date_opt_1_widget": False, "date_opt_2_widget": False,
-        "date_opt_3_widget": False, "date_opt_4_widget": False,
-        "via_point_surcharge": 0,
-        "issue_tax_invoice": False, 
-        "card_payment": False,      
-    }
-
-def get_relevant_costs_from_state(loaded_state_data):
-    """
-    로드된 견적 상태를 기반으로, VAT/카드 수수료 전의 총 이사비용과
-    보관이사시 각 레그별 비용요소, 주요 날짜 및 연락처를 계산합니다.
-    """
-    temp_state = get_minimal_default_state_for_calc() 
-    
-    if loaded_state_data and isinstance(loaded_state_data, dict):
-        for key, value in loaded_state_data.items():
-            if key in ["moving_date", "arrival_date", "contract_date"] and isinstance(value, str): # contract_date 추가
-                try: temp_state[key] = date.fromisoformat(value)
-                except ValueError: temp_state[key] = TODAY_DATE_OBJECT
-            elif key in temp_state and isinstance(temp_state[key], (int, float)) and not isinstance(value, (int, float)):
-                try:
-                    if isinstance(temp_state[key], float): temp_state[key] = float(value or 0.0)
-                    else: temp_state[key] = int(float(value or 0))
-                except (ValueError, TypeError):
-                     pass 
-            elif key.startswith("qty_") or key in temp_state : 
-                temp_state[key] = value
-            
-    temp_state['issue_tax_invoice'] = False
-    temp_state['card_payment'] = False
-
-    overall_pre_vat_total_cost, cost_items_pre_vat, _ = calculations.calculate_total_moving_cost(temp_state)
-
-    departure_specific_sum = 0
-    arrival_specific_sum = 0
-    storage_fee_sum = 0
-    common_splitable_sum = 0
-
-    DEPARTURE_COST_LABELS = ["출발지 사다리차", "출발지 스카이 장비", "출발지 수동 사다리 추가", "출발지 수동 사다리 할인"] # 할인 항목도 고려
-    ARRIVAL_COST_LABELS = ["도착지 사다리차", "도착지 스카이 장비", "도착지 수동 사다리 추가", "도착지 수동 사다리 할인"] # 할인 항목도 고려
-    STORAGE_COST_LABEL = "보관료"
-    EXCLUDE_LABELS_FOR_COMMON = DEPARTURE_COST_LABELS + ARRIVAL_COST_LABELS + [STORAGE_COST_LABEL, "오류", "부가세 (10%)", "카드결제 (VAT 및 수수료 포함)"]
-
-
-    for name, cost, _note in cost_items_pre_vat:
-        cost_int = 0
-        try: cost_int = int(float(cost or 0))
-        except: pass
-
-        if name in DEPARTURE_COST_LABELS:
-            departure_specific_sum += cost_int
-        elif name in ARRIVAL_COST_LABELS:
-            arrival_specific_sum += cost_int
-        elif name == STORAGE_COST_LABEL:
-            storage_fee_sum = cost_int 
-        elif name not in EXCLUDE_LABELS_FOR_COMMON:
-            common_splitable_sum += cost_int
-            
-    return {
-        "overall_pre_vat_total": overall_pre_vat_total_cost,
-        "common_splitable": common_splitable_sum,
-        "departure_specific": departure_specific_sum,
-        "arrival_specific": arrival_specific_sum,
-        "storage_fee": storage_fee_sum,
-        "is_storage_move": temp_state.get("is_storage_move", False),
-        "moving_date": temp_state.get("moving_date"),
-        "arrival_date": temp_state.get("arrival_date"),
-        "contract_date": temp_state.get("contract_date"), # 계약일 반환 추가
-        "customer_phone": temp_state.get("customer_phone", "정보없음") 
-    }
 
 
 st.set_page_config(page_title="이사 정보 일괄 조회", layout="wide")
@@ -171,19 +67,21 @@ if st.button("📊 일괄 조회 및 Excel 생성"):
         gdrive_folder_id = st.secrets.get("gcp_service_account", {}).get("drive_folder_id")
         
         with st.spinner(f"{len(phone_list_to_process)}개의 번호에 대해 데이터 조회 및 처리 중..."):
-            all_json_files_cache = {} 
-            
-            temp_all_files = gdrive.find_files_by_name_contains(name_query=".json", mime_types="application/json", folder_id=gdrive_folder_id)
-            if temp_all_files:
-                all_json_files_cache = {os.path.splitext(f['name'])[0]: f['id'] for f in temp_all_files if f.get('name','').endswith('.json')}
-            else:
-                st.warning("Google Drive에서 JSON 파일을 찾지 못했습니다. 저장된 견적이 있는지 확인해주세요.")
-
-
-            for idx, last_4_digits in enumerate(phone_list_to_process):
-                st.progress((idx + 1) / len(phone_list_to_process), text=f"처리중: {last_4_digits} ({idx+1}/{len(phone_list_to_process)})")
-                
-                matched_phone_files = {phone: file_id for phone, file_id in all_json_files_cache.items() if phone.endswith(last_4_digits)}
+            lookup_plan = []
+            for last_4_digits in phone_list_to_process:
+                matched_phone_files = quote_store.find_quotes_by_phone_suffix(last_4_digits, folder_id=gdrive_folder_id)
+                lookup_plan.append((last_4_digits, matched_phone_files))
+
+            # 모든 대상 파일의 요약을 한 번에 요청 (요약이 없는 파일만 저장소의 견적 내용으로 계산)
+            # 결과는 입력 순서대로 도착하는 대로 받으므로 진행 표시가 실제 처리에 맞춰 올라감
+            all_matched_files = [file_info for _, matched in lookup_plan for file_info in matched]
+            summaries_iter = quote_summary.iter_quote_summaries(
+                all_matched_files, max_workers=quote_summary.BATCH_DOWNLOAD_WORKERS,
+                state_loader=lambda file_ids: quote_store.load_quote_states(file_ids, folder_id=gdrive_folder_id))
+
+            progress_bar = st.progress(0.0, text=f"처리중: 0/{len(lookup_plan)}")
+            for idx, (last_4_digits, matched_phone_files) in enumerate(lookup_plan):
+                progress_bar.progress(idx / len(lookup_plan), text=f"처리중: {last_4_digits} ({idx+1}/{len(lookup_plan)})")
 
                 if not matched_phone_files:
                     results_data.append({
@@ -193,23 +91,23 @@ if st.button("📊 일괄 조회 및 Excel 생성"):
                     })
                     continue
 
-                for full_phone_filename_stem, file_id in matched_phone_files.items():
-                    loaded_state = gdrive.load_json_file(file_id)
-                    if not loaded_state:
+                for _ in matched_phone_files:
+                    file_info, costs_info, summary_error = next(summaries_iter)
+                    full_phone_filename_stem = os.path.splitext(file_info['name'])[0]
+                    if not costs_info:
                         results_data.append({
                             "조회번호(끝4자리)": last_4_digits, "구분": "오류", 
                             "계약일": "", "이삿날": "", "연락처": full_phone_filename_stem, 
                             "이사비(VAT전)": "", "파일명": f"{full_phone_filename_stem}.json", 
-                            "상태": "파일 로드 또는 JSON 파싱 실패"
+                            "상태": summary_error
                         })
                         continue
 
                     try:
-                        costs_info = get_relevant_costs_from_state(loaded_state)
                         moving_date_obj = costs_info["moving_date"]
                         contract_date_obj = costs_info["contract_date"] # 계약일 객체 가져오기
                         
-                        customer_phone_val = loaded_state.get("customer_phone", "").strip()
+                        customer_phone_val = costs_info["customer_phone"]
                         if not customer_phone_val or customer_phone_val == "정보없음":
                             customer_phone_val = full_phone_filename_stem 
 
@@ -247,18 +145,14 @@ if st.button("📊 일괄 조회 및 Excel 생성"):
                                 "파일명": f"{full_phone_filename_stem}.json", "상태": "성공"
                             })
                     except Exception as e_proc:
-                        contact_on_error = loaded_state.get("customer_phone", "").strip()
-                        if not contact_on_error or contact_on_error == "정보없음":
-                            contact_on_error = full_phone_filename_stem
-
                         results_data.append({
                             "조회번호(끝4자리)": last_4_digits, "구분": "오류", 
-                            "계약일": loaded_state.get("contract_date", ""), # 오류 시에도 계약일 시도
-                            "이삿날": loaded_state.get("moving_date", ""), 
-                            "연락처": contact_on_error,
+                            "계약일": "", "이삿날": "", 
+                            "연락처": costs_info["customer_phone"] or full_phone_filename_stem,
                             "이사비(VAT전)": "", "파일명": f"{full_phone_filename_stem}.json", 
                             "상태": f"데이터 처리 중 오류: {str(e_proc)[:100]}" 
                         })
+            progress_bar.progress(1.0, text=f"처리 완료: {len(lookup_plan)}/{len(lookup_plan)}")
         
         if results_data:
             df_results = pd.DataFrame(results_data)
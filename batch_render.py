@@ -0,0 +1,230 @@
+# batch_render.py
+"""
+브라우저 세션 없이 저장된 견적(JSON)들을 문서로 일괄 생성하는 명령줄 도구.
+
+    python -m batch_render render --input "quotes/*.json" --out rendered --formats customer-pdf,form-image,form-excel --jobs 4
+
+형식 (이름 -> 파일 확장자):
+- customer-pdf   -> .pdf  : 고객용 견적서 PDF (pdf_generator.generate_pdf)
+- customer-image -> .jpg  : 고객용 견적서 이미지 (pdf_generator.generate_quote_image)
+- form-image     -> .png  : 내부 검토용 양식 이미지 (image_generator.create_quote_image)
+- form-excel     -> .xlsx : 내부용 Excel (excel_filler.fill_final_excel_template)
+
+출력 파일은 out/<입력 경로>.<확장자> 이며, 입력 경로는 모든 입력 파일의 공통 상위 폴더 기준 상대 경로입니다.
+입력이 한 폴더에 있으면 파일명만 쓰고, 여러 폴더에 같은 파일명이 있어도 폴더 구조를 유지하므로 서로 덮어쓰지 않습니다.
+
+견적 파일은 프로세스 풀에서 나눠 처리합니다. 작업 프로세스는 notifier 를 LoggingNotifier 로 바꿔
+생성기의 오류/경고 메시지를 화면 대신 로그와 결과 보고서(render_report.json)에 남깁니다.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import notifier
+
+DEFAULT_FORMATS = ("customer-pdf", "form-image", "form-excel")
+REPORT_FILE_NAME = "render_report.json"
+
+logger = logging.getLogger("batch_render")
+
+
+def _render_pdf(customer_state, internal_state, cost_result):
+    import pdf_generator
+    total_cost, cost_items, personnel_info = cost_result
+    return pdf_generator.generate_pdf(customer_state, cost_items, total_cost, personnel_info)
+
+
+def _render_quote_image(customer_state, internal_state, cost_result):
+    import pdf_generator
+    total_cost, cost_items, personnel_info = cost_result
+    return pdf_generator.generate_quote_image(customer_state, cost_items, total_cost, personnel_info)
+
+
+def _render_form_image(customer_state, internal_state, cost_result):
+    import image_generator
+    total_cost, cost_items, personnel_info = cost_result
+    return image_generator.create_quote_image(internal_state, cost_items, total_cost, personnel_info)
+
+
+def _render_excel(customer_state, internal_state, cost_result):
+    import excel_filler
+    total_cost, cost_items, personnel_info = cost_result
+    return excel_filler.fill_final_excel_template(internal_state, cost_items, total_cost, personnel_info)
+
+
+# 형식 이름 -> (생성 함수, 파일 확장자, 설명)
+_RENDERERS = {
+    "customer-pdf": (_render_pdf, "pdf", "고객용 견적서 PDF"),
+    "customer-image": (_render_quote_image, "jpg", "고객용 견적서 이미지"),
+    "form-image": (_render_form_image, "png", "내부 검토용 양식 이미지"),
+    "form-excel": (_render_excel, "xlsx", "내부용 Excel"),
+}
+RENDER_FORMATS = tuple(_RENDERERS)
+
+
+def expand_input_patterns(patterns):
+    """glob 패턴(또는 파일/폴더 경로) 목록을 중복 없는 JSON 파일 목록으로 펼칩니다 (입력 순서 유지)."""
+    quote_paths = []
+    seen_paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matched_paths = sorted(glob.glob(os.path.join(pattern, "*.json")))
+        else:
+            matched_paths = sorted(glob.glob(pattern)) or ([pattern] if os.path.isfile(pattern) else [])
+        for path in matched_paths:
+            if path not in seen_paths:
+                seen_paths.add(path)
+                quote_paths.append(path)
+    return quote_paths
+
+
+def output_stems(quote_paths):
+    """
+    입력 파일별 출력 경로(확장자 제외, out 폴더 기준): 모든 입력의 공통 상위 폴더 기준 상대 경로.
+    서로 다른 입력이 같은 출력 경로가 되면 (예: a.json 과 a.JSON) ValueError.
+    """
+    absolute_dirs = [os.path.dirname(os.path.abspath(path)) for path in quote_paths]
+    common_dir = os.path.commonpath(absolute_dirs) if absolute_dirs else ""
+    stems = {}
+    inputs_by_stem = {}
+    for path in quote_paths:
+        stem = os.path.splitext(os.path.relpath(os.path.abspath(path), common_dir))[0]
+        stems[path] = stem
+        inputs_by_stem.setdefault(os.path.normcase(stem), []).append(path)
+    collisions = [paths for paths in inputs_by_stem.values() if len(paths) > 1]
+    if collisions:
+        raise ValueError("출력 파일 이름이 겹치는 입력: " + "; ".join(", ".join(paths) for paths in collisions[:5]))
+    return stems
+
+
+def _init_render_worker(log_level):
+    logging.basicConfig(level=log_level, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    notifier.set_notifier(notifier.LoggingNotifier())
+
+
+def render_quote_file(quote_path, out_dir, formats, output_stem=None):
+    """
+    견적 JSON 하나를 요청한 형식들로 생성해 out_dir/<output_stem>.<확장자> 로 저장합니다 (기본: 입력 파일명).
+    반환: {"input", "outputs": {형식: 경로}, "errors": {형식: 메시지}, "messages": [(level, message)], "seconds"}
+    """
+    import calculations
+    import document_pipeline
+    import quote_state
+
+    start = time.perf_counter()
+    report = {"input": quote_path, "outputs": {}, "errors": {}, "messages": []}
+    active_notifier = notifier.get_notifier()
+    try:
+        with open(quote_path, "rb") as f:
+            saved_data = quote_state.decode_saved_data(f.read()) # v2/gzip 저장 형식도 v1 형태로 펼침
+        if not isinstance(saved_data, dict):
+            raise ValueError("견적 JSON 이 객체(dict) 형식이 아닙니다.")
+        state = quote_state.state_from_saved_data(saved_data)
+        cost_result = calculations.calculate_total_moving_cost(state)
+        customer_state, internal_state = document_pipeline.build_document_states(state)
+
+        output_base = os.path.join(out_dir, output_stem or os.path.splitext(os.path.basename(quote_path))[0])
+        os.makedirs(os.path.dirname(output_base), exist_ok=True)
+        for output_format in formats:
+            renderer, extension, _description = _RENDERERS[output_format]
+            try:
+                rendered_bytes = renderer(customer_state, internal_state, cost_result)
+            except Exception as e:
+                logger.exception("%s: %s 생성 중 오류", quote_path, output_format)
+                rendered_bytes = None
+                report["errors"][output_format] = str(e)
+            if not rendered_bytes:
+                report["errors"].setdefault(output_format, "생성 결과 없음")
+                continue
+            output_path = f"{output_base}.{extension}"
+            with open(output_path, "wb") as f:
+                f.write(rendered_bytes)
+            report["outputs"][output_format] = output_path
+    except Exception as e:
+        logger.exception("%s: 견적 파일 처리 실패", quote_path)
+        report["errors"]["input"] = str(e)
+
+    if isinstance(active_notifier, notifier.LoggingNotifier):
+        report["messages"] = active_notifier.drain()
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def render_quotes(quote_paths, out_dir, formats=DEFAULT_FORMATS, jobs=None, log_level=logging.WARNING):
+    """견적 파일들을 프로세스 풀에서 생성하고 파일별 결과 보고 목록을 반환합니다 (입력 순서)."""
+    unknown_formats = [f for f in formats if f not in _RENDERERS]
+    if unknown_formats:
+        raise ValueError(f"지원하지 않는 형식: {', '.join(unknown_formats)} (가능: {', '.join(RENDER_FORMATS)})")
+    stems = output_stems(quote_paths)
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = max(1, int(jobs or os.cpu_count() or 1))
+
+    reports = []
+    if jobs == 1:
+        previous_notifier = notifier.set_notifier(notifier.LoggingNotifier())
+        try:
+            for quote_path in quote_paths:
+                reports.append(render_quote_file(quote_path, out_dir, formats, stems[quote_path]))
+        finally:
+            notifier.set_notifier(previous_notifier)
+        return reports
+
+    chunk_size = max(1, min(32, len(quote_paths) // (jobs * 4) or 1))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker, initargs=(log_level,)) as executor:
+        for report in executor.map(render_quote_file, quote_paths,
+                                   [out_dir] * len(quote_paths), [tuple(formats)] * len(quote_paths),
+                                   [stems[path] for path in quote_paths], chunksize=chunk_size):
+            reports.append(report)
+    return reports
+
+
+def main(argv=None):
+    format_help = "; ".join(f"{name} = {description} (.{extension})" for name, (_renderer, extension, description) in _RENDERERS.items())
+    parser = argparse.ArgumentParser(prog="python -m batch_render", description="저장된 견적 JSON 을 문서로 일괄 생성합니다.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    render_parser = subparsers.add_parser(
+        "render", help="견적 JSON -> PDF/이미지/Excel",
+        description="출력은 out/<입력 경로>.<확장자> (입력 경로: 모든 입력의 공통 상위 폴더 기준, 폴더 구조 유지)."
+    )
+    render_parser.add_argument("--input", nargs="+", required=True, help="견적 JSON 파일, 폴더 또는 glob 패턴 (예: 'quotes/*.json')")
+    render_parser.add_argument("--out", required=True, help="생성 파일을 저장할 폴더")
+    render_parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help=f"쉼표로 구분한 형식 - {format_help} (기본: %(default)s)")
+    render_parser.add_argument("--jobs", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    render_parser.add_argument("--verbose", action="store_true", help="생성기 안내 메시지까지 로그로 출력")
+    args = parser.parse_args(argv)
+
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=log_level, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    quote_paths = expand_input_patterns(args.input)
+    if not quote_paths:
+        print("입력 견적 파일이 없습니다.")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        reports = render_quotes(quote_paths, args.out, formats, jobs=args.jobs, log_level=log_level)
+    except ValueError as e:
+        print(e)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    report_path = os.path.join(args.out, REPORT_FILE_NAME)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2)
+
+    failed_reports = [report for report in reports if report["errors"]]
+    output_count = sum(len(report["outputs"]) for report in reports)
+    print(f"견적 {len(reports)}건 -> 파일 {output_count}개 생성 ({elapsed:.1f}초), 실패 {len(failed_reports)}건. 보고서: {report_path}")
+    for report in failed_reports[:10]:
+        print(f"  - {report['input']}: {report['errors']}")
+    return 1 if failed_reports else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+# bulk_calculations.py
+"""
+여러 견적 상태를 한 번에 계산하는 벡터화 버전의 calculations.calculate_total_moving_cost.
+data.py 의 가격(vehicle_prices 등)을 바꾼 뒤 Drive 에 저장된 전체 견적을 다시 계산하는 용도입니다.
+
+입력 값의 형 변환(int(x or 0) 등)은 단건 함수와 동일하게 행 단위로 처리하고,
+기본 운임/사다리/스카이/인력/보관료/할증/VAT·카드 수수료/100원 올림 계산은 NumPy 열 연산으로 수행합니다.
+결과(총액, 항목별 금액, cost_items)는 단건 함수와 동일합니다.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+import data
+import calculations
+
+# 결과 DataFrame 의 항목별 금액 컬럼 (cost_items 순서와 동일)
+COMPONENT_COLUMNS = [
+    "base_fare", "departure_ladder", "departure_sky", "arrival_ladder", "arrival_sky",
+    "removed_housewife_discount", "removed_man_discount", "added_personnel",
+    "adjustment", "departure_manual_ladder", "arrival_manual_ladder",
+    "storage_fee", "long_distance", "waste_disposal", "date_surcharge", "via_point",
+    "card_fee", "vat",
+]
+
+
+def _records_from_input(states):
+    """
+    list[dict] 또는 DataFrame 을 dict 목록으로 변환합니다.
+    DataFrame 은 None 과 키 없음을 구분할 수 없으므로 NaN 은 '값 없음'(기본값 사용)으로 취급합니다.
+    """
+    if isinstance(states, pd.DataFrame):
+        records = []
+        for row in states.to_dict("records"):
+            records.append({k: v for k, v in row.items() if not (isinstance(v, float) and math.isnan(v))})
+        return records, states.index
+    records = list(states)
+    return records, pd.RangeIndex(len(records))
+
+
+def _get(records, key, default=None):
+    return [r.get(key, default) for r in records]
+
+
+def _as_int(values, default):
+    # 단건 함수의 int(state.get(key, d) or d) 와 동일한 변환
+    return np.array([int(v or default) for v in values], dtype=np.int64)
+
+
+def _int_column(records, key, default, mask):
+    """mask 가 True 인 행만 변환 (단건 함수가 해당 값을 읽는 경우에만 변환 오류가 나도록)."""
+    out = np.zeros(len(records), dtype=np.int64)
+    rows = np.flatnonzero(mask)
+    if len(rows):
+        out[rows] = _as_int([records[i].get(key, default) for i in rows], default)
+    return out
+
+
+def _as_bool(values):
+    return np.array([bool(v) for v in values], dtype=bool)
+
+
+def _map_unique(values, func):
+    cache = {}
+    out = []
+    for v in values:
+        key = v if isinstance(v, (str, int, float, bool, type(None))) else repr(v)
+        if key not in cache:
+            cache[key] = func(v)
+        out.append(cache[key])
+    return out
+
+
+def calculate_total_moving_cost_batch(states, include_line_items=True):
+    """
+    여러 견적 상태의 이사 비용을 한 번에 계산합니다.
+
+    states: 견적 상태 dict 의 리스트 또는 컬럼이 상태 키인 DataFrame
+    include_line_items: True 이면 단건 함수와 같은 cost_items / personnel_info 컬럼을 포함
+
+    반환: 입력 순서(DataFrame 이면 같은 index)의 DataFrame
+      total_cost, pre_charge_total, COMPONENT_COLUMNS, final_men, final_women, error
+      (+ cost_items, personnel_info)
+    """
+    records, index = _records_from_input(states)
+    n = len(records)
+    default_move_type = calculations.MOVE_TYPE_OPTIONS[0]
+    additional_person_cost = getattr(data, "ADDITIONAL_PERSON_COST", 0)
+
+    move_types = _get(records, 'base_move_type', default_move_type)
+    vehicles = _get(records, 'final_selected_vehicle')
+    is_storage = _as_bool(_get(records, 'is_storage_move', False))
+
+    # --- 차량 가격 정보 (유효성 포함) ---
+    vehicle_prices = getattr(data, 'vehicle_prices', {})
+    errors = [None] * n
+    base_price = np.zeros(n, dtype=np.int64)
+    base_men = np.zeros(n, dtype=np.int64)
+    base_housewife = np.zeros(n, dtype=np.int64)
+    for i, (move_type, vehicle) in enumerate(zip(move_types, vehicles)):
+        if not vehicle:
+            errors[i] = "차량 선택 필요"
+            continue
+        if not (hasattr(data, 'vehicle_prices') and move_type in vehicle_prices and vehicle in vehicle_prices[move_type]):
+            errors[i] = f"차량({vehicle}) 또는 이사유형({move_type}) 가격 정보 없음"
+            continue
+        vehicle_data = vehicle_prices[move_type][vehicle]
+        base_price[i] = vehicle_data.get("price", 0)
+        base_men[i] = vehicle_data.get("men", 0)
+        base_housewife[i] = vehicle_data.get("housewife", 0) if move_type == "가정 이사 🏠" else 0
+    valid = np.array([e is None for e in errors], dtype=bool)
+
+    components = {col: np.zeros(n, dtype=np.int64) for col in COMPONENT_COLUMNS}
+    notes = {col: [None] * n for col in COMPONENT_COLUMNS}
+
+    components["base_fare"] = np.where(is_storage, base_price * 2, base_price)
+
+    # --- 출발/도착 작업 (사다리차/스카이) ---
+    sky_base, sky_add_hr = getattr(data, 'SKY_BASE_PRICE', 0), getattr(data, 'SKY_EXTRA_HOUR_PRICE', 0)
+    for loc_prefix, floor_key, method_key, sky_hours_key, ladder_col, sky_col in [
+        ("출발지", 'from_floor', 'from_method', 'sky_hours_from', "departure_ladder", "departure_sky"),
+        ("도착지", 'to_floor', 'to_method', 'sky_hours_final', "arrival_ladder", "arrival_sky"),
+    ]:
+        methods = _get(records, method_key, '')
+        is_ladder = np.array([ok and "사다리차" in m for m, ok in zip(methods, valid)], dtype=bool)
+        is_sky = np.array([ok and "스카이" in m for m, ok in zip(methods, valid)], dtype=bool) & ~is_ladder
+
+        floor_nums = _map_unique(
+            [str(v) for v in _get(records, floor_key, '1')], calculations.get_floor_num)
+        ladder_lookup = {}
+        ladder_cost = np.zeros(n, dtype=np.int64)
+        for i in np.flatnonzero(is_ladder & valid):
+            pair = (floor_nums[i], vehicles[i])
+            if pair not in ladder_lookup:
+                ladder_lookup[pair] = calculations.get_ladder_cost(*pair)
+            ladder_cost[i], notes[ladder_col][i] = ladder_lookup[pair]
+        components[ladder_col] = np.where(ladder_cost > 0, ladder_cost, 0)
+
+        hours = np.zeros(n, dtype=np.int64)
+        sky_rows = np.flatnonzero(is_sky & valid)
+        if len(sky_rows):
+            hours[sky_rows] = _as_int([records[i].get(sky_hours_key, 1) for i in sky_rows], 1)
+        sky_total = np.where(hours > 0, sky_base + sky_add_hr * (hours - 1), 0)
+        sky_total = np.where(is_sky & valid, sky_total, 0)
+        components[sky_col] = np.where(sky_total > 0, sky_total, 0)
+        for i in np.flatnonzero(components[sky_col] > 0):
+            h = int(hours[i])
+            notes[sky_col][i] = (f"{loc_prefix}({h}h): 기본 {sky_base:,} + 추가 {sky_add_hr * (h - 1):,}"
+                                 if h > 1 else f"{loc_prefix}({h}h): 기본 {sky_base:,}")
+
+    # --- 인원 ---
+    remove_housewife = _as_bool(_get(records, 'remove_base_housewife', False)) & (base_housewife > 0)
+    remove_man = _as_bool(_get(records, 'remove_base_man', False)) & (base_men > 0)
+    components["removed_housewife_discount"] = np.where(remove_housewife, -additional_person_cost, 0)
+    components["removed_man_discount"] = np.where(remove_man, -additional_person_cost, 0)
+
+    add_men = _int_column(records, 'add_men', 0, valid)
+    add_women = _int_column(records, 'add_women', 0, valid)
+    final_men = np.maximum(0, base_men - remove_man.astype(np.int64) + add_men)
+    final_women = np.maximum(0, base_housewife - remove_housewife.astype(np.int64) + add_women)
+    added_personnel = (add_men + add_women) * additional_person_cost
+    components["added_personnel"] = np.where(added_personnel > 0, added_personnel, 0)
+
+    # --- 조정 금액 / 수동 사다리 ---
+    components["adjustment"] = _int_column(records, 'adjustment_amount', 0, valid)
+    dep_check = _as_bool(_get(records, 'manual_ladder_from_check', False)) & valid
+    arr_check = _as_bool(_get(records, 'manual_ladder_to_check', False)) & valid
+    components["departure_manual_ladder"] = _int_column(records, 'departure_ladder_surcharge_manual', 0, dep_check)
+    components["arrival_manual_ladder"] = _int_column(records, 'arrival_ladder_surcharge_manual', 0, arr_check)
+
+    # --- 보관료 ---
+    storage_rows = np.flatnonzero(is_storage & valid)
+    storage_duration = np.zeros(n, dtype=np.int64)
+    if len(storage_rows):
+        default_storage_type = getattr(data, "DEFAULT_STORAGE_TYPE", "")
+        default_units = getattr(data, 'DEFAULT_STORAGE_UNITS', 1)
+        units_map = getattr(data, 'VEHICLE_TO_STORAGE_UNITS_MAP', None)
+        unit_rates = getattr(data, 'BASE_STORAGE_UNIT_RATES', None)
+        elec_per_day = getattr(data, "STORAGE_ELECTRICITY_SURCHARGE_PER_DAY", None)
+
+        storage_records = [records[i] for i in storage_rows]
+        duration = _as_int(_get(storage_records, 'storage_duration', 1), 1)
+        storage_types = _get(storage_records, 'storage_type', default_storage_type)
+        use_elec = _as_bool(_get(storage_records, 'storage_use_electricity', False))
+        units = np.array([
+            units_map.get(vehicles[i], default_units) if (vehicles[i] and units_map is not None) else default_units
+            for i in storage_rows], dtype=np.int64)
+        unit_rate = np.array([
+            unit_rates[t] if (unit_rates is not None and t in unit_rates) else 0 for t in storage_types], dtype=np.int64)
+
+        storage_cost = unit_rate * units * duration
+        elec = (elec_per_day * duration) if (elec_per_day is not None) else np.zeros(len(storage_rows), dtype=np.int64)
+        elec = np.where(use_elec, elec, 0)
+        storage_cost = storage_cost + np.where(elec > 0, elec, 0)
+
+        components["storage_fee"][storage_rows] = storage_cost
+        storage_duration[storage_rows] = duration
+        for j, i in enumerate(storage_rows):
+            type_note = storage_types[j].split(" ")[0] if storage_types[j] else "알수없음"
+            note = f"{type_note} ({vehicles[i]} -> {units[j]}단위) {duration[j]}일"
+            if elec[j] > 0:
+                note += " (전기사용)"
+            notes["storage_fee"][i] = note
+
+    # --- 장거리 ---
+    if hasattr(data, 'long_distance_prices'):
+        apply_ld = _as_bool(_get(records, 'apply_long_distance', False)) & valid
+        ld_options = _get(records, 'long_distance_selector', '선택 안 함')
+        ld_cost = np.array([data.long_distance_prices.get(o, 0) if a else 0 for o, a in zip(ld_options, apply_ld)], dtype=np.int64)
+        components["long_distance"] = np.where(apply_ld & (ld_cost > 0), ld_cost, 0)
+        for i in np.flatnonzero(components["long_distance"] > 0):
+            notes["long_distance"][i] = ld_options[i]
+
+    # --- 폐기물 ---
+    waste_tons = [None] * n
+    if hasattr(data, 'WASTE_DISPOSAL_COST_PER_TON'):
+        has_waste = _as_bool(_get(records, 'has_waste_check', False))
+        waste_rows = np.flatnonzero(has_waste & valid)
+        if len(waste_rows):
+            tons = np.array([float(records[i].get('waste_tons_input', 0.5) or 0.5) for i in waste_rows], dtype=np.float64)
+            waste_cost = data.WASTE_DISPOSAL_COST_PER_TON * tons
+            components["waste_disposal"][waste_rows] = np.where(waste_cost > 0, np.ceil(waste_cost), 0).astype(np.int64)
+            for j, i in enumerate(waste_rows):
+                waste_tons[i] = float(tons[j])
+
+    # --- 날짜 할증 (항목별로 별도 cost_item) ---
+    date_surcharge_flags = []
+    if hasattr(data, 'special_day_prices'):
+        for i_opt, day_key in enumerate(data.special_day_prices.keys()):
+            widget_key = f"date_opt_{i_opt}_widget"
+            flag = _as_bool(_get(records, widget_key, False)) | _as_bool(_get(records, f"tab3_{widget_key}", False))
+            surcharge_val = data.special_day_prices.get(day_key, 0)
+            if surcharge_val > 0:
+                components["date_surcharge"] += np.where(flag, surcharge_val, 0)
+                date_surcharge_flags.append((flag, surcharge_val, day_key.split(" ")[0]))
+
+    # --- 경유지 ---
+    has_via = _as_bool(_get(records, 'has_via_point', False)) & valid
+    via_surcharge = _int_column(records, 'via_point_surcharge', 0, has_via)
+    components["via_point"] = np.where(has_via & (via_surcharge > 0), via_surcharge, 0)
+
+    # --- 합계 ---
+    pre_charge_columns = [c for c in COMPONENT_COLUMNS if c not in ("card_fee", "vat")]
+    for col in pre_charge_columns:
+        components[col] = np.where(valid, components[col], 0)
+    pre_charge_total = np.sum([components[c] for c in pre_charge_columns], axis=0) if n else np.zeros(0, dtype=np.int64)
+
+    card_payment = _as_bool(_get(records, 'card_payment', False))
+    issue_tax_invoice = _as_bool(_get(records, 'issue_tax_invoice', False))
+    balance_for_card = np.zeros(n, dtype=np.int64)
+    if hasattr(data, "CARD_PAYMENT_SURCHARGE_PERCENT"):
+        card_rate = data.CARD_PAYMENT_SURCHARGE_PERCENT / 100.0
+        card_applies = valid & card_payment
+        deposit = _int_column(records, 'deposit_amount', 0, card_applies)
+        balance_for_card = pre_charge_total - deposit
+        card_fee = np.ceil(balance_for_card * card_rate).astype(np.int64)
+        card_item = card_applies & (balance_for_card > 0)
+        components["card_fee"] = np.where(card_item, card_fee, 0)
+    else:
+        card_applies = np.zeros(n, dtype=bool)
+        card_item = np.zeros(n, dtype=bool)
+    # 카드결제가 아닐 때만 세금계산서 VAT 적용 (단건 함수의 if/elif 와 동일)
+    vat_item = valid & ~card_applies & issue_tax_invoice & hasattr(data, "VAT_RATE_PERCENT")
+    if hasattr(data, "VAT_RATE_PERCENT"):
+        vat = np.ceil(pre_charge_total * (data.VAT_RATE_PERCENT / 100.0)).astype(np.int64)
+        components["vat"] = np.where(vat_item, vat, 0)
+
+    total_before_rounding = pre_charge_total + components["card_fee"] + components["vat"]
+    total_cost = (np.ceil(total_before_rounding / 100) * 100).astype(np.int64)
+    total_cost = np.where(valid, total_cost, 0)
+    final_men = np.where(valid, final_men, 0)
+    final_women = np.where(valid, final_women, 0)
+
+    result = pd.DataFrame({"total_cost": total_cost, "pre_charge_total": np.where(valid, pre_charge_total, 0)}, index=index)
+    for col in COMPONENT_COLUMNS:
+        result[col] = components[col]
+    result["final_men"] = final_men
+    result["final_women"] = final_women
+    result["error"] = errors
+
+    if include_line_items:
+        cost_items_col = []
+        personnel_col = []
+        for i in range(n):
+            if errors[i] is not None:
+                cost_items_col.append([("오류", 0, errors[i])])
+                personnel_col.append({"final_men": 0, "final_women": 0})
+                continue
+            cost_items_col.append(_build_cost_items(
+                i, vehicles[i], is_storage[i], components, notes, add_men[i], add_women[i],
+                base_men[i], base_housewife[i], remove_housewife[i], remove_man[i],
+                storage_duration[i], waste_tons[i], date_surcharge_flags,
+                balance_for_card[i], card_item[i], vat_item[i], additional_person_cost))
+            personnel_col.append({
+                'base_men': int(base_men[i]), 'base_women': int(base_housewife[i]),
+                'additional_men': int(add_men[i]), 'additional_women': int(add_women[i]),
+                'removed_base_housewife_count': int(remove_housewife[i]),
+                'removed_base_men_count': int(remove_man[i]),
+                'final_men': int(final_men[i]), 'final_women': int(final_women[i]),
+            })
+        result["cost_items"] = cost_items_col
+        result["personnel_info"] = personnel_col
+    return result
+
+
+def _build_cost_items(i, vehicle, is_storage, components, notes, add_men, add_women,
+                      base_men, base_housewife, remove_housewife, remove_man,
+                      storage_duration, waste_tons, date_surcharge_flags,
+                      balance_for_card, card_item, vat_item, additional_person_cost):
+    """단건 함수와 같은 순서/라벨/비고로 cost_items 를 구성합니다."""
+    items = []
+    base_note = f"{vehicle} 기준" + (", 보관이사 왕복 적용" if is_storage else "")
+    items.append(("기본 운임", int(components["base_fare"][i]), base_note))
+    for loc_prefix, ladder_col, sky_col in [("출발지", "departure_ladder", "departure_sky"),
+                                             ("도착지", "arrival_ladder", "arrival_sky")]:
+        if components[ladder_col][i] > 0:
+            items.append((f"{loc_prefix} 사다리차", int(components[ladder_col][i]), notes[ladder_col][i]))
+        elif components[sky_col][i] > 0:
+            items.append((f"{loc_prefix} 스카이 장비", int(components[sky_col][i]), notes[sky_col][i]))
+    if remove_housewife:
+        items.append(("기본 여성 인원 중 1명 제외 할인", -additional_person_cost, f"기본 {int(base_housewife)}명 중 1명 제외"))
+    if remove_man:
+        items.append(("기본 남성 인원 중 1명 제외 할인", -additional_person_cost, f"기본 {int(base_men)}명 중 1명 제외"))
+    if components["added_personnel"][i] > 0:
+        items.append(("추가 인력", int(components["added_personnel"][i]), f"남성 {int(add_men)}명, 여성 {int(add_women)}명 추가분"))
+    adjustment = int(components["adjustment"][i])
+    if adjustment != 0:
+        items.append(("할증 조정 금액" if adjustment > 0 else "할인 조정 금액", adjustment, "수기 입력"))
+    for loc_prefix, col in [("출발지", "departure_manual_ladder"), ("도착지", "arrival_manual_ladder")]:
+        value = int(components[col][i])
+        if value != 0:
+            items.append((f"{loc_prefix} 수동 사다리 할인" if value < 0 else f"{loc_prefix} 수동 사다리 추가", value, "수동 입력"))
+    if is_storage and (components["storage_fee"][i] > 0 or storage_duration > 0):
+        items.append(("보관료", int(components["storage_fee"][i]), notes["storage_fee"][i]))
+    if components["long_distance"][i] > 0:
+        items.append(("장거리 운송료", int(components["long_distance"][i]), notes["long_distance"][i]))
+    if components["waste_disposal"][i] > 0:
+        items.append(("폐기물 처리", int(components["waste_disposal"][i]), f"{waste_tons}톤"))
+    for flag, surcharge_val, label in date_surcharge_flags:
+        if flag[i]:
+            items.append(("날짜 할증", surcharge_val, label))
+    if components["via_point"][i] > 0:
+        items.append(("경유지 추가요금", int(components["via_point"][i]), "경유지 작업"))
+    if card_item:
+        items.append(("카드결제 수수료", int(components["card_fee"][i]),
+                      f"잔액 {int(balance_for_card):,.0f}원에 {data.CARD_PAYMENT_SURCHARGE_PERCENT}% 적용"))
+    elif vat_item:
+        items.append(("부가세 (VAT)", int(components["vat"][i]), f"{data.VAT_RATE_PERCENT}% 계산서 발행 요청"))
+    return items
@@ -0,0 +1,187 @@
+# bulk_excel_export.py
+"""
+월말 보고용: 여러 견적(Drive 또는 로컬 JSON)을 하나의 엑셀 파일로 내보냅니다.
+- '견적 목록' 시트: 견적 1건 = 1행 (고객/이사 정보, 총액, 항목별 금액)
+- '비용 항목' 시트: 비용 항목 1개 = 1행 (선택)
+
+xlsxwriter 의 constant_memory 모드로 행을 순서대로 기록하고 즉시 디스크로 내보내며,
+견적은 chunk_size 단위로 bulk_calculations 로 계산하므로 수천 건도 일정한 메모리로 처리합니다.
+"""
+import io
+import os
+from datetime import date
+
+import xlsxwriter
+
+import bulk_calculations
+import quote_state
+
+DEFAULT_CHUNK_SIZE = 500
+
+# bulk_calculations.COMPONENT_COLUMNS 의 엑셀 헤더
+COMPONENT_LABELS = {
+    "base_fare": "기본 운임",
+    "departure_ladder": "출발지 사다리차",
+    "departure_sky": "출발지 스카이",
+    "arrival_ladder": "도착지 사다리차",
+    "arrival_sky": "도착지 스카이",
+    "removed_housewife_discount": "여성 인원 제외 할인",
+    "removed_man_discount": "남성 인원 제외 할인",
+    "added_personnel": "추가 인력",
+    "adjustment": "조정 금액",
+    "departure_manual_ladder": "출발지 수동 사다리",
+    "arrival_manual_ladder": "도착지 수동 사다리",
+    "storage_fee": "보관료",
+    "long_distance": "장거리 운송료",
+    "waste_disposal": "폐기물 처리",
+    "date_surcharge": "날짜 할증",
+    "via_point": "경유지 추가요금",
+    "card_fee": "카드결제 수수료",
+    "vat": "부가세",
+}
+
+# (헤더, 열 너비, 상태 dict -> 값)
+QUOTE_INFO_COLUMNS = [
+    ("고객명", 12, lambda s: s.get('customer_name', '')),
+    ("연락처", 15, lambda s: s.get('customer_phone', '')),
+    ("이사일", 12, lambda s: _date_text(s.get('moving_date', ''))),
+    ("이사 종류", 12, lambda s: s.get('base_move_type', '')),
+    ("차량", 8, lambda s: s.get('final_selected_vehicle', '')),
+    ("출발지", 40, lambda s: s.get('from_address_full', s.get('from_location', ''))),
+    ("도착지", 40, lambda s: s.get('to_address_full', s.get('to_location', ''))),
+]
+
+
+def _date_text(value):
+    return value.strftime('%Y-%m-%d') if isinstance(value, date) else str(value or '')
+
+
+def iter_states_from_json_dir(directory):
+    """
+    폴더의 *.json 견적 파일을 (파일명, 상태 dict) 로 하나씩 읽어 반환합니다 (파일명 순).
+    상태는 앱에서 불러올 때와 같이 quote_state.state_from_saved_data 로 만듭니다 (tab3_ 사다리/계약금 값 반영).
+    """
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.lower().endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, file_name), "rb") as f:
+                state = quote_state.decode_saved_data(f.read()) # v2/gzip 저장 형식도 v1 형태로 펼침
+        except (OSError, ValueError) as e:
+            print(f"Warning [bulk_excel_export]: skipping {file_name}: {e}")
+            continue
+        if isinstance(state, dict):
+            yield file_name, quote_state.state_from_saved_data(state)
+
+
+def iter_states_from_drive(file_ids, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Drive JSON 파일들을 동시에 내려받아 (file_id, 상태 dict) 로 반환합니다 (입력 순서, 실패 건 제외).
+    chunk_size 개씩 나누어 내려받으므로 메모리에는 한 묶음의 견적만 올라갑니다.
+    """
+    import google_drive_helper as gdrive
+    load_kwargs = {"max_workers": max_workers} if max_workers else {}
+    file_ids = list(file_ids)
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, len(file_ids), chunk_size):
+        for file_id, state in gdrive.load_json_files(file_ids[start:start + chunk_size], **load_kwargs):
+            if isinstance(state, dict):
+                yield file_id, quote_state.state_from_saved_data(state)
+            else:
+                print(f"Warning [bulk_excel_export]: skipping Drive file {file_id} (load failed)")
+
+
+def _iter_chunks(quote_sources, chunk_size):
+    chunk = []
+    for source in quote_sources:
+        chunk.append(source if isinstance(source, tuple) else ("", source))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_quotes_to_excel(quote_sources, output, include_cost_items=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    견적들을 하나의 엑셀 파일로 기록합니다.
+
+    quote_sources: (출처 이름, 상태 dict) 또는 상태 dict 의 iterable (제너레이터 가능)
+    output: 파일 경로 또는 쓰기 가능한 파일 객체 (BytesIO 등)
+    반환: 기록한 견적 수
+    """
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    header_format = workbook.add_format({'bold': True, 'bg_color': '#D9E1F2', 'border': 1})
+    money_format = workbook.add_format({'num_format': '#,##0'})
+
+    summary_sheet = workbook.add_worksheet("견적 목록")
+    summary_headers = (["출처"] + [header for header, _, _ in QUOTE_INFO_COLUMNS]
+                       + ["총 견적 비용", "계약금", "잔금", "남성 인원", "여성 인원"]
+                       + [COMPONENT_LABELS.get(col, col) for col in bulk_calculations.COMPONENT_COLUMNS]
+                       + ["오류"])
+    money_start_col = 1 + len(QUOTE_INFO_COLUMNS)
+    summary_sheet.set_column(0, 0, 28)
+    for col_idx, (_, width, _) in enumerate(QUOTE_INFO_COLUMNS, start=1):
+        summary_sheet.set_column(col_idx, col_idx, width)
+    summary_sheet.set_column(money_start_col, len(summary_headers) - 2, 13, money_format)
+    summary_sheet.set_column(len(summary_headers) - 1, len(summary_headers) - 1, 24)
+    summary_sheet.write_row(0, 0, summary_headers, header_format)
+    summary_sheet.freeze_panes(1, 2)
+
+    items_sheet = None
+    if include_cost_items:
+        items_sheet = workbook.add_worksheet("비용 항목")
+        items_sheet.set_column(0, 0, 28)
+        items_sheet.set_column(1, 2, 16)
+        items_sheet.set_column(3, 3, 13, money_format)
+        items_sheet.set_column(4, 4, 50)
+        items_sheet.write_row(0, 0, ["출처", "고객명", "항목", "금액", "비고"], header_format)
+        items_sheet.freeze_panes(1, 0)
+
+    summary_row = 1
+    items_row = 1
+    for chunk in _iter_chunks(quote_sources, max(1, int(chunk_size))):
+        states = [state for _, state in chunk]
+        results = bulk_calculations.calculate_total_moving_cost_batch(states, include_line_items=include_cost_items)
+        component_values = results[bulk_calculations.COMPONENT_COLUMNS].to_numpy().tolist()
+        result_records = results.to_dict("records")
+        for position, (source_name, state) in enumerate(chunk):
+            result = result_records[position]
+            total_cost = int(result["total_cost"])
+            deposit = int(state.get('deposit_amount', 0) or 0)
+            row_values = ([source_name] + [value_fn(state) for _, _, value_fn in QUOTE_INFO_COLUMNS]
+                          + [total_cost, deposit, total_cost - deposit,
+                             int(result["final_men"]), int(result["final_women"])]
+                          + [int(value) for value in component_values[position]]
+                          + [result["error"] if isinstance(result["error"], str) else ""])
+            summary_sheet.write_row(summary_row, 0, row_values)
+            summary_row += 1
+
+            if items_sheet is not None:
+                customer_name = state.get('customer_name', '')
+                for item in result["cost_items"]:
+                    item_name, item_cost = item[0], item[1]
+                    item_note = item[2] if len(item) > 2 else ""
+                    items_sheet.write_row(items_row, 0, [source_name, customer_name, item_name, item_cost, item_note])
+                    items_row += 1
+
+    if summary_row > 1:
+        summary_sheet.autofilter(0, 0, summary_row - 1, len(summary_headers) - 1)
+    workbook.close()
+    return summary_row - 1
+
+
+def export_quotes_to_excel_bytes(quote_sources, include_cost_items=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """export_quotes_to_excel 결과를 bytes 로 반환합니다 (다운로드 버튼용)."""
+    output = io.BytesIO()
+    export_quotes_to_excel(quote_sources, output, include_cost_items=include_cost_items, chunk_size=chunk_size)
+    return output.getvalue()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3:
+        print("사용법: python bulk_excel_export.py <견적 JSON 폴더> <출력.xlsx>")
+        sys.exit(1)
+    written_count = export_quotes_to_excel(iter_states_from_json_dir(sys.argv[1]), sys.argv[2])
+    print(f"{written_count}건을 {sys.argv[2]} 에 기록했습니다.")
@@ -2,6 +2,7 @@
 import data
 import math
 import re
+import item_catalog
 
 # --- MOVE_TYPE_OPTIONS 정의 (state_manager와 동일하게) ---
 try:
@@ -13,28 +14,14 @@ except Exception:
 def calculate_total_volume_weight(state_data, move_type):
     total_volume = 0.0
     total_weight = 0.0
-    if not hasattr(data, 'item_definitions') or not data.item_definitions:
-        return 0.0, 0.0
-
-    item_defs = data.item_definitions.get(move_type, {})
     processed_items = set()
-    if isinstance(item_defs, dict):
-        for section, item_list in item_defs.items():
-            waste_section_name = getattr(data, "WASTE_SECTION_NAME", "폐기 처리 품목 🗑️")
-            if section == waste_section_name : continue
-            if isinstance(item_list, list):
-                for item_name in item_list:
-                    if item_name in processed_items or not hasattr(data, 'items') or not data.items or item_name not in data.items:
-                        continue
-
-                    item_key = f"qty_{move_type}_{section}_{item_name}"
-                    quantity = int(state_data.get(item_key, 0) or 0)
-
-                    if quantity > 0:
-                        item_spec = data.items.get(item_name, {})
-                        total_volume += item_spec.get("volume_m3", 0) * quantity
-                        total_weight += item_spec.get("weight_kg", 0) * quantity
-                        processed_items.add(item_name)
+    # 폐기 섹션/미정의 품목은 카탈로그 생성 시 이미 제외됨
+    for item_key, item_name, volume_m3, weight_kg in item_catalog.CATALOG.volume_entries.get(move_type, ()):
+        quantity = int(state_data.get(item_key, 0) or 0)
+        if quantity > 0 and item_name not in processed_items:
+            total_volume += volume_m3 * quantity
+            total_weight += weight_kg * quantity
+            processed_items.add(item_name)
     return round(total_volume, 2), round(total_weight, 2)
 
 
@@ -114,7 +101,45 @@ def get_floor_num(floor_str):
     except: return 0
 
 # --- 사다리차 비용 계산 ---
+_ladder_cost_table = None
+_ladder_cost_table_source = None
+
+def _ladder_pricing_source():
+    # data.py 가 다시 로드되면 가격 dict 객체가 바뀌므로 id 로 변경 여부를 판단
+    return tuple(id(getattr(data, name, None)) for name in (
+        'ladder_prices', 'ladder_price_floor_ranges', 'ladder_tonnage_map', 'default_ladder_size', 'vehicle_specs'))
+
+def build_ladder_cost_table():
+    """data.py 의 사다리차 가격으로 (층, 차량) → (비용, 비고) 표를 만듭니다."""
+    ladder_price_floor_ranges = getattr(data, 'ladder_price_floor_ranges', {})
+    vehicle_names = list(getattr(data, 'vehicle_specs', {}).keys())
+    max_floor = max((max_f for (_min_f, max_f) in ladder_price_floor_ranges), default=1)
+    table = {}
+    for floor_num in range(2, max_floor + 1):
+        for vehicle_name in vehicle_names:
+            table[(floor_num, vehicle_name)] = _compute_ladder_cost(floor_num, vehicle_name)
+    return table
+
+def invalidate_ladder_cost_table():
+    """사다리차 가격 데이터를 수정한 뒤 호출하면 다음 조회 시 표를 다시 만듭니다."""
+    global _ladder_cost_table, _ladder_cost_table_source
+    _ladder_cost_table = None
+    _ladder_cost_table_source = None
+
 def get_ladder_cost(floor_num, vehicle_name):
+    global _ladder_cost_table, _ladder_cost_table_source
+    if floor_num < 2: return 0, "1층 이하"
+    source = _ladder_pricing_source()
+    if _ladder_cost_table is None or _ladder_cost_table_source != source:
+        _ladder_cost_table = build_ladder_cost_table()
+        _ladder_cost_table_source = source
+    cached = _ladder_cost_table.get((floor_num, vehicle_name))
+    if cached is not None:
+        return cached
+    # 표 범위 밖(정의되지 않은 차량 등)은 직접 계산
+    return _compute_ladder_cost(floor_num, vehicle_name)
+
+def _compute_ladder_cost(floor_num, vehicle_name):
     cost, note = 0, ""
     if floor_num < 2: return 0, "1층 이하"
 
@@ -151,40 +176,43 @@ def get_ladder_cost(floor_num, vehicle_name):
     return cost, note
 
 # --- 총 이사 비용 계산 ---
-def calculate_total_moving_cost(state_data):
-    cost_before_add_charges = 0
-    cost_items = []
-    personnel_info = {}
+# 비용 항목을 구성요소별로 나누고, 각 구성요소가 읽는 상태 키를 선언합니다.
+# calculate_total_moving_cost 는 모든 구성요소를 순서대로 실행하고,
+# IncrementalCostCalculator 는 입력 키 값이 바뀐 구성요소만 다시 계산합니다.
+# state_data 는 dict 뿐 아니라 st.session_state 처럼 .get() 을 지원하는 매핑이면 됩니다 (복사 불필요).
 
+def _vehicle_price_info(state_data):
     move_type = state_data.get('base_move_type', MOVE_TYPE_OPTIONS[0])
     selected_vehicle = state_data.get('final_selected_vehicle')
-    is_storage, has_via_point = state_data.get('is_storage_move', False), state_data.get('has_via_point', False)
-
-    if not selected_vehicle:
-        return 0, [("오류", 0, "차량 선택 필요")], {"final_men": 0, "final_women": 0}
-
     vehicle_data = {}
-    if hasattr(data, 'vehicle_prices') and move_type in data.vehicle_prices and \
+    if selected_vehicle and hasattr(data, 'vehicle_prices') and move_type in data.vehicle_prices and \
        selected_vehicle in data.vehicle_prices[move_type]:
         vehicle_data = data.vehicle_prices[move_type][selected_vehicle]
-    else:
-        cost_items.append(("오류", 0, f"차량({selected_vehicle}) 또는 이사유형({move_type}) 가격 정보 없음"))
-        return 0, cost_items, {"final_men": 0, "final_women": 0}
+    return move_type, selected_vehicle, vehicle_data
 
-    base_price = vehicle_data.get("price", 0)
-    base_men_from_vehicle = vehicle_data.get("men", 0)
-    base_housewife_from_vehicle = vehicle_data.get("housewife", 0) if move_type == "가정 이사 🏠" else 0
+def _cost_base_fare(state_data):
+    """기본 운임. 차량/이사유형 정보가 없으면 (None, 0, 오류결과) 반환."""
+    move_type, selected_vehicle, vehicle_data = _vehicle_price_info(state_data)
+    is_storage = state_data.get('is_storage_move', False)
 
-    actual_base_price = base_price
+    if not selected_vehicle:
+        return None, 0, (0, [("오류", 0, "차량 선택 필요")], {"final_men": 0, "final_women": 0})
+    if not vehicle_data:
+        return None, 0, (0, [("오류", 0, f"차량({selected_vehicle}) 또는 이사유형({move_type}) 가격 정보 없음")], {"final_men": 0, "final_women": 0})
+
+    actual_base_price = vehicle_data.get("price", 0)
     base_price_note = f"{selected_vehicle} 기준"
 
     if is_storage:
         actual_base_price *= 2
         base_price_note += ", 보관이사 왕복 적용"
 
-    cost_items.append(("기본 운임", actual_base_price, base_price_note))
-    cost_before_add_charges += actual_base_price
+    return [("기본 운임", actual_base_price, base_price_note)], actual_base_price, None
 
+def _cost_work_methods(state_data):
+    cost_items = []
+    cost_sum = 0
+    selected_vehicle = state_data.get('final_selected_vehicle')
     for loc_prefix, floor_key, method_key, sky_hours_key in [
         ("출발지", 'from_floor', 'from_method', 'sky_hours_from'),
         ("도착지", 'to_floor', 'to_method', 'sky_hours_final')
@@ -197,7 +225,7 @@ def calculate_total_moving_cost(state_data):
             ladder_cost, ladder_note = get_ladder_cost(floor_num_val, selected_vehicle)
             if ladder_cost > 0:
                 cost_items.append((f"{loc_prefix} 사다리차", ladder_cost, ladder_note))
-                cost_before_add_charges += ladder_cost
+                cost_sum += ladder_cost
         elif "스카이" in method_val:
             hours = int(state_data.get(sky_hours_key, 1) or 1)
             sky_base, sky_add_hr = getattr(data, 'SKY_BASE_PRICE',0), getattr(data, 'SKY_EXTRA_HOUR_PRICE',0)
@@ -205,20 +233,30 @@ def calculate_total_moving_cost(state_data):
             if sky_total_cost > 0:
                 sky_note = f"{loc_prefix}({hours}h): 기본 {sky_base:,} + 추가 {sky_add_hr * (hours - 1):,}" if hours > 1 else f"{loc_prefix}({hours}h): 기본 {sky_base:,}"
                 cost_items.append((f"{loc_prefix} 스카이 장비", sky_total_cost, sky_note))
-                cost_before_add_charges += sky_total_cost
+                cost_sum += sky_total_cost
+    return cost_items, cost_sum
+
+def _cost_personnel(state_data):
+    """인원 제외 할인/추가 인력. (cost_items, 합계, personnel_info) 반환."""
+    cost_items = []
+    cost_sum = 0
+    personnel_info = {}
+    move_type, _selected_vehicle, vehicle_data = _vehicle_price_info(state_data)
+    base_men_from_vehicle = vehicle_data.get("men", 0)
+    base_housewife_from_vehicle = vehicle_data.get("housewife", 0) if move_type == "가정 이사 🏠" else 0
 
     additional_person_cost = getattr(data, "ADDITIONAL_PERSON_COST", 0)
 
     num_housewives_removed = 0
     if state_data.get('remove_base_housewife', False) and base_housewife_from_vehicle > 0:
         cost_items.append(("기본 여성 인원 중 1명 제외 할인", -additional_person_cost, f"기본 {base_housewife_from_vehicle}명 중 1명 제외"))
-        cost_before_add_charges -= additional_person_cost
+        cost_sum -= additional_person_cost
         num_housewives_removed = 1
 
     num_men_removed = 0
     if state_data.get('remove_base_man', False) and base_men_from_vehicle > 0:
         cost_items.append(("기본 남성 인원 중 1명 제외 할인", -additional_person_cost, f"기본 {base_men_from_vehicle}명 중 1명 제외"))
-        cost_before_add_charges -= additional_person_cost
+        cost_sum -= additional_person_cost
         num_men_removed = 1
 
     final_men = base_men_from_vehicle - num_men_removed + int(state_data.get('add_men', 0) or 0)
@@ -241,27 +279,36 @@ def calculate_total_moving_cost(state_data):
 
     if manual_added_total_cost > 0:
         cost_items.append(("추가 인력", manual_added_total_cost, f"남성 {added_men_for_cost}명, 여성 {added_women_for_cost}명 추가분"))
-        cost_before_add_charges += manual_added_total_cost
+        cost_sum += manual_added_total_cost
+    return cost_items, cost_sum, personnel_info
 
+def _cost_adjustment(state_data):
     adjustment = int(state_data.get('adjustment_amount', 0) or 0)
     if adjustment != 0:
         adj_label = "할증 조정 금액" if adjustment > 0 else "할인 조정 금액"
-        cost_items.append((adj_label, adjustment, "수기 입력"))
-        cost_before_add_charges += adjustment
+        return [(adj_label, adjustment, "수기 입력")], adjustment
+    return [], 0
 
+def _cost_manual_ladder(state_data):
+    cost_items = []
+    cost_sum = 0
     dep_manual_ladder_surcharge = int(state_data.get('departure_ladder_surcharge_manual',0) or 0) if state_data.get('manual_ladder_from_check', False) else 0
     arr_manual_ladder_surcharge = int(state_data.get('arrival_ladder_surcharge_manual',0) or 0) if state_data.get('manual_ladder_to_check', False) else 0
 
     if dep_manual_ladder_surcharge != 0:
         dep_label = "출발지 수동 사다리 할인" if dep_manual_ladder_surcharge < 0 else "출발지 수동 사다리 추가"
         cost_items.append((dep_label, dep_manual_ladder_surcharge, "수동 입력"))
-        cost_before_add_charges += dep_manual_ladder_surcharge
+        cost_sum += dep_manual_ladder_surcharge
     
     if arr_manual_ladder_surcharge != 0:
         arr_label = "도착지 수동 사다리 할인" if arr_manual_ladder_surcharge < 0 else "도착지 수동 사다리 추가"
         cost_items.append((arr_label, arr_manual_ladder_surcharge, "수동 입력"))
-        cost_before_add_charges += arr_manual_ladder_surcharge
+        cost_sum += arr_manual_ladder_surcharge
+    return cost_items, cost_sum
 
+def _cost_storage(state_data):
+    cost_items = []
+    cost_sum = 0
     if state_data.get('is_storage_move', False):
         duration = int(state_data.get('storage_duration', 1) or 1)
         storage_type_key = state_data.get('storage_type', getattr(data, "DEFAULT_STORAGE_TYPE", ""))
@@ -298,22 +345,28 @@ def calculate_total_moving_cost(state_data):
 
         if storage_cost > 0 or duration > 0 :
             cost_items.append(("보관료", storage_cost, storage_note))
-        cost_before_add_charges += storage_cost
+        cost_sum += storage_cost
+    return cost_items, cost_sum
 
+def _cost_long_distance(state_data):
     if state_data.get('apply_long_distance', False) and hasattr(data, 'long_distance_prices'):
         ld_option = state_data.get('long_distance_selector', '선택 안 함')
         ld_cost = data.long_distance_prices.get(ld_option, 0)
         if ld_cost > 0:
-            cost_items.append(("장거리 운송료", ld_cost, ld_option))
-            cost_before_add_charges += ld_cost
+            return [("장거리 운송료", ld_cost, ld_option)], ld_cost
+    return [], 0
 
+def _cost_waste(state_data):
     if state_data.get('has_waste_check', False) and hasattr(data, 'WASTE_DISPOSAL_COST_PER_TON'):
         waste_tons = float(state_data.get('waste_tons_input', 0.5) or 0.5)
         waste_cost = data.WASTE_DISPOSAL_COST_PER_TON * waste_tons
         if waste_cost > 0:
-            cost_items.append(("폐기물 처리", math.ceil(waste_cost), f"{waste_tons}톤"))
-            cost_before_add_charges += math.ceil(waste_cost)
+            return [("폐기물 처리", math.ceil(waste_cost), f"{waste_tons}톤")], math.ceil(waste_cost)
+    return [], 0
 
+def _cost_special_days(state_data):
+    cost_items = []
+    cost_sum = 0
     if hasattr(data, 'special_day_prices'):
         special_day_keys_ordered = list(data.special_day_prices.keys())
         for i, data_py_actual_key in enumerate(special_day_keys_ordered):
@@ -324,17 +377,20 @@ def calculate_total_moving_cost(state_data):
                 if surcharge_val > 0:
                     surcharge_label = data_py_actual_key.split(" ")[0]
                     cost_items.append(("날짜 할증", surcharge_val, surcharge_label))
-                    cost_before_add_charges += surcharge_val
+                    cost_sum += surcharge_val
+    return cost_items, cost_sum
 
+def _cost_via_point(state_data):
     if state_data.get('has_via_point', False):
         via_surcharge = int(state_data.get('via_point_surcharge', 0) or 0)
         if via_surcharge > 0:
-            cost_items.append(("경유지 추가요금", via_surcharge, "경유지 작업"))
-            cost_before_add_charges += via_surcharge
-
-    # --- 카드결제/세금계산서 처리 수정 ---
-    cost_with_surcharges_or_vat = cost_before_add_charges # 최종 금액 계산을 위한 기준값
+            return [("경유지 추가요금", via_surcharge, "경유지 작업")], via_surcharge
+    return [], 0
 
+def _cost_payment(state_data, cost_before_add_charges):
+    """카드결제 수수료 또는 세금계산서 VAT (앞선 항목들의 합계를 추가 입력으로 받음)."""
+    cost_items = []
+    cost_sum = 0
     if state_data.get('card_payment', False) and hasattr(data, "CARD_PAYMENT_SURCHARGE_PERCENT"):
         # 계약금은 현금으로 받고, 나머지 금액에 대해 카드 수수료 적용
         deposit_amount = int(state_data.get('deposit_amount', 0) or 0) # UI에서 입력된 계약금
@@ -349,15 +405,114 @@ def calculate_total_moving_cost(state_data):
                 card_surcharge_amount, 
                 f"잔액 {balance_for_card_payment:,.0f}원에 {data.CARD_PAYMENT_SURCHARGE_PERCENT}% 적용"
             ))
-            cost_with_surcharges_or_vat += card_surcharge_amount # 전체 비용에 수수료만 추가
+            cost_sum += card_surcharge_amount # 전체 비용에 수수료만 추가
         # else: 잔액이 0 이하이면 카드 수수료 없음
             
     elif state_data.get('issue_tax_invoice', False) and hasattr(data, "VAT_RATE_PERCENT"):
         # 세금계산서 발행 시 VAT는 전체 금액(cost_before_add_charges)에 대해 계산
         vat = math.ceil(cost_before_add_charges * (data.VAT_RATE_PERCENT / 100.0))
         cost_items.append(("부가세 (VAT)", vat, f"{data.VAT_RATE_PERCENT}% 계산서 발행 요청"))
-        cost_with_surcharges_or_vat += vat
-    
+        cost_sum += vat
+    return cost_items, cost_sum
+
+def _special_day_state_keys():
+    # 날짜 옵션 수는 data.special_day_prices 에 따라 달라지므로 (다시 로드 포함) 계산할 때마다 현재 data 에서 만듦
+    return tuple(
+        key for i in range(len(getattr(data, 'special_day_prices', {})))
+        for key in (f"date_opt_{i}_widget", f"tab3_date_opt_{i}_widget")
+    )
+
+# (이름, 읽는 상태 키 또는 그 키를 반환하는 함수, 계산 함수) - cost_items 에 추가되는 순서대로
+COST_COMPONENTS = [
+    ("work_methods", ('final_selected_vehicle', 'from_floor', 'from_method', 'sky_hours_from',
+                      'to_floor', 'to_method', 'sky_hours_final'), _cost_work_methods),
+    ("personnel", ('base_move_type', 'final_selected_vehicle', 'remove_base_housewife', 'remove_base_man',
+                   'add_men', 'add_women'), _cost_personnel),
+    ("adjustment", ('adjustment_amount',), _cost_adjustment),
+    ("manual_ladder", ('manual_ladder_from_check', 'departure_ladder_surcharge_manual',
+                       'manual_ladder_to_check', 'arrival_ladder_surcharge_manual'), _cost_manual_ladder),
+    ("storage", ('is_storage_move', 'storage_duration', 'storage_type', 'storage_use_electricity',
+                 'final_selected_vehicle'), _cost_storage),
+    ("long_distance", ('apply_long_distance', 'long_distance_selector'), _cost_long_distance),
+    ("waste", ('has_waste_check', 'waste_tons_input'), _cost_waste),
+    ("special_days", _special_day_state_keys, _cost_special_days),
+    ("via_point", ('has_via_point', 'via_point_surcharge'), _cost_via_point),
+]
+BASE_FARE_STATE_KEYS = ('base_move_type', 'final_selected_vehicle', 'is_storage_move')
+PAYMENT_STATE_KEYS = ('card_payment', 'deposit_amount', 'issue_tax_invoice')
+
+_MISSING = object()
+
+def _run_cost_components(state_data, component_runner):
+    base_items, base_cost, error_result = component_runner("base_fare", BASE_FARE_STATE_KEYS, _cost_base_fare, ())
+    if error_result is not None:
+        return error_result[0], list(error_result[1]), dict(error_result[2])
+
+    cost_items = list(base_items)
+    cost_before_add_charges = base_cost
+    personnel_info = {}
+    for name, state_keys, component_func in COST_COMPONENTS:
+        result = component_runner(name, state_keys, component_func, ())
+        cost_items.extend(result[0])
+        cost_before_add_charges += result[1]
+        if name == "personnel":
+            personnel_info = dict(result[2])
+
+    # --- 카드결제/세금계산서 처리 ---
+    payment_items, payment_cost = component_runner("payment", PAYMENT_STATE_KEYS, _cost_payment, (cost_before_add_charges,))
+    cost_items.extend(payment_items)
+    cost_with_surcharges_or_vat = cost_before_add_charges + payment_cost # 최종 금액 계산을 위한 기준값
+
     current_total_cost = math.ceil(cost_with_surcharges_or_vat / 100) * 100
 
     return current_total_cost, cost_items, personnel_info
+
+def calculate_total_moving_cost(state_data):
+    return _run_cost_components(
+        state_data,
+        lambda name, state_keys, component_func, extra_args: component_func(state_data, *extra_args)
+    )
+
+
+def _pricing_data_source():
+    # 사다리차 표와 같은 방식: data.py 가 다시 로드되면 가격 객체가 바뀌므로 모든 공개 속성의 id 로 변경 여부를 판단
+    return tuple((name, id(value)) for name, value in vars(data).items() if not name.startswith('_'))
+
+
+class IncrementalCostCalculator:
+    """
+    calculate_total_moving_cost 와 같은 결과를 내되, 구성요소별 결과를 캐시하여
+    해당 구성요소가 읽는 상태 키(및 추가 입력) 값이 바뀐 경우에만 다시 계산합니다.
+    data.py 가격 정보가 다시 로드되면(속성 객체가 바뀌면) 캐시 전체를 버리고 다시 계산합니다.
+    세션마다 하나씩 두고 st.session_state 를 그대로(복사 없이) 넘겨 사용합니다.
+    """
+
+    def __init__(self):
+        self._component_cache = {}
+        self._pricing_source = None
+        self.last_recomputed = []
+
+    def invalidate(self):
+        """가격 dict 를 직접 수정한 경우 등 캐시 전체를 비웁니다 (다시 로드한 경우는 자동으로 비워짐)."""
+        self._component_cache.clear()
+
+    def calculate(self, state_data):
+        self.last_recomputed = []
+        pricing_source = _pricing_data_source()
+        if pricing_source != self._pricing_source:
+            self._component_cache.clear()
+            self._pricing_source = pricing_source
+
+        def run_component(name, state_keys, component_func, extra_args):
+            if callable(state_keys):
+                state_keys = state_keys()
+            input_values = tuple(state_data.get(key, _MISSING) for key in state_keys) + tuple(extra_args)
+            cached = self._component_cache.get(name)
+            if cached is not None and cached[0] == input_values:
+                return cached[1]
+            result = component_func(state_data, *extra_args)
+            self._component_cache[name] = (input_values, result)
+            self.last_recomputed.append(name)
+            return result
+
+        return _run_cost_components(state_data, run_component)
@@ -0,0 +1,109 @@
+# document_pipeline.py
+"""
+견적 문서 일괄 생성: 비용을 한 번만 계산한 뒤 고객용 PDF, 고객용 견적서 이미지,
+내부 검토용 양식 이미지, 내부용 Excel 을 스레드 풀에서 동시에 생성합니다.
+
+각 생성기는 공유 캐시(폰트, 템플릿 워크북, PDF 캐시)를 잠금/원자적 갱신으로 보호하므로 동시에 호출해도 됩니다.
+poppler 모드의 PDF 기반 이미지는 같은 실행에서 만든 PDF 를 기다렸다가 변환합니다.
+
+생성기 모듈(reportlab, Pillow, openpyxl)은 generate_all_documents 에서 요청한 산출물에 필요한 것만 불러오므로,
+build_document_states 만 쓰는 곳(PDF/이메일 버튼, batch_render)에서 이 모듈을 불러와도 생성기를 로드하지 않습니다.
+"""
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import calculations
+
+ARTIFACT_CUSTOMER_PDF = "customer_pdf"
+ARTIFACT_CUSTOMER_IMAGE = "customer_image"
+ARTIFACT_INTERNAL_IMAGE = "internal_image"
+ARTIFACT_INTERNAL_EXCEL = "internal_excel"
+ALL_ARTIFACTS = (ARTIFACT_CUSTOMER_PDF, ARTIFACT_CUSTOMER_IMAGE, ARTIFACT_INTERNAL_IMAGE, ARTIFACT_INTERNAL_EXCEL)
+
+DEFAULT_PIPELINE_WORKERS = 4
+
+
+def build_document_states(state_data):
+    """
+    문서 생성용 상태 dict 두 가지를 만듭니다 (원본은 수정하지 않음).
+    - 고객용(PDF/이미지): 경유지가 없으면 via_point_location = '-'
+    - 내부용(양식 이미지/Excel): 경유지가 있을 때만 via_point_location 설정
+    """
+    internal_state = dict(state_data)
+    internal_state['from_location'] = state_data.get('from_address_full', '-')
+    internal_state['to_location'] = state_data.get('to_address_full', '-')
+    if state_data.get('has_via_point', False):
+        internal_state['via_point_location'] = state_data.get('via_point_address', '-')
+
+    customer_state = dict(internal_state)
+    if not state_data.get('has_via_point', False):
+        customer_state['via_point_location'] = '-'
+    return customer_state, internal_state
+
+
+def _timed(artifact_func, *args):
+    start = time.perf_counter()
+    try:
+        artifact_data = artifact_func(*args)
+        error = None if artifact_data else "생성 결과 없음"
+    except Exception as e:
+        traceback.print_exc()
+        artifact_data, error = None, str(e)
+    return {"data": artifact_data or None, "seconds": time.perf_counter() - start, "error": error}
+
+
+def generate_all_documents(state_data, cost_result=None, artifacts=ALL_ARTIFACTS,
+                           max_workers=DEFAULT_PIPELINE_WORKERS, worker_initializer=None):
+    """
+    state_data: 견적 상태 (dict 또는 st.session_state 같은 매핑)
+    cost_result: 이미 계산한 (total_cost, cost_items, personnel_info). 없으면 여기서 한 번 계산
+    worker_initializer: 작업 스레드 시작 시 호출할 함수 (예: Streamlit 실행 컨텍스트 연결)
+
+    반환: {"cost_seconds": float, "total_seconds": float,
+           artifact 이름: {"data": bytes|None, "seconds": float, "error": str|None}, ...}
+    """
+    pipeline_start = time.perf_counter()
+    if cost_result is None:
+        cost_result = calculations.calculate_total_moving_cost(state_data)
+    total_cost, cost_items, personnel_info = cost_result
+    cost_seconds = time.perf_counter() - pipeline_start
+
+    customer_state, internal_state = build_document_states(state_data)
+    if ARTIFACT_CUSTOMER_PDF in artifacts or ARTIFACT_CUSTOMER_IMAGE in artifacts:
+        import pdf_generator
+    if ARTIFACT_INTERNAL_IMAGE in artifacts:
+        import image_generator
+    if ARTIFACT_INTERNAL_EXCEL in artifacts:
+        import excel_filler
+    pdf_args = (customer_state, cost_items, total_cost, personnel_info)
+
+    results = {"cost_seconds": cost_seconds}
+    worker_count = max(1, min(int(max_workers or 1), len(artifacts)))
+    with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="doc-pipeline",
+                            initializer=worker_initializer) as executor:
+        futures = {}
+        if ARTIFACT_CUSTOMER_PDF in artifacts:
+            futures[ARTIFACT_CUSTOMER_PDF] = executor.submit(_timed, pdf_generator.get_or_generate_pdf, *pdf_args)
+        if ARTIFACT_CUSTOMER_IMAGE in artifacts:
+            pdf_future = futures.get(ARTIFACT_CUSTOMER_PDF)
+            if pdf_generator.QUOTE_IMAGE_RENDER_MODE == "poppler" and pdf_future is not None:
+                # PDF 를 두 번 만들지 않도록 같은 실행의 PDF 결과를 변환
+                def _image_from_pipeline_pdf():
+                    pdf_bytes = pdf_future.result()["data"]
+                    return pdf_generator.generate_quote_image_from_pdf(pdf_bytes) if pdf_bytes else None
+                futures[ARTIFACT_CUSTOMER_IMAGE] = executor.submit(_timed, _image_from_pipeline_pdf)
+            else:
+                futures[ARTIFACT_CUSTOMER_IMAGE] = executor.submit(_timed, pdf_generator.generate_quote_image, *pdf_args)
+        if ARTIFACT_INTERNAL_IMAGE in artifacts:
+            futures[ARTIFACT_INTERNAL_IMAGE] = executor.submit(
+                _timed, image_generator.create_quote_image, internal_state, cost_items, total_cost, personnel_info)
+        if ARTIFACT_INTERNAL_EXCEL in artifacts:
+            futures[ARTIFACT_INTERNAL_EXCEL] = executor.submit(
+                _timed, excel_filler.fill_final_excel_template, internal_state, cost_items, total_cost, personnel_info)
+
+        for artifact_name, future in futures.items():
+            results[artifact_name] = future.result()
+
+    results["total_seconds"] = time.perf_counter() - pipeline_start
+    return results
@@ -0,0 +1,132 @@
+# drive_client.py
+"""
+Google Drive API 클라이언트 (google_drive_helper, gdrive_utils 공통).
+
+- 자격 증명은 프로세스당 하나이며, 토큰 갱신은 잠금으로 한 번만 수행해 모든 작업 스레드가 같은 토큰을 사용합니다.
+- httplib2 전송 객체는 스레드 간 공유가 안전하지 않으므로 스레드마다 인증된 전송 객체와 서비스를 따로 둡니다.
+  스레드가 끝나면(Streamlit 재실행, 작업 스레드 종료) 전송 객체는 풀로 반납되어 다음 스레드가 열린 연결을 재사용합니다.
+- discovery 문서는 google-api-python-client 에 포함된 정적 문서를 한 번만 파싱해 사용합니다 (네트워크 조회 없음).
+"""
+import json
+import threading
+import weakref
+
+import google_auth_httplib2
+import httplib2
+from google.oauth2 import service_account
+from googleapiclient.discovery import build, build_from_document
+
+import secret_provider
+
+DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive"]
+DRIVE_API_NAME = "drive"
+DRIVE_API_VERSION = "v3"
+DRIVE_HTTP_TIMEOUT_SEC = 60
+DRIVE_POOL_MAX_IDLE_TRANSPORTS = 16 # 반납된 전송 객체(열린 연결)를 보관할 최대 개수
+
+_client_lock = threading.Lock()
+_credentials = None
+_discovery_document = None
+_client_generation = 0 # reset_clients() 때마다 증가, 이전 세대의 전송 객체는 재사용하지 않음
+_idle_transports = []
+_thread_state = threading.local()
+
+
+class SharedRefreshCredentials(service_account.Credentials):
+    """토큰 갱신을 프로세스 전체에서 한 번에 한 스레드만 수행하는 서비스 계정 자격 증명."""
+
+    _refresh_lock = threading.Lock()
+
+    def refresh(self, request):
+        stale_token = self.token
+        with self._refresh_lock:
+            # 기다리는 동안 다른 스레드가 이미 갱신했으면 그 토큰을 그대로 사용
+            if self.token != stale_token and self.valid:
+                return
+            super().refresh(request)
+
+
+def get_credentials():
+    """서비스 계정 자격 증명 (프로세스당 한 번 생성, secret_provider 의 'gcp_service_account' 사용)."""
+    global _credentials
+    with _client_lock:
+        if _credentials is None:
+            _credentials = SharedRefreshCredentials.from_service_account_info(
+                secret_provider.get_section("gcp_service_account"),
+                scopes=DRIVE_SCOPES
+            )
+        return _credentials
+
+
+def _get_discovery_document():
+    """패키지에 포함된 Drive v3 discovery 문서 (파싱한 dict 를 재사용). 포함되지 않은 버전이면 None."""
+    global _discovery_document
+    if _discovery_document is None:
+        try:
+            from googleapiclient import discovery_cache
+            document_text = discovery_cache.get_static_doc(DRIVE_API_NAME, DRIVE_API_VERSION)
+        except ImportError:
+            document_text = None
+        if document_text:
+            _discovery_document = json.loads(document_text)
+    return _discovery_document
+
+
+def _new_transport(credentials):
+    return google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT_SEC))
+
+
+def _release_transport(transport, generation):
+    with _client_lock:
+        if generation == _client_generation and len(_idle_transports) < DRIVE_POOL_MAX_IDLE_TRANSPORTS:
+            _idle_transports.append(transport)
+            return
+    transport.close()
+
+
+def _acquire_transport(credentials):
+    with _client_lock:
+        if _idle_transports:
+            return _idle_transports.pop(), _client_generation
+        generation = _client_generation
+    return _new_transport(credentials), generation
+
+
+class _ThreadClient:
+    """스레드 전용 Drive 서비스. 스레드가 끝나 이 객체가 사라지면 전송 객체를 풀로 반납합니다."""
+
+    def __init__(self, credentials):
+        self.transport, self.generation = _acquire_transport(credentials)
+        discovery_document = _get_discovery_document()
+        if discovery_document is not None:
+            self.service = build_from_document(discovery_document, http=self.transport)
+        else:
+            self.service = build(DRIVE_API_NAME, DRIVE_API_VERSION, http=self.transport, cache_discovery=False)
+        weakref.finalize(self, _release_transport, self.transport, self.generation)
+
+
+def get_service():
+    """현재 스레드용 Drive 서비스 (자격 증명이 없으면 KeyError)."""
+    credentials = get_credentials()
+    thread_client = getattr(_thread_state, "client", None)
+    if thread_client is None or thread_client.generation != _client_generation:
+        thread_client = _ThreadClient(credentials)
+        _thread_state.client = thread_client
+    return thread_client.service
+
+
+def reset_clients():
+    """자격 증명과 풀에 있는 전송 객체를 버립니다 (비밀 설정 변경 후 등). 각 스레드는 다음 호출 때 새로 만듭니다."""
+    global _credentials, _client_generation
+    with _client_lock:
+        _credentials = None
+        _client_generation += 1
+        idle_transports, _idle_transports[:] = list(_idle_transports), []
+    for transport in idle_transports:
+        transport.close()
+
+
+def pool_stats():
+    """{'generation', 'idle_transports'} (디버그용)."""
+    with _client_lock:
+        return {"generation": _client_generation, "idle_transports": len(_idle_transports)}
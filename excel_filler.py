@@ -1,26 +1,30 @@
 # excel_filler.py
 
 import openpyxl
+import copy
 import io
-import streamlit as st
+import notifier # 사용자 메시지 출력 (Streamlit 또는 배치 작업용 로그)
 import os
 import traceback
 from datetime import date
 import re
+import threading
 import utils
+import item_catalog
 
 try:
     import data
 except ImportError:
-    st.error("data.py 파일을 찾을 수 없습니다. excel_filler.py와 같은 폴더에 있는지 확인하세요.")
+    notifier.error("data.py 파일을 찾을 수 없습니다. excel_filler.py와 같은 폴더에 있는지 확인하세요.")
     data = None
 
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__)) if "__file__" in locals() else "."
+
 def get_tv_qty(state_data):
     if not data or not hasattr(data, 'items') or not isinstance(data.items, dict):
         return 0
     total_tv_qty = 0
-    tv_keys = [key for key in data.items if key.startswith("TV(")]
-    for tv_item_name in tv_keys:
+    for tv_item_name in item_catalog.CATALOG.tv_item_names:
         total_tv_qty += utils.get_item_qty(state_data, tv_item_name)
     return total_tv_qty
 
@@ -31,20 +35,101 @@ def get_method_label_prefix(method_string):
     return method_string.split(" ")[0]
 
 
+class _TemplateWorkbookCache:
+    """
+    final.xlsx 를 한 번만 파싱해 메모리에 두고 요청마다 재사용합니다.
+    채우기 전 템플릿 셀 상태(값, 스타일 - 표시형식/글꼴/정렬/테두리 등)를 스냅샷으로 보관했다가, 저장 후 바뀐 셀만
+    원래대로 되돌립니다 (copy-on-write 와 같은 효과). 셀 병합, 행 높이, 열 너비처럼 시트 구조가 바뀌었으면
+    되돌리지 않고 다음 요청에서 템플릿을 다시 읽습니다.
+    하나의 Workbook 을 공유하므로 acquire/release 사이는 잠금으로 직렬화됩니다.
+    템플릿 파일이 수정되면(mtime 변경) 다시 읽습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._mtime = None
+        self._workbook = None
+        self._snapshot = {}
+        self._layout_snapshot = None
+
+    @staticmethod
+    def _sheet_layout(ws):
+        return (
+            sorted(str(merged_range) for merged_range in ws.merged_cells.ranges),
+            {index: (dim.height, dim.hidden) for index, dim in ws.row_dimensions.items()},
+            {key: (dim.width, dim.hidden) for key, dim in ws.column_dimensions.items()},
+        )
+
+    def acquire(self, template_path):
+        self._lock.acquire()
+        try:
+            mtime = os.path.getmtime(template_path)
+            if self._workbook is None or self._path != template_path or self._mtime != mtime:
+                self._workbook = openpyxl.load_workbook(template_path)
+                self._path, self._mtime = template_path, mtime
+                ws = self._workbook.active
+                self._snapshot = {key: (cell.value, copy.copy(cell._style)) for key, cell in ws._cells.items()}
+                self._layout_snapshot = self._sheet_layout(ws)
+            return self._workbook
+        except Exception:
+            self._lock.release()
+            raise
+
+    def release(self):
+        try:
+            if self._workbook is not None:
+                self._restore_template_cells(self._workbook.active)
+        except Exception as e_restore:
+            print(f"Warning [excel_filler]: template restore failed, reloading next time: {e_restore}")
+            self._workbook = None
+        finally:
+            self._lock.release()
+
+    def _restore_template_cells(self, ws):
+        if self._sheet_layout(ws) != self._layout_snapshot:
+            print("Warning [excel_filler]: template sheet layout changed while filling, reloading next time")
+            self._workbook = None
+            return
+        for key in list(ws._cells):
+            original = self._snapshot.get(key)
+            if original is None: # 채우는 과정에서 새로 생긴 셀
+                del ws._cells[key]
+                continue
+            cell = ws._cells[key]
+            if cell.value != original[0]:
+                cell.value = original[0]
+            if cell._style != original[1]: # 표시형식, 글꼴, 정렬, 테두리, 채우기, 보호
+                cell._style = copy.copy(original[1])
+
+    def clear(self):
+        with self._lock:
+            self._workbook = None
+            self._snapshot = {}
+            self._layout_snapshot = None
+
+_template_cache = _TemplateWorkbookCache()
+
+def clear_template_cache():
+    """final.xlsx 템플릿 캐시를 비웁니다."""
+    _template_cache.clear()
+
+
 def fill_final_excel_template(state_data, calculated_cost_items, total_cost_overall, personnel_info):
     if not data:
-        st.error("data.py 모듈 로드 실패로 Excel 생성을 진행할 수 없습니다.")
+        notifier.error("data.py 모듈 로드 실패로 Excel 생성을 진행할 수 없습니다.")
         return None
 
+    template_acquired = False
     try:
-        script_dir = os.path.dirname(__file__) if "__file__" in locals() else "."
-        final_xlsx_path = os.path.join(script_dir, "final.xlsx")
+        final_xlsx_path = os.path.join(TEMPLATE_DIR, "final.xlsx")
 
         if not os.path.exists(final_xlsx_path):
-            st.error(f"템플릿 파일 '{final_xlsx_path}'을 찾을 수 없습니다.")
+            notifier.error(f"템플릿 파일 '{final_xlsx_path}'을 찾을 수 없습니다.")
             return None
 
-        wb = openpyxl.load_workbook(final_xlsx_path)
+        wb = _template_cache.acquire(final_xlsx_path) # 파싱된 템플릿 재사용 (저장 후 원상복구)
+        template_acquired = True
         ws = wb.active # 일반적으로 'Sheet1' 또는 첫 번째 시트
 
         # --- 1. 기본 정보 입력 ---
@@ -309,9 +394,12 @@ def fill_final_excel_template(state_data, calculated_cost_items, total_cost_over
         return output.getvalue() # 바이트 데이터 반환
 
     except FileNotFoundError:
-        st.error(f"Excel 템플릿 파일 '{final_xlsx_path}'을(를) 찾을 수 없습니다.")
+        notifier.error(f"Excel 템플릿 파일 '{final_xlsx_path}'을(를) 찾을 수 없습니다.")
         return None
     except Exception as e:
-        st.error(f"Excel 생성 중 오류 발생: {e}")
+        notifier.error(f"Excel 생성 중 오류 발생: {e}")
         traceback.print_exc()
         return None
+    finally:
+        if template_acquired:
+            _template_cache.release()
@@ -0,0 +1,113 @@
+# excel_layout.py
+"""
+엑셀 생성기(pdf_generator.generate_excel, excel_summary_generator.generate_summary_excel)가 함께 쓰는
+열 너비 추정 및 열 단위 서식 지정.
+
+셀을 하나씩 돌며 글자 단위로 폭을 세는 대신, 원본 DataFrame 의 열마다 pandas 문자열 연산
+(str.len / str.count)으로 표시 폭을 한 번에 계산합니다. 한글 음절처럼 넓게 표시되는 글자는
+WIDE_CHAR_PATTERN 으로 세어 wide_char_weight 배로 계산합니다.
+숫자 서식은 xlsxwriter 의 set_column 으로 열 단위로 지정합니다 (서식 없는 숫자 셀에 적용됨).
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# 넓게 표시되는 글자 (한글 음절 가-힣)
+WIDE_CHAR_PATTERN = "[가-힣]"
+
+DEFAULT_MIN_WIDTH = 8
+DEFAULT_MAX_WIDTH = 50
+DEFAULT_PADDING = 2
+
+
+def text_display_widths(texts, wide_char_weight=2.0):
+    """문자열 Series 의 표시 폭 (여러 줄이면 가장 긴 줄 기준)."""
+    texts = texts.astype(str)
+    if texts.str.contains("\n", regex=False).any():
+        lines = texts.str.split("\n").explode()
+        line_widths = text_display_widths(lines, wide_char_weight)
+        return line_widths.groupby(level=0).max().reindex(texts.index)
+    return texts.str.len() + texts.str.count(WIDE_CHAR_PATTERN) * (wide_char_weight - 1)
+
+
+def _number_format_decimals(number_format):
+    """'0.000' -> 3, '#,##0' -> 0, 'General'/None -> None (서식 없음)."""
+    if not number_format or number_format == "General":
+        return None
+    if "." in number_format:
+        return number_format.count("0", number_format.find("."))
+    return 0
+
+
+def number_display_widths(values, number_format):
+    """숫자 배열을 천 단위 쉼표 서식(소수 자릿수는 number_format 기준)으로 표시했을 때의 글자 수."""
+    decimals = _number_format_decimals(number_format)
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(np.abs(values), decimals)
+    integer_part = np.floor(rounded)
+    digits = np.floor(np.log10(np.maximum(integer_part, 1))) + 1
+    commas = (digits - 1) // 3
+    lengths = digits + commas + (values < 0)
+    if decimals:
+        lengths = lengths + decimals + 1
+    return lengths
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def estimate_column_widths(df, number_formats=None, wide_char_weight=2.0,
+                           padding=DEFAULT_PADDING, min_width=DEFAULT_MIN_WIDTH, max_width=DEFAULT_MAX_WIDTH):
+    """
+    DataFrame 을 to_excel(index=False) 로 쓴 시트의 열 너비 목록 (df 열 순서).
+    number_formats: {열 이름: 숫자 서식} - 해당 열의 숫자는 서식 적용된 문자열 길이로 계산
+    """
+    number_formats = number_formats or {}
+    widths = []
+    for column_name in df.columns:
+        column = df[column_name]
+        max_length = 0.0
+        if column_name is not None and str(column_name) != "":
+            max_length = float(text_display_widths(pd.Series([str(column_name)]), wide_char_weight).iloc[0])
+
+        present = column[column.notna()]
+        if len(present):
+            number_format = number_formats.get(column_name)
+            if pd.api.types.is_numeric_dtype(present) and not pd.api.types.is_bool_dtype(present):
+                number_mask = np.ones(len(present), dtype=bool)
+            else:
+                number_mask = present.map(_is_number).to_numpy(dtype=bool)
+
+            if number_mask.any() and _number_format_decimals(number_format) is not None:
+                max_length = max(max_length, float(number_display_widths(present[number_mask], number_format).max()))
+                present = present[~number_mask]
+            if len(present):
+                max_length = max(max_length, float(text_display_widths(present, wide_char_weight).max()))
+
+        adjusted_width = math.ceil(max_length) + padding
+        widths.append(min(max(adjusted_width, min_width), max_width))
+    return widths
+
+
+def apply_column_layout(writer, sheet_name, df, number_formats=None, **width_kwargs):
+    """
+    pd.ExcelWriter(engine='xlsxwriter') 로 쓴 시트에 열 너비와 열 단위 숫자 서식을 지정합니다.
+    width_kwargs 는 estimate_column_widths 의 옵션 (wide_char_weight 등).
+    """
+    number_formats = number_formats or {}
+    workbook = writer.book
+    worksheet = writer.sheets[sheet_name]
+    format_cache = {}
+    widths = estimate_column_widths(df, number_formats, **width_kwargs)
+    for col_idx, (column_name, width) in enumerate(zip(df.columns, widths)):
+        number_format = number_formats.get(column_name)
+        cell_format = None
+        if number_format:
+            cell_format = format_cache.get(number_format)
+            if cell_format is None:
+                cell_format = workbook.add_format({"num_format": number_format})
+                format_cache[number_format] = cell_format
+        worksheet.set_column(col_idx, col_idx, width, cell_format)
+    return widths
@@ -2,14 +2,13 @@
 
 import pandas as pd
 import io
-import streamlit as st
+import notifier # 사용자 메시지 출력 (Streamlit 또는 배치 작업용 로그)
 import traceback
 import utils # utils.py 가 필요합니다
 import data # data.py 가 필요합니다
 import os
 from datetime import date
-import openpyxl # ExcelWriter 및 형식 지정 위해 필요
-import math # 컬럼 너비 계산 위해 추가
+import excel_layout
 
 def generate_summary_excel(state_data, calculated_cost_items, personnel_info, vehicle_info, waste_info):
     """계산된 견적 정보를 바탕으로 상세 내역 Excel 파일을 생성하여 Bytes 형태로 반환합니다."""
@@ -110,90 +109,25 @@ def generate_summary_excel(state_data, calculated_cost_items, personnel_info, ve
 
 
         # --- 엑셀 파일 쓰기 및 서식 지정 ---
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
             df_info.to_excel(writer, sheet_name='견적 정보', index=False)
             df_all_items.to_excel(writer, sheet_name='전체 품목 수량', index=False)
             df_costs_final.to_excel(writer, sheet_name='비용 내역 및 요약', index=False)
 
-            # 워크북 및 워크시트 객체 가져오기
-            workbook = writer.book
-            ws_info = writer.sheets['견적 정보']
-            ws_items = writer.sheets['전체 품목 수량']
-            ws_costs = writer.sheets['비용 내역 및 요약']
-
-            # 숫자 형식 지정 함수
-            def apply_number_format(worksheet, col_letter, number_format):
-                for cell in worksheet[col_letter]:
-                    if isinstance(cell.value, (int, float)):
-                        cell.number_format = number_format
-
-            # 시트별 형식 지정
-            apply_number_format(ws_info, 'B', '#,##0') # 견적 정보 시트의 일부 숫자
-            # 품목 시트: 부피/무게는 소수점, 수량은 정수
-            apply_number_format(ws_items, 'C', '#,##0') # 수량
-            apply_number_format(ws_items, 'D', '0.000') # 개당 부피
-            apply_number_format(ws_items, 'E', '0.0')   # 개당 무게
-            apply_number_format(ws_items, 'F', '0.000') # 총 부피
-            apply_number_format(ws_items, 'G', '0.0')   # 총 무게
-            # 비용 시트: 금액
-            apply_number_format(ws_costs, 'B', '#,##0') # 금액
-
-            # 컬럼 너비 자동 조절 함수 (개선된 버전)
-            def auto_adjust_column_width(worksheet):
-                for col in worksheet.columns:
-                    max_length = 0
-                    column_letter = col[0].column_letter # 열 문자 얻기
-
-                    # 헤더 길이 먼저 계산
-                    header_cell = worksheet[f"{column_letter}1"]
-                    if header_cell.value:
-                        # 한글/영문/숫자 고려 (대략적인 가중치)
-                        header_len_weighted = 0
-                        for char in str(header_cell.value):
-                            if '\uac00' <= char <= '\ud7a3': header_len_weighted += 1.8
-                            else: header_len_weighted += 1.0
-                        max_length = math.ceil(header_len_weighted)
-
-                    # 각 셀 내용 길이 계산 (형식 적용된 숫자도 고려)
-                    for cell in col:
-                        if cell.row == 1: continue # 헤더는 위에서 계산
-                        if cell.value is not None:
-                            cell_str = ""
-                            # 숫자이고 형식이 지정된 경우, 형식 적용된 문자열 길이 시뮬레이션 (근사치)
-                            if isinstance(cell.value, (int, float)) and cell.number_format != 'General':
-                                try:
-                                    # 예: '#,##0' 형식 -> 천단위 쉼표 고려
-                                    if '0.0' in cell.number_format: # 소수점 형식
-                                        num_decimals = cell.number_format.count('0', cell.number_format.find('.'))
-                                        cell_str = f"{cell.value:,.{num_decimals}f}"
-                                    elif ',' in cell.number_format: # 천단위 쉼표 형식
-                                        cell_str = f"{cell.value:,.0f}"
-                                    else: cell_str = str(cell.value)
-                                except: cell_str = str(cell.value) # 형식 변환 실패 시 기본 문자열
-                            else:
-                                cell_str = str(cell.value)
-
-                            # 문자열 길이 계산 (가중치 적용)
-                            current_len_weighted = 0
-                            for char in cell_str:
-                                if '\uac00' <= char <= '\ud7a3': current_len_weighted += 1.8
-                                else: current_len_weighted += 1.0
-                            max_length = max(max_length, math.ceil(current_len_weighted))
-
-                    # 최종 너비 조정 (여백 추가, 최대/최소 너비 설정)
-                    adjusted_width = max_length + 2 # 기본 여백
-                    adjusted_width = max(adjusted_width, 8) # 최소 너비
-                    adjusted_width = min(adjusted_width, 50) # 최대 너비
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-
-            # 각 시트에 너비 조절 적용
-            auto_adjust_column_width(ws_info)
-            auto_adjust_column_width(ws_items)
-            auto_adjust_column_width(ws_costs)
+            # 열 너비(한글 1.8배 가중치)와 숫자 서식을 열 단위로 지정
+            excel_layout.apply_column_layout(writer, '견적 정보', df_info, {"내용": '#,##0'}, wide_char_weight=1.8) # 견적 정보 시트의 일부 숫자
+            excel_layout.apply_column_layout(writer, '전체 품목 수량', df_all_items, {
+                "수량": '#,##0',
+                "개당 부피(CBM)": '0.000',
+                "개당 무게(kg)": '0.0',
+                "총 부피(CBM)": '0.000',
+                "총 무게(kg)": '0.0',
+            }, wide_char_weight=1.8)
+            excel_layout.apply_column_layout(writer, '비용 내역 및 요약', df_costs_final, {"금액": '#,##0'}, wide_char_weight=1.8) # 금액
 
         excel_data = output.getvalue()
         return excel_data
     except Exception as e:
-        st.error(f"Excel 요약 파일 생성 중 오류 발생: {e}")
+        notifier.error(f"Excel 요약 파일 생성 중 오류 발생: {e}")
         traceback.print_exc()
         return None
\ No newline at end of file
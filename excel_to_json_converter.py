@@ -467,6 +467,7 @@ if st.button("🔄 JSON 변환 및 Google Drive에 저장하기"):
         st.subheader("✨ 처리 결과")
         progress_bar = st.progress(0)
         status_text = st.empty()
+        items_to_save = []; log_entries = []
 
         for i, item_data_row_or_line in enumerate(items_to_process):
             processed_items += 1
@@ -493,24 +494,36 @@ if st.button("🔄 JSON 변환 및 Google Drive에 저장하기"):
             if status_obj and filename:
                 final_state_to_save = get_default_state() # 항상 모든 키를 포함하는 기본 상태에서 시작
                 final_state_to_save.update(status_obj)    # 파싱된 결과로 업데이트
-                try:
-                    gdrive_folder_id_secret = st.secrets.get("gcp_service_account", {}).get("drive_folder_id")
-                    save_result = gdrive.save_json_file(filename, final_state_to_save, folder_id=gdrive_folder_id_secret)
-                    if save_result and save_result.get('id'):
-                        log_message = f"✔️ <span style='color:green;'>저장 성공</span>: {filename} {log_identifier} (ID: {save_result.get('id')})"
-                        all_log_messages.append(log_message); success_count += 1
-                    else:
-                        log_message = f"❌ <span style='color:red;'>저장 실패</span>: {filename} {log_identifier} (응답: {save_result})"
-                        all_log_messages.append(log_message); error_count += 1
-                except AttributeError as ae: # gdrive 모듈 관련 오류 등
-                     log_message = f"❌ <span style='color:red;'>저장 함수 오류</span>: {filename} {log_identifier} (오류: {ae})"
-                     all_log_messages.append(log_message); error_count += 1
-                except Exception as e_save:
-                    log_message = f"❌ <span style='color:red;'>저장 중 예외</span>: {filename if filename else '데이터'} {log_identifier} ({str(e_save)})"
-                    all_log_messages.append(log_message); error_count += 1
+                log_entries.append(("save", len(items_to_save), filename, log_identifier))
+                items_to_save.append((filename, final_state_to_save))
             else:
                 log_message = f"⚠️ <span style='color:orange;'>건너뜀/오류</span>: {error_msg if error_msg else '사유 불명'} {log_identifier}"
-                all_log_messages.append(log_message); error_count +=1
+                log_entries.append(("log", log_message)); error_count +=1
+
+        # 변환된 모든 견적을 한 번의 목록 조회 + 병렬 업로드로 저장
+        save_results = []
+        if items_to_save:
+            status_text.text(f"Google Drive에 {len(items_to_save)}건 저장 중...")
+            try:
+                gdrive_folder_id_secret = st.secrets.get("gcp_service_account", {}).get("drive_folder_id")
+                save_results = gdrive.save_json_files(items_to_save, folder_id=gdrive_folder_id_secret)
+            except AttributeError as ae: # gdrive 모듈 관련 오류 등
+                save_results = [{'id': None, 'status': 'error', 'error': f"저장 함수 오류: {ae}"} for _ in items_to_save]
+            except Exception as e_save:
+                save_results = [{'id': None, 'status': 'error', 'error': str(e_save)} for _ in items_to_save]
+
+        for log_entry in log_entries:
+            if log_entry[0] == "log":
+                all_log_messages.append(log_entry[1])
+                continue
+            _, save_idx, filename, log_identifier = log_entry
+            save_result = save_results[save_idx] if save_idx < len(save_results) else None
+            if save_result and save_result.get('id'):
+                log_message = f"✔️ <span style='color:green;'>저장 성공</span>: {filename} {log_identifier} (ID: {save_result.get('id')})"
+                all_log_messages.append(log_message); success_count += 1
+            else:
+                log_message = f"❌ <span style='color:red;'>저장 실패</span>: {filename} {log_identifier} (응답: {save_result.get('error') if save_result else save_result})"
+                all_log_messages.append(log_message); error_count += 1
 
         status_text.empty(); progress_bar.empty()
         st.info(f"총 분석 대상: {total_items} 건 (실제 처리 시도: {processed_items} 건)")
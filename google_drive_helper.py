@@ -1,39 +1,169 @@
 # google_drive_helper.py
 
-import streamlit as st
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
 import io
 import json
 import os
+import random
+import threading
+import time
 import traceback
 
-@st.cache_resource
+import drive_client # 자격 증명 + 스레드별 Drive 서비스 (연결 풀, 정적 discovery 문서)
+import notifier # 사용자 메시지 출력 (Streamlit 또는 배치 작업용 로그)
+import quote_state # 견적 저장 형식 (v2: 기본값 생략 + 선택적 gzip)
+import quote_summary # 조회 화면용 요약 (appProperties 로 함께 기록)
+import secret_provider
+
+# 병렬 다운로드 및 재시도 설정
+DRIVE_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+DRIVE_MAX_RETRIES = 5
+DRIVE_RETRY_MAX_BACKOFF_SEC = 32
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_UPLOAD_WORKERS = 8
+DRIVE_BATCH_MAX_REQUESTS = 100
+
+# 전화번호 끝 4자리 인덱스 (로컬 디스크에 보관, Drive changes 피드로 증분 갱신)
+PHONE_INDEX_CACHE_DIR = ".gdrive_cache"
+PHONE_INDEX_SUFFIX_LENGTH = 4
+PHONE_INDEX_REFRESH_INTERVAL_SEC = 30
+
+# 견적 JSON 에 붙이는 검색용 appProperties (Drive 서버에서 'appProperties has' 로 필터링)
+QUOTE_APP_PROPERTY_KEYS = ("phone_last4", "moving_date", "contract_date", "move_type")
+DRIVE_APP_PROPERTY_MAX_BYTES = 124 # Drive 제한: 키 + 값 UTF-8 바이트 합
+# 전화번호 끝 4자리 검색 방식: "index" (로컬 파일명 인덱스 + changes 피드), "app_properties" (Drive 서버 쿼리)
+# 기존 파일에 backfill_quote_app_properties 를 실행한 뒤 "app_properties" 로 바꿀 수 있습니다.
+PHONE_SUFFIX_SEARCH_MODE = "index"
+# True 이면 견적 JSON 을 gzip 으로 압축해 저장 (mimeType 은 그대로, 읽을 때 자동 판별)
+QUOTE_SAVE_COMPRESS = False
+
+# 다운로드 파일 로컬 캐시 (파일 ID + md5Checksum/modifiedTime 기준, 용량 초과 시 오래된 항목부터 삭제)
+DRIVE_FILE_CACHE_DIR = os.path.join(PHONE_INDEX_CACHE_DIR, "files")
+DRIVE_FILE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+def get_drive_credentials():
+    """Service account credentials shared by all threads (token refresh is serialized in drive_client)."""
+    return drive_client.get_credentials()
+
 def get_drive_service():
-    """Connects to Google Drive API using service account credentials."""
-    try:
-        if "gcp_service_account" not in st.secrets:
-            st.error("Streamlit Secrets에 'gcp_service_account' 정보가 설정되지 않았습니다.")
-            st.stop()
-        creds_json = st.secrets["gcp_service_account"]
-        creds = service_account.Credentials.from_service_account_info(
-            creds_json,
-            scopes=["https://www.googleapis.com/auth/drive"]
-        )
-        return build("drive", "v3", credentials=creds)
+    """
+    Returns the Drive service for the calling thread (see drive_client).
+    Each thread gets its own authorized transport, so Streamlit sessions and workers never share one.
+    """
+    try:
+        if not secret_provider.has_section("gcp_service_account"):
+            notifier.error("Secrets에 'gcp_service_account' 정보가 설정되지 않았습니다.")
+            notifier.stop()
+            return None
+        return drive_client.get_service()
     except KeyError:
-        st.error("Streamlit Secrets에 'gcp_service_account' 정보가 설정되지 않았습니다.")
-        st.stop()
+        notifier.error("Secrets에 'gcp_service_account' 정보가 설정되지 않았습니다.")
+        notifier.stop()
+        return None
     except Exception as e:
-        st.error(f"Google Drive 서비스 연결 중 오류 발생: {e}")
-        st.stop()
+        notifier.error(f"Google Drive 서비스 연결 중 오류 발생: {e}")
+        notifier.stop()
+        return None
+
+# --- 다운로드 파일 로컬 캐시 ---
+_file_cache_lock = threading.Lock()
+
+def file_version_from_metadata(file_metadata):
+    """
+    md5Checksum (content hash) if Drive provides one, otherwise modifiedTime.
+    Search results from this module carry it as 'version'; pass it to load_json_file / download_file_bytes.
+    """
+    if not file_metadata: return None
+    return file_metadata.get("md5Checksum") or file_metadata.get("modifiedTime")
+
+def _file_cache_path(file_id, version):
+    version_hash = hashlib.sha1(str(version).encode("utf-8")).hexdigest()[:16]
+    safe_file_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in file_id)
+    return os.path.join(DRIVE_FILE_CACHE_DIR, f"{safe_file_id}__{version_hash}")
+
+def _file_cache_get(file_id, version):
+    path = _file_cache_path(file_id, version)
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+        os.utime(path, None) # LRU 순서 갱신
+        return content
+    except OSError:
+        return None
+
+def _file_cache_put(file_id, version, content):
+    if not file_id or not version or content is None: return
+    path = _file_cache_path(file_id, version)
+    try:
+        with _file_cache_lock:
+            os.makedirs(DRIVE_FILE_CACHE_DIR, exist_ok=True)
+            _file_cache_discard_locked(file_id) # 이전 버전 제거
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(bytes(content))
+            os.replace(tmp_path, path)
+            _file_cache_evict_locked()
+    except OSError as e:
+        print(f"Warning: 파일 캐시 저장 실패 (ID: {file_id}): {e}")
+
+def _file_cache_discard_locked(file_id):
+    prefix = "".join(c if c.isalnum() or c in "-_" else "_" for c in file_id) + "__"
+    try:
+        for entry in os.scandir(DRIVE_FILE_CACHE_DIR):
+            if entry.name.startswith(prefix) and not entry.name.endswith(".tmp"):
+                os.remove(entry.path)
+    except OSError:
+        pass
+
+def _file_cache_discard(file_id):
+    with _file_cache_lock:
+        _file_cache_discard_locked(file_id)
 
-def download_file_bytes(file_id):
-    """Downloads the content of a file from Google Drive as bytes."""
+def _file_cache_evict_locked():
+    entries = []
+    total_size = 0
+    for entry in os.scandir(DRIVE_FILE_CACHE_DIR):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+    if total_size <= DRIVE_FILE_CACHE_MAX_BYTES: return
+    for _mtime, size, path in sorted(entries):
+        try: os.remove(path)
+        except OSError: continue
+        total_size -= size
+        if total_size <= DRIVE_FILE_CACHE_MAX_BYTES: break
+
+def get_file_version(file_id):
+    """Returns the cache version (md5Checksum or modifiedTime) of a Drive file, or None."""
+    service = get_drive_service()
+    if not service: return None
+    try:
+        file_metadata = service.files().get(fileId=file_id, fields="id, md5Checksum, modifiedTime").execute()
+        return file_version_from_metadata(file_metadata)
+    except Exception as e:
+        print(f"Warning: 파일 버전 조회 실패 (ID: {file_id}): {e}")
+        return None
+
+def download_file_bytes(file_id, version=None):
+    """
+    Downloads the content of a file from Google Drive as bytes.
+    Content is cached on disk per (file_id, version); pass the known md5Checksum /
+    modifiedTime as version to skip the metadata request on cache hits.
+    """
     service = get_drive_service()
     if not service: return None
     try:
+        if not version:
+            version = get_file_version(file_id)
+        if version:
+            cached_content = _file_cache_get(file_id, version)
+            if cached_content is not None:
+                return cached_content
         request = service.files().get_media(fileId=file_id)
         fh = io.BytesIO()
         downloader = MediaIoBaseDownload(fh, request)
@@ -41,25 +171,235 @@ def download_file_bytes(file_id):
         while not done:
             status, done = downloader.next_chunk()
         fh.seek(0)
-        return fh.getvalue()
+        content = fh.getvalue()
+        _file_cache_put(file_id, version, content)
+        return content
     except Exception as e:
-        st.error(f"파일 다운로드 중 오류 발생 (ID: {file_id}): {e}")
+        notifier.error(f"파일 다운로드 중 오류 발생 (ID: {file_id}): {e}")
         return None
 
-def download_json_file(file_id):
+def download_json_file(file_id, version=None):
     """Downloads and decodes a JSON file."""
-    file_bytes = download_file_bytes(file_id)
+    file_bytes = download_file_bytes(file_id, version=version)
     if file_bytes:
+        if file_bytes[:2] == b"\x1f\x8b": # QUOTE_SAVE_COMPRESS 로 저장된 파일
+            try: file_bytes = gzip.decompress(file_bytes)
+            except OSError as e:
+                notifier.error(f"다운로드된 파일(ID: {file_id})의 압축을 푸는 데 실패했습니다: {e}")
+                return None
         try:
             return file_bytes.decode("utf-8-sig")
         except UnicodeDecodeError:
             try:
                  return file_bytes.decode("utf-8")
             except UnicodeDecodeError:
-                 st.error(f"다운로드된 파일(ID: {file_id})을 UTF-8로 디코딩하는 데 실패했습니다.")
+                 notifier.error(f"다운로드된 파일(ID: {file_id})을 UTF-8로 디코딩하는 데 실패했습니다.")
                  return None
     return None
 
+def _is_retryable_drive_error(error):
+    if isinstance(error, HttpError):
+        try: return int(error.resp.status) in DRIVE_RETRY_STATUS_CODES
+        except (AttributeError, TypeError, ValueError): return False
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+def _download_bytes_with_retry(service, file_id, max_retries=DRIVE_MAX_RETRIES):
+    """Downloads file bytes, retrying 429/5xx and connection errors with exponential backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            request = service.files().get_media(fileId=file_id)
+            fh = io.BytesIO()
+            downloader = MediaIoBaseDownload(fh, request)
+            done = False
+            while not done:
+                status, done = downloader.next_chunk()
+            return fh.getvalue()
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable_drive_error(e):
+                raise
+            time.sleep(min(DRIVE_RETRY_MAX_BACKOFF_SEC, 2 ** attempt) + random.uniform(0, 1))
+
+def _load_json_file_worker(file_id):
+    try:
+        file_bytes = _download_bytes_with_retry(drive_client.get_service(), file_id)
+        return quote_state.decode_saved_data(file_bytes)
+    except Exception as e:
+        # 작업 스레드에서는 st.* 를 호출할 수 없으므로 로그만 남기고 None 반환
+        print(f"Warning: JSON 파일 로드 실패 (ID: {file_id}): {e}")
+        return None
+
+def load_json_files(file_ids, max_workers=DEFAULT_DOWNLOAD_WORKERS):
+    """
+    Loads many JSON files concurrently with a bounded thread pool.
+    Yields (file_id, parsed_dict_or_None) in the same order as file_ids.
+    """
+    file_ids = list(file_ids)
+    if not file_ids:
+        return
+    try:
+        get_drive_credentials()
+    except Exception as e:
+        notifier.error(f"Google Drive 인증 정보 로드 실패: {e}")
+        for file_id in file_ids:
+            yield file_id, None
+        return
+
+    worker_count = max(1, min(int(max_workers or 1), len(file_ids)))
+    with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="gdrive-load") as executor:
+        futures = [executor.submit(_load_json_file_worker, file_id) for file_id in file_ids]
+        try:
+            for file_id, future in zip(file_ids, futures):
+                yield file_id, future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+# --- 견적 검색용 appProperties ---
+def _truncate_app_property(key, value):
+    """Drive appProperties 의 키 + 값 124바이트 제한에 맞춰 값을 자릅니다 (UTF-8 글자 단위)."""
+    value = str(value)
+    max_value_bytes = DRIVE_APP_PROPERTY_MAX_BYTES - len(key.encode("utf-8"))
+    while len(value.encode("utf-8")) > max_value_bytes:
+        value = value[:-1]
+    return value
+
+def _date_property_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value).strip() if value else ""
+
+def quote_app_properties(data_dict, file_name=None):
+    """
+    견적 JSON 에 붙일 검색용 appProperties (QUOTE_APP_PROPERTY_KEYS 전부, 값이 없으면 빈 문자열)와
+    조회 화면용 요약(quote_summary.QUOTE_SUMMARY_PROPERTY_KEYS, 계산에 실패하면 생략).
+    phone_last4 는 파일명 검색과 같은 규칙('<전화번호>.json' 의 끝 4자리)을 우선하고, 없으면 고객 전화번호 숫자에서 구합니다.
+    """
+    if not isinstance(data_dict, dict):
+        data_dict = {}
+    phone_last4 = phone_suffix_of(file_name, data_dict.get("customer_phone")) or ""
+    candidate_values = {
+        "phone_last4": phone_last4,
+        "moving_date": _date_property_value(data_dict.get("moving_date")),
+        "contract_date": _date_property_value(data_dict.get("contract_date")),
+        "move_type": data_dict.get("base_move_type") or "",
+    }
+    candidate_values.update(quote_summary.summary_app_properties(data_dict))
+    return {key: _truncate_app_property(key, value) for key, value in candidate_values.items()}
+
+def _app_properties_query(properties):
+    query_parts = []
+    for key, value in properties.items():
+        escaped_key = str(key).replace("\\", "\\\\").replace("'", "\\'")
+        escaped_value = _truncate_app_property(str(key), value).replace("\\", "\\\\").replace("'", "\\'")
+        query_parts.append(f"appProperties has {{ key='{escaped_key}' and value='{escaped_value}' }}")
+    return " and ".join(query_parts)
+
+def find_json_files_by_app_properties(properties, folder_id=None):
+    """
+    Finds JSON files whose appProperties match every {key: value} in properties,
+    filtered server-side by Drive ('appProperties has'), so only matches are returned.
+    Returns [{'id', 'name', 'mimeType', 'appProperties', 'version'}] sorted by name.
+    """
+    service = get_drive_service()
+    if not service or not properties: return []
+
+    query_parts = ["trashed = false", "mimeType='application/json'", _app_properties_query(properties)]
+    if folder_id:
+        query_parts.append(f"'{folder_id}' in parents")
+    final_query = " and ".join(query_parts)
+
+    found_files = []
+    try:
+        page_token = None
+        while True:
+            response = _execute_with_retry(lambda: service.files().list(
+                q=final_query,
+                spaces='drive',
+                fields='nextPageToken, files(id, name, mimeType, appProperties, md5Checksum, modifiedTime)',
+                pageSize=1000,
+                pageToken=page_token
+            ))
+            for file_item in response.get('files', []):
+                found_files.append({'id': file_item.get('id'), 'name': file_item.get('name'),
+                                    'mimeType': file_item.get('mimeType'), 'appProperties': file_item.get('appProperties', {}),
+                                    'version': file_version_from_metadata(file_item)})
+            page_token = response.get('nextPageToken', None)
+            if not page_token:
+                break
+    except Exception as e:
+        notifier.error(f"appProperties 검색 중 오류 발생 ({properties}): {e}")
+        traceback.print_exc()
+        return []
+    return sorted(found_files, key=lambda f: f['name'] or "")
+
+def _stamp_app_properties_worker(file_id, app_properties):
+    try:
+        service = drive_client.get_service()
+        _execute_with_retry(lambda: service.files().update(fileId=file_id, body={"appProperties": app_properties}, fields="id"))
+        return True
+    except Exception as e:
+        print(f"Warning: appProperties 기록 실패 (ID: {file_id}): {e}")
+        return False
+
+def backfill_quote_app_properties(folder_id=None, dry_run=False, max_workers=DEFAULT_UPLOAD_WORKERS, progress_callback=None):
+    """
+    One-off job: stamps QUOTE_APP_PROPERTY_KEYS and the lookup summary on existing quote JSON files
+    that lack any of them or whose summary was computed with other pricing (quote_summary.PRICING_FINGERPRINT).
+    Only those files are downloaded; updates are metadata-only (no content upload).
+    Returns {'listed', 'up_to_date', 'stamped', 'failed', 'load_failed'} counts.
+    """
+    counts = {"listed": 0, "up_to_date": 0, "stamped": 0, "failed": 0, "load_failed": 0}
+    service = get_drive_service()
+    if not service: return counts
+
+    query = "trashed = false and mimeType='application/json'"
+    if folder_id:
+        query += f" and '{folder_id}' in parents"
+    files_needing_stamp = {}
+    page_token = None
+    while True:
+        response = _execute_with_retry(lambda: service.files().list(
+            q=query, spaces='drive', fields='nextPageToken, files(id, name, appProperties)',
+            pageSize=1000, pageToken=page_token))
+        for file_item in response.get('files', []):
+            counts["listed"] += 1
+            existing_properties = file_item.get('appProperties') or {}
+            if (all(key in existing_properties for key in QUOTE_APP_PROPERTY_KEYS)
+                    and existing_properties.get("summary_version") == quote_summary.PRICING_FINGERPRINT):
+                counts["up_to_date"] += 1
+            else:
+                files_needing_stamp[file_item['id']] = (file_item.get('name'), existing_properties)
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            break
+
+    pending_updates = []
+    for file_id, data_dict in load_json_files(list(files_needing_stamp), max_workers=max_workers):
+        file_name, existing_properties = files_needing_stamp[file_id]
+        if not isinstance(data_dict, dict):
+            counts["load_failed"] += 1
+            continue
+        # 값이 없는 키도 빈 문자열로 기록되므로 다음 실행에서는 다시 내려받지 않음
+        app_properties = quote_app_properties(data_dict, file_name)
+        if all(existing_properties.get(key) == value for key, value in app_properties.items()):
+            counts["up_to_date"] += 1
+            continue
+        pending_updates.append((file_id, app_properties))
+
+    if dry_run:
+        counts["stamped"] = len(pending_updates)
+        return counts
+
+    worker_count = max(1, min(int(max_workers or 1), len(pending_updates) or 1))
+    with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="gdrive-stamp") as executor:
+        futures = [executor.submit(_stamp_app_properties_worker, file_id, app_properties)
+                   for file_id, app_properties in pending_updates]
+        for done_count, future in enumerate(futures, start=1):
+            counts["stamped" if future.result() else "failed"] += 1
+            if callable(progress_callback):
+                progress_callback(done_count, len(futures))
+    return counts
+
 def find_file_id_by_exact_name(exact_file_name, folder_id=None):
     """Finds a file ID by its exact name within a specific folder."""
     service = get_drive_service()
@@ -81,7 +421,7 @@ def find_file_id_by_exact_name(exact_file_name, folder_id=None):
         items = results.get('files', [])
         return items[0].get('id') if items else None
     except Exception as e:
-        st.error(f"정확한 파일 검색 오류 ('{exact_file_name}'): {e}")
+        notifier.error(f"정확한 파일 검색 오류 ('{exact_file_name}'): {e}")
         traceback.print_exc()
         return None
 
@@ -93,50 +433,131 @@ def save_json_file(file_name, data_dict, folder_id=None):
     try:
         existing_file_id = find_file_id_by_exact_name(file_name, folder_id=folder_id)
 
-        json_string = json.dumps(data_dict, ensure_ascii=False, indent=2)
-        json_bytes = json_string.encode('utf-8')
+        json_bytes = quote_state.encode_saved_data(data_dict, compress=QUOTE_SAVE_COMPRESS)
         fh = io.BytesIO(json_bytes)
-        media = MediaIoBaseUpload(fh, mimetype="application/json", resumable=True)
-        file_metadata = {"name": file_name}
+        # 견적 JSON은 작으므로 resumable 세션(요청 2회) 대신 multipart 업로드(요청 1회) 사용
+        media = MediaIoBaseUpload(fh, mimetype="application/json", resumable=False)
+        app_properties = quote_app_properties(data_dict, file_name)
+        file_metadata = {"name": file_name, "appProperties": app_properties}
 
         if folder_id: file_metadata["parents"] = [folder_id]
 
         if existing_file_id:
             updated_file = service.files().update(
                 fileId=existing_file_id,
+                body={"appProperties": app_properties},
                 media_body=media,
-                fields="id, name"
+                fields="id, name, md5Checksum, modifiedTime"
             ).execute()
+            _file_cache_put(existing_file_id, file_version_from_metadata(updated_file), json_bytes)
             return {'id': existing_file_id, 'name': updated_file.get('name'), 'status': 'updated'}
         else:
             file_metadata["mimeType"] = "application/json"
             created_file = service.files().create(
                 body=file_metadata,
                 media_body=media,
-                fields="id, name"
+                fields="id, name, md5Checksum, modifiedTime"
             ).execute()
+            _file_cache_put(created_file.get("id"), file_version_from_metadata(created_file), json_bytes)
+            _phone_index_note_saved(folder_id, created_file.get("id"), created_file.get('name'))
             return {'id': created_file.get("id"), 'name': created_file.get('name'), 'status': 'created'}
 
     except Exception as e:
-         st.error(f"JSON 저장/업데이트 실패 ('{file_name}'): {e}")
+         notifier.error(f"JSON 저장/업데이트 실패 ('{file_name}'): {e}")
          traceback.print_exc()
          return None
 
-def load_json_file(file_id):
-    """Loads and parses a JSON file from Google Drive."""
-    json_string = download_json_file(file_id)
-    if json_string:
-        try: return json.loads(json_string)
-        except json.JSONDecodeError as e:
-            st.error(f"불러온 파일(ID: {file_id})을 JSON으로 파싱하는 데 실패했습니다: {e}")
+def _execute_with_retry(request_factory, max_retries=DRIVE_MAX_RETRIES):
+    """Executes request_factory().execute(), retrying 429/5xx and connection errors with backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            return request_factory().execute()
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable_drive_error(e):
+                raise
+            time.sleep(min(DRIVE_RETRY_MAX_BACKOFF_SEC, 2 ** attempt) + random.uniform(0, 1))
+
+def _save_json_file_worker(file_name, data_dict, existing_file_id, folder_id):
+    try:
+        service = drive_client.get_service()
+        json_bytes = quote_state.encode_saved_data(data_dict, compress=QUOTE_SAVE_COMPRESS)
+
+        app_properties = quote_app_properties(data_dict, file_name)
+
+        def make_media():
+            return MediaIoBaseUpload(io.BytesIO(json_bytes), mimetype="application/json", resumable=False)
+
+        if existing_file_id:
+            updated_file = _execute_with_retry(lambda: service.files().update(
+                fileId=existing_file_id, body={"appProperties": app_properties},
+                media_body=make_media(), fields="id, name, md5Checksum, modifiedTime"))
+            _file_cache_put(existing_file_id, file_version_from_metadata(updated_file), json_bytes)
+            return {'id': existing_file_id, 'name': updated_file.get('name', file_name), 'status': 'updated'}
+
+        file_metadata = {"name": file_name, "mimeType": "application/json", "appProperties": app_properties}
+        if folder_id: file_metadata["parents"] = [folder_id]
+        created_file = _execute_with_retry(lambda: service.files().create(
+            body=file_metadata, media_body=make_media(), fields="id, name, md5Checksum, modifiedTime"))
+        _file_cache_put(created_file.get("id"), file_version_from_metadata(created_file), json_bytes)
+        return {'id': created_file.get("id"), 'name': created_file.get('name', file_name), 'status': 'created'}
+    except Exception as e:
+        print(f"Warning: JSON 저장 실패 ('{file_name}'): {e}")
+        return {'id': None, 'name': file_name, 'status': 'error', 'error': str(e)}
+
+def save_json_files(items, folder_id=None, max_workers=DEFAULT_UPLOAD_WORKERS):
+    """
+    Saves many (file_name, data_dict) pairs as JSON files (overwriting same-named files).
+    Existing file ids are resolved from a single folder listing, and uploads run
+    concurrently as single-request multipart uploads. Returns one result dict per
+    input item, in input order: {'id', 'name', 'status'} with status
+    'created' / 'updated' / 'error' (plus 'error' message on failure).
+    """
+    items = list(items)
+    if not items:
+        return []
+    try:
+        # 목록 조회가 실패한 채로 저장하면 기존 파일을 찾지 못해 같은 이름의 파일이 중복 생성되므로 전부 오류로 처리
+        existing_files = _list_files(drive_client.get_service(), mime_types="application/json", folder_id=folder_id)
+    except Exception as e:
+        notifier.error(f"JSON 일괄 저장 준비 실패: {e}")
+        return [{'id': None, 'name': file_name, 'status': 'error', 'error': str(e)} for file_name, _ in items]
+    existing_ids_by_name = {}
+    for file_item in existing_files:
+        existing_ids_by_name.setdefault(file_item.get('name'), file_item.get('id'))
+
+    # 같은 파일명이 여러 번 나오면 순차 저장과 동일하게 마지막 데이터가 최종 내용이 되도록 한 번만 업로드
+    last_index_by_name = {file_name: idx for idx, (file_name, _) in enumerate(items)}
+    upload_indices = sorted(last_index_by_name.values())
+
+    worker_count = max(1, min(int(max_workers or 1), len(upload_indices)))
+    with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="gdrive-save") as executor:
+        futures = {
+            idx: executor.submit(_save_json_file_worker, items[idx][0], items[idx][1],
+                                 existing_ids_by_name.get(items[idx][0]), folder_id)
+            for idx in upload_indices
+        }
+        results_by_name = {items[idx][0]: future.result() for idx, future in futures.items()}
+
+    for result in results_by_name.values():
+        if result.get('status') == 'created':
+            _phone_index_note_saved(folder_id, result.get('id'), result.get('name'))
+    return [dict(results_by_name[file_name]) for file_name, _ in items]
+
+def load_json_file(file_id, version=None):
+    """Loads and parses a quote JSON file from Google Drive (gzip and save format v2 are expanded, see quote_state)."""
+    file_bytes = download_file_bytes(file_id, version=version)
+    if file_bytes:
+        try: return quote_state.decode_saved_data(file_bytes)
+        except (ValueError, OSError) as e: # JSON/UTF-8 오류는 ValueError, gzip 오류는 OSError
+            notifier.error(f"불러온 파일(ID: {file_id})을 JSON으로 파싱하는 데 실패했습니다: {e}")
             return None
     return None
 
-def find_files_by_name_contains(name_query, mime_types=None, folder_id=None):
-    """Searches for files, optionally filtering by name_query and mime types."""
-    service = get_drive_service()
-    if not service: return []
-
+def _list_files(service, name_query="", mime_types=None, folder_id=None):
+    """
+    Lists every matching file across pages (each page retried with backoff).
+    Errors are raised, so callers never mistake a failed listing for an empty folder.
+    """
     query_parts = ["trashed = false"]
 
     if name_query and name_query.strip():
@@ -155,23 +576,29 @@ def find_files_by_name_contains(name_query, mime_types=None, folder_id=None):
     final_query = " and ".join(query_parts)
 
     found_files = []
+    page_token = None
+    while True:
+        response = _execute_with_retry(lambda: service.files().list(
+            q=final_query,
+            spaces='drive',
+            fields='nextPageToken, files(id, name, mimeType, md5Checksum, modifiedTime)',
+            pageToken=page_token
+        ))
+        for file_item in response.get('files', []):
+            found_files.append({'id': file_item.get('id'), 'name': file_item.get('name'), 'mimeType': file_item.get('mimeType'),
+                                'version': file_version_from_metadata(file_item)})
+        page_token = response.get('nextPageToken', None)
+        if not page_token:
+            return found_files
+
+def find_files_by_name_contains(name_query, mime_types=None, folder_id=None):
+    """Searches for files, optionally filtering by name_query and mime types."""
+    service = get_drive_service()
+    if not service: return []
     try:
-        page_token = None
-        while True:
-            response = service.files().list(
-                q=final_query,
-                spaces='drive',
-                fields='nextPageToken, files(id, name, mimeType)',
-                pageToken=page_token
-            ).execute()
-            for file_item in response.get('files', []):
-                found_files.append({'id': file_item.get('id'), 'name': file_item.get('name'), 'mimeType': file_item.get('mimeType')})
-            page_token = response.get('nextPageToken', None)
-            if not page_token:
-                break
-        return found_files
+        return _list_files(service, name_query, mime_types=mime_types, folder_id=folder_id)
     except Exception as e:
-        st.error(f"파일 검색 중 오류 발생 ('{name_query if name_query else '모든 JSON'}'): {e}")
+        notifier.error(f"파일 검색 중 오류 발생 ('{name_query if name_query else '모든 JSON'}'): {e}")
         traceback.print_exc()
         return []
 
@@ -194,11 +621,13 @@ def upload_image_to_drive(file_name, image_bytes, folder_id=None):
         created_file = service.files().create(
             body=file_metadata,
             media_body=media,
-            fields="id, name"
+            fields="id, name, md5Checksum"
         ).execute()
-        return {'id': created_file.get("id"), 'name': created_file.get('name')}
+        # 업로드한 바이트를 그대로 캐시해 두면 썸네일 표시 시 다시 내려받지 않음
+        _file_cache_put(created_file.get("id"), created_file.get("md5Checksum"), image_bytes)
+        return {'id': created_file.get("id"), 'name': created_file.get('name'), 'md5Checksum': created_file.get('md5Checksum')}
     except Exception as e:
-        st.error(f"이미지 Google Drive 업로드 실패 ('{file_name}'): {e}")
+        notifier.error(f"이미지 Google Drive 업로드 실패 ('{file_name}'): {e}")
         traceback.print_exc()
         return None
 
@@ -209,7 +638,264 @@ def delete_file_from_drive(file_id):
     if not service: return False
     try:
         service.files().delete(fileId=file_id).execute()
+        _phone_index_note_deleted(file_id)
+        _file_cache_discard(file_id)
         return True
     except Exception as e:
-        st.error(f"Google Drive 파일 삭제 실패 (ID: {file_id}): {e}")
+        notifier.error(f"Google Drive 파일 삭제 실패 (ID: {file_id}): {e}")
         return False
+
+def delete_files_from_drive(file_ids):
+    """
+    Permanently deletes many files using Drive batch requests (up to 100 per batch).
+    Returns {file_id: True/False} with the per-item outcome.
+    """
+    file_ids = list(dict.fromkeys(fid for fid in file_ids if fid))
+    results = {file_id: False for file_id in file_ids}
+    service = get_drive_service()
+    if not service or not file_ids: return results
+
+    failed_messages = []
+    def on_delete_done(request_id, response, exception):
+        if exception is None:
+            results[request_id] = True
+            _phone_index_note_deleted(request_id)
+            _file_cache_discard(request_id)
+        else:
+            failed_messages.append(f"{request_id}: {exception}")
+
+    for start in range(0, len(file_ids), DRIVE_BATCH_MAX_REQUESTS):
+        batch = service.new_batch_http_request(callback=on_delete_done)
+        for file_id in file_ids[start:start + DRIVE_BATCH_MAX_REQUESTS]:
+            batch.add(service.files().delete(fileId=file_id), request_id=file_id)
+        try:
+            batch.execute()
+        except Exception as e:
+            failed_messages.append(f"batch {start // DRIVE_BATCH_MAX_REQUESTS + 1}: {e}")
+    if failed_messages:
+        notifier.error(f"Google Drive 파일 일괄 삭제 중 {len(failed_messages)}건 실패: {'; '.join(failed_messages[:5])}")
+    return results
+
+def get_files_app_properties(file_ids):
+    """
+    Fetches appProperties for many files using Drive batch requests (up to 100 per batch, no content download).
+    Returns {file_id: appProperties dict}; files that could not be read are omitted.
+    """
+    file_ids = list(dict.fromkeys(fid for fid in file_ids if fid))
+    results = {}
+    service = get_drive_service()
+    if not service or not file_ids: return results
+
+    failed_messages = []
+    def on_get_done(request_id, response, exception):
+        if exception is None:
+            results[request_id] = (response or {}).get('appProperties') or {}
+        else:
+            failed_messages.append(f"{request_id}: {exception}")
+
+    for start in range(0, len(file_ids), DRIVE_BATCH_MAX_REQUESTS):
+        batch = service.new_batch_http_request(callback=on_get_done)
+        for file_id in file_ids[start:start + DRIVE_BATCH_MAX_REQUESTS]:
+            batch.add(service.files().get(fileId=file_id, fields='id, appProperties'), request_id=file_id)
+        try:
+            batch.execute()
+        except Exception as e:
+            failed_messages.append(f"batch {start // DRIVE_BATCH_MAX_REQUESTS + 1}: {e}")
+    if failed_messages:
+        print(f"Warning: appProperties 일괄 조회 중 {len(failed_messages)}건 실패: {'; '.join(failed_messages[:5])}")
+    return results
+
+# --- 추가된 함수: 전화번호 끝 4자리 인덱스 ---
+_phone_index_lock = threading.Lock()
+_phone_indexes = {}  # folder_id -> {"start_page_token", "files", "versions", "suffix_map", "last_refresh"}
+
+def _phone_index_path(folder_id):
+    safe_folder = "".join(c if c.isalnum() or c in "-_" else "_" for c in (folder_id or "root"))
+    return os.path.join(PHONE_INDEX_CACHE_DIR, f"phone_suffix_index_{safe_folder}.json")
+
+def phone_suffix_of(file_name, phone=None):
+    """
+    전화번호 끝 4자리 검색 키. '<전화번호>.json' 파일명의 끝 4자리를 우선하고,
+    파일명이 그 형식이 아니면 phone 의 숫자 끝 4자리, 둘 다 구할 수 없으면 None.
+    """
+    if file_name and file_name.endswith(".json"):
+        stem = os.path.splitext(file_name)[0]
+        if len(stem) >= PHONE_INDEX_SUFFIX_LENGTH:
+            return stem[-PHONE_INDEX_SUFFIX_LENGTH:]
+    phone_digits = "".join(c for c in str(phone or "") if c.isdigit())
+    if len(phone_digits) >= PHONE_INDEX_SUFFIX_LENGTH:
+        return phone_digits[-PHONE_INDEX_SUFFIX_LENGTH:]
+    return None
+
+def _build_suffix_map(files):
+    suffix_map = {}
+    for file_id, file_name in files.items():
+        suffix = phone_suffix_of(file_name)
+        if suffix:
+            suffix_map.setdefault(suffix, set()).add(file_id)
+    return suffix_map
+
+def _index_put(index, file_id, file_name, version=None):
+    _index_remove(index, file_id)
+    index["files"][file_id] = file_name
+    if version:
+        index["versions"][file_id] = version
+    suffix = phone_suffix_of(file_name)
+    if suffix:
+        index["suffix_map"].setdefault(suffix, set()).add(file_id)
+
+def _index_remove(index, file_id):
+    old_name = index["files"].pop(file_id, None)
+    index["versions"].pop(file_id, None)
+    suffix = phone_suffix_of(old_name)
+    if suffix and suffix in index["suffix_map"]:
+        index["suffix_map"][suffix].discard(file_id)
+        if not index["suffix_map"][suffix]:
+            del index["suffix_map"][suffix]
+
+def _load_phone_index_from_disk(folder_id):
+    path = _phone_index_path(folder_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("folder_id") != folder_id or not stored.get("start_page_token"):
+            return None
+        files = dict(stored.get("files", {}))
+        return {"start_page_token": stored["start_page_token"], "files": files,
+                "versions": dict(stored.get("versions", {})),
+                "suffix_map": _build_suffix_map(files), "last_refresh": 0.0}
+    except Exception as e:
+        print(f"Warning: 전화번호 인덱스 파일을 읽지 못했습니다 ({path}): {e}")
+        return None
+
+def _save_phone_index_to_disk(folder_id, index):
+    path = _phone_index_path(folder_id)
+    try:
+        os.makedirs(PHONE_INDEX_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"folder_id": folder_id, "start_page_token": index["start_page_token"],
+                       "files": index["files"], "versions": index["versions"]}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Warning: 전화번호 인덱스 파일 저장 실패 ({path}): {e}")
+
+def _build_phone_index(service, folder_id):
+    """Lists every JSON file in the folder once and records a changes-feed start token."""
+    # 목록 조회 도중 발생한 변경도 다음 갱신에서 잡히도록 토큰을 먼저 받습니다.
+    start_page_token = service.changes().getStartPageToken().execute().get("startPageToken")
+    index = {"start_page_token": start_page_token, "files": {}, "versions": {}, "suffix_map": {}, "last_refresh": time.time()}
+    # 목록 조회 실패는 예외로 전달: 빈 인덱스를 유효한 토큰과 함께 저장하면 이후 검색이 계속 비게 됩니다.
+    for file_item in _list_files(service, mime_types="application/json", folder_id=folder_id):
+        if file_item.get("id") and file_item.get("name"):
+            _index_put(index, file_item["id"], file_item["name"], file_item.get("version"))
+    return index
+
+def _refresh_phone_index(service, index, folder_id):
+    """Applies the Drive changes feed since the stored token. Returns True if anything changed."""
+    page_token = index["start_page_token"]
+    changed = False
+    while page_token:
+        response = service.changes().list(
+            pageToken=page_token,
+            spaces="drive",
+            includeRemoved=True,
+            fields="nextPageToken, newStartPageToken, changes(fileId, removed, file(id, name, mimeType, trashed, parents, md5Checksum, modifiedTime))"
+        ).execute()
+        for change in response.get("changes", []):
+            file_id = change.get("fileId")
+            file_item = change.get("file") or {}
+            in_scope = (
+                not change.get("removed")
+                and not file_item.get("trashed")
+                and file_item.get("mimeType") == "application/json"
+                and (not folder_id or folder_id in (file_item.get("parents") or []))
+            )
+            if in_scope:
+                version = file_version_from_metadata(file_item)
+                if index["files"].get(file_id) != file_item.get("name") or index["versions"].get(file_id) != version:
+                    _index_put(index, file_id, file_item.get("name"), version)
+                    changed = True
+            elif file_id in index["files"]:
+                _index_remove(index, file_id)
+                changed = True
+        if "newStartPageToken" in response:
+            changed = changed or response["newStartPageToken"] != index["start_page_token"]
+            index["start_page_token"] = response["newStartPageToken"]
+            break
+        page_token = response.get("nextPageToken")
+    index["last_refresh"] = time.time()
+    return changed
+
+def _get_phone_index(folder_id, force_refresh=False):
+    service = get_drive_service()
+    if not service: return None
+    with _phone_index_lock:
+        index = _phone_indexes.get(folder_id)
+        if index is None:
+            index = _load_phone_index_from_disk(folder_id)
+            if index is None:
+                index = _build_phone_index(service, folder_id)
+                _save_phone_index_to_disk(folder_id, index)
+            else:
+                force_refresh = True
+            _phone_indexes[folder_id] = index
+        if force_refresh or time.time() - index["last_refresh"] >= PHONE_INDEX_REFRESH_INTERVAL_SEC:
+            if _refresh_phone_index(service, index, folder_id):
+                _save_phone_index_to_disk(folder_id, index)
+        return index
+
+def _phone_index_note_saved(folder_id, file_id, file_name):
+    # 방금 생성한 파일은 다음 changes 갱신 전에도 바로 검색되도록 반영
+    with _phone_index_lock:
+        index = _phone_indexes.get(folder_id)
+        if index is not None and file_id and file_name:
+            _index_put(index, file_id, file_name)
+
+def _phone_index_note_deleted(file_id):
+    with _phone_index_lock:
+        for index in _phone_indexes.values():
+            if file_id in index["files"]:
+                _index_remove(index, file_id)
+
+def find_json_files_by_phone_suffix(last_digits, folder_id=None):
+    """
+    Finds '<phone>.json' files whose phone number ends with last_digits (4 digits)
+    using the local suffix index (or the server-side appProperties query when
+    PHONE_SUFFIX_SEARCH_MODE is "app_properties"). Falls back to a full folder listing on index errors.
+    """
+    last_digits = (last_digits or "").strip()
+    if len(last_digits) != PHONE_INDEX_SUFFIX_LENGTH:
+        return []
+    if PHONE_SUFFIX_SEARCH_MODE == "app_properties":
+        # appProperties(요약 포함)를 그대로 넘겨 조회 화면이 메타데이터를 다시 요청하지 않게 함
+        return find_json_files_by_app_properties({"phone_last4": last_digits}, folder_id=folder_id)
+    try:
+        index = _get_phone_index(folder_id)
+        if index is not None:
+            with _phone_index_lock:
+                matched = [(file_id, index["files"][file_id], index["versions"].get(file_id))
+                           for file_id in index["suffix_map"].get(last_digits, ())]
+            return sorted(
+                ({'id': file_id, 'name': file_name, 'mimeType': "application/json", 'version': version}
+                 for file_id, file_name, version in matched),
+                key=lambda f: f['name']
+            )
+    except Exception as e:
+        print(f"Warning: 전화번호 인덱스 조회 실패, 전체 목록 검색으로 대체합니다: {e}")
+        traceback.print_exc()
+        invalidate_phone_index(folder_id)
+
+    all_json_files = find_files_by_name_contains("", mime_types="application/json", folder_id=folder_id)
+    return [f for f in all_json_files if phone_suffix_of(f.get('name', '')) == last_digits]
+
+def invalidate_phone_index(folder_id=None):
+    """Drops the in-memory and on-disk suffix index so the next lookup rebuilds it."""
+    with _phone_index_lock:
+        _phone_indexes.pop(folder_id, None)
+        try:
+            os.remove(_phone_index_path(folder_id))
+        except FileNotFoundError:
+            pass
@@ -6,6 +6,7 @@ from datetime import date, datetime
 import math
 import traceback
 import re
+import bisect
 
 try:
     import data as app_data_for_img_gen
@@ -241,7 +242,40 @@ def get_text_dimensions(text_string, font):
         return len(str(text_string)) * fallback_size * 0.6, fallback_size * 1.2
 
 
+# 프로세스 단위 자산 캐시: 폰트 파일(수 MB)과 배경 이미지를 매 생성마다 다시 읽지 않도록 보관
+_font_cache = {} # (font_type, size) -> FreeTypeFont
+_glyph_advance_cache = {} # FreeTypeFont -> {글자: advance 폭}
+_line_height_cache = {} # FreeTypeFont -> 줄 높이
+_background_template_cache = {} # 이미지 경로 -> 디코딩된 RGBA 이미지 (원본은 수정하지 않고 copy() 해서 사용)
+
+def clear_asset_cache():
+    """폰트/배경 이미지 파일을 교체한 경우 캐시를 비웁니다."""
+    global _layout_plan
+    _font_cache.clear()
+    _glyph_advance_cache.clear()
+    _line_height_cache.clear()
+    _background_template_cache.clear()
+    _layout_plan = None # 플랜이 참조하는 폰트 객체도 다시 로드
+
+def _get_background_template(image_path=None):
+    image_path = image_path or BACKGROUND_IMAGE_PATH
+    template = _background_template_cache.get(image_path)
+    if template is None:
+        with Image.open(image_path) as bg_file:
+            template = bg_file.convert("RGBA")
+        template.load()
+        _background_template_cache[image_path] = template
+    return template
+
 def _get_font(font_type="regular", size=12):
+    cache_key = (font_type, size)
+    font = _font_cache.get(cache_key)
+    if font is None:
+        font = _load_font(font_type, size)
+        _font_cache[cache_key] = font
+    return font
+
+def _load_font(font_type="regular", size=12):
     font_path_to_use = FONT_PATH_REGULAR
     if font_type == "bold":
         if os.path.exists(FONT_PATH_BOLD):
@@ -250,7 +284,7 @@ def _get_font(font_type="regular", size=12):
     if not os.path.exists(font_path_to_use):
         print(f"ERROR [ImageGenerator]: Font file NOT FOUND at '{font_path_to_use}'. Falling back to PIL default.")
         try: return ImageFont.load_default(size=size)
-        except AttributeError: # 'size' argument for load_default might not be in very old Pillow
+        except (AttributeError, TypeError): # 'size' argument for load_default is only in Pillow 10.1+
             return ImageFont.load_default()
         except Exception as e_pil_font:
             print(f"CRITICAL: Error loading default PIL font: {e_pil_font}")
@@ -261,7 +295,7 @@ def _get_font(font_type="regular", size=12):
     except IOError:
         print(f"IOError [ImageGenerator]: Font '{font_path_to_use}' found but unreadable. Falling back to default.")
         try: return ImageFont.load_default(size=size)
-        except AttributeError: return ImageFont.load_default()
+        except (AttributeError, TypeError): return ImageFont.load_default()
         except Exception as e_pil_font_io:
             print(f"CRITICAL: Error loading default PIL font after IOError: {e_pil_font_io}")
             raise
@@ -272,53 +306,127 @@ def _get_font(font_type="regular", size=12):
 
 # ... (다른 코드는 그대로 유지) ...
 
-def _draw_text_with_alignment(draw, text, x, y, font, color, align="left", max_width=None, line_spacing_factor=1.2):
+def _get_glyph_advances(font):
+    """폰트별 글자 폭(advance) 캐시. 같은 글자를 다시 측정하지 않습니다."""
+    advances = _glyph_advance_cache.get(font)
+    if advances is None:
+        advances = {}
+        _glyph_advance_cache[font] = advances
+    return advances
+
+def measure_text_width(text, font):
+    """글자별 advance 합으로 계산한 문자열 폭 (커닝 무시, 줄바꿈 위치 추정용)."""
+    advances = _get_glyph_advances(font)
+    total_width = 0
+    for char in text:
+        char_width = advances.get(char)
+        if char_width is None:
+            if hasattr(font, 'getlength'): # Pillow 8.0.0+
+                char_width = font.getlength(char)
+            else:
+                char_width, _ = get_text_dimensions(char, font)
+            advances[char] = char_width
+        total_width += char_width
+    return total_width
+
+def _get_line_height(font):
+    line_height = _line_height_cache.get(font)
+    if line_height is None:
+        _, line_height = get_text_dimensions("A", font)
+        _line_height_cache[font] = line_height
+    return line_height
+
+def _rendered_width(text, font):
+    """실제 그릴 때의 폭 (get_text_dimensions, 커닝 반영). 줄바꿈 확정은 항상 이 값으로 판단합니다."""
+    width, _ = get_text_dimensions(text, font)
+    return width
+
+def _confirm_break(fits, start, estimated_end, stop):
+    """
+    누적 advance 로 추정한 줄 끝(estimated_end)을 실제 폭으로 확인해 앞뒤로 조정합니다.
+    fits(end): [start, end) 구간이 max_width 안에 들어가는지. 반환값은 최소 start + 1.
+    """
+    end = min(max(estimated_end, start + 1), stop)
+    while end > start + 1 and not fits(end):
+        end -= 1
+    while end < stop and fits(end + 1):
+        end += 1
+    return end
+
+def _break_long_word(word, font, max_width, lines):
+    """max_width 보다 긴 단어를 글자 단위로 분할 (누적 폭 이진 탐색으로 추정 후 실제 폭으로 확정)."""
+    advances_sum = [0]
+    for char in word:
+        advances_sum.append(advances_sum[-1] + measure_text_width(char, font))
+    fits = lambda end: _rendered_width(word[start:end], font) <= max_width
+    start = 0
+    if not fits(1):
+        lines.append("") # 첫 글자부터 넘치면 기존 줄바꿈과 같이 빈 줄을 먼저 둠
+    while start < len(word):
+        estimated_end = bisect.bisect_right(advances_sum, advances_sum[start] + max_width) - 1
+        end = _confirm_break(fits, start, estimated_end, len(word)) # 한 글자가 max_width 보다 넓어도 최소 한 글자는 배치
+        lines.append(word[start:end])
+        start = end
+
+def _break_words(words, font, max_width, lines, is_last_run):
+    """
+    단어 목록을 줄로 나눕니다. 각 줄은 "단어 단어 ... " (끝 공백 포함) 의 실제 폭이 max_width 이하인 최대 길이이며,
+    첫 단어는 넘쳐도 배치합니다. 텍스트 끝의 마지막 줄은 공백뿐이면 버립니다.
+    """
+    space_width = measure_text_width(" ", font)
+    words_sum = [0]
+    for word in words:
+        words_sum.append(words_sum[-1] + measure_text_width(word, font) + space_width)
+    fits = lambda end: _rendered_width(" ".join(words[start:end]) + " ", font) <= max_width
+    start = 0
+    while start < len(words):
+        estimated_end = bisect.bisect_right(words_sum, words_sum[start] + max_width) - 1
+        end = _confirm_break(fits, start, estimated_end, len(words))
+        line = " ".join(words[start:end]).strip()
+        if line or not (is_last_run and end == len(words)):
+            lines.append(line)
+        start = end
+
+def layout_text_lines(text, font, max_width=None):
+    """
+    텍스트를 그릴 줄 목록으로 나눕니다 (단어 단위 줄바꿈, 긴 단어는 글자 단위 분할).
+    줄 끝 위치는 캐시된 글자 advance 의 누적 폭으로 추정하고 실제 폭(get_text_dimensions)으로 확정하므로,
+    단어마다 줄 전체를 다시 측정하던 기존 방식과 같은 줄을 만들면서 측정은 줄당 몇 번으로 줄어듭니다.
+    max_width 가 없으면 '\n' 기준으로만 나눕니다.
+    """
     if text is None: text = ""
     text = str(text)
+    if not max_width:
+        return text.split('\n')
+
     lines = []
+    pending_words = []
+    for word in text.split(' '):
+        if len(word) > 1 and _rendered_width(word, font) > max_width:
+            if pending_words: _break_words(pending_words, font, max_width, lines, is_last_run=False)
+            _break_long_word(word, font, max_width, lines)
+            pending_words = []
+        else:
+            pending_words.append(word)
+    if pending_words: _break_words(pending_words, font, max_width, lines, is_last_run=True)
+    if not lines and text: lines.append(text)
+    return lines
 
-    if max_width:
-        words = text.split(' ')
-        current_line = ""
-        for word in words:
-            word_width, _ = get_text_dimensions(word, font)
-            if word_width > max_width and len(word) > 1: 
-                if current_line: lines.append(current_line.strip())
-                temp_word_line = ""
-                for char_in_word in word:
-                    temp_word_line_plus_char_width, _ = get_text_dimensions(temp_word_line + char_in_word, font)
-                    if temp_word_line_plus_char_width <= max_width:
-                        temp_word_line += char_in_word
-                    else: 
-                        lines.append(temp_word_line) 
-                        temp_word_line = char_in_word 
-                if temp_word_line: lines.append(temp_word_line) 
-                current_line = "" 
-                continue
-
-            current_line_plus_word_width, _ = get_text_dimensions(current_line + word + " ", font) if current_line else get_text_dimensions(word + " ", font)
-            if current_line_plus_word_width <= max_width:
-                current_line += word + " "
-            else: 
-                if current_line: lines.append(current_line.strip()) 
-                current_line = word + " " 
-        if current_line.strip(): lines.append(current_line.strip()) 
-        if not lines and text: lines.append(text) 
-    else: 
-        lines.extend(text.split('\n'))
+def _draw_text_with_alignment(draw, text, x, y, font, color, align="left", max_width=None, line_spacing_factor=1.2):
+    lines = layout_text_lines(text, font, max_width)
 
     current_y_draw = y
     first_line = True
-    _, typical_char_height = get_text_dimensions("A", font) 
+    typical_char_height = _get_line_height(font)
     for line in lines: # line_to_draw 대신 line 사용
         if not line.strip() and not first_line and len(lines) > 1: 
             current_y_draw += int(typical_char_height * line_spacing_factor)
             continue
 
-        text_width_draw, _ = get_text_dimensions(line, font) # line_to_draw 대신 line 사용
         actual_x_draw = x
-        if align == "right": actual_x_draw = x - text_width_draw
-        elif align == "center": actual_x_draw = x - text_width_draw / 2
+        if align in ("right", "center"):
+            text_width_draw, _ = get_text_dimensions(line, font) # 정렬 위치는 실제 bbox 폭 기준
+            actual_x_draw = x - text_width_draw if align == "right" else x - text_width_draw / 2
         
         # 수정: draw.text() 호출 시 anchor 파라미터 제거
         draw.text((actual_x_draw, current_y_draw), line, font=font, fill=color) # line_to_draw 대신 line 사용, anchor 제거
@@ -328,6 +436,68 @@ def _draw_text_with_alignment(draw, text, x, y, font, color, align="left", max_w
     return current_y_draw
 
 # ... (create_quote_image 및 나머지 코드는 이전과 동일하게 유지) ...
+# --- FIELD_MAP 레이아웃 플랜 ---
+# FIELD_MAP 항목을 매 렌더링마다 정규화(int 변환, 폰트 크기 계산, 폰트 조회)하지 않도록
+# 최초 사용 시 한 번 슬롯 목록으로 컴파일해 둡니다. 좌표를 수정한 뒤에는 reload_layout_plan() 호출.
+_VALUE_REQUIRED_FIELD_KEYS = frozenset([
+    "from_method_label", "from_method_fee_value",
+    "to_method_label", "to_method_fee_value",
+    "via_method_label", "via_method_fee_value",
+])
+_NUMERIC_FIELD_ATTRS = ("x", "y", "size", "max_width")
+_NO_TEXT_OVERRIDE = object()
+
+class _FieldSlot:
+    __slots__ = ("key", "x", "y", "font", "font_error", "color", "align", "max_width",
+                 "line_spacing_factor", "text_override", "requires_value", "draw_when_empty")
+
+    def __init__(self, key, field_spec):
+        spec = {}
+        for attr_name, attr_value in field_spec.items():
+            if attr_name in _NUMERIC_FIELD_ATTRS: # 숫자여야 하는 속성들
+                try: attr_value = int(attr_value)
+                except (ValueError, TypeError): pass # 변환 실패시 원본 유지
+            spec[attr_name] = attr_value
+
+        self.key = key
+        self.x = spec["x"]
+        self.y = spec["y"]
+        self.font = None
+        self.font_error = None
+        try:
+            self.font = _get_font(font_type=spec.get("font", "regular"),
+                                  size=get_adjusted_font_size(spec.get("size", BASE_FONT_SIZE), key))
+        except Exception as font_load_err: # 폰트 로드 실패 시 그리기 단계에서 건너뜀
+            self.font_error = font_load_err
+        self.color = spec.get("color", TEXT_COLOR_DEFAULT)
+        self.align = spec.get("align", "left")
+        self.max_width = spec.get("max_width") # 자동 줄바꿈 최대 폭
+        self.line_spacing_factor = spec.get("line_spacing_factor", 1.15) # 기본 줄간격 (기존 1.2에서 약간 줄임)
+        self.text_override = spec.get("text_override", _NO_TEXT_OVERRIDE)
+        self.requires_value = key in _VALUE_REQUIRED_FIELD_KEYS # 작업비 등 값이 있을 때만 그림
+        self.draw_when_empty = key == "special_notes_display" # 내용이 없어도 영역 표시
+
+_layout_plan = None
+
+def compile_layout_plan(field_map=None):
+    """FIELD_MAP(또는 전달된 맵)을 그리기 순서대로 _FieldSlot 목록으로 변환합니다."""
+    field_map = FIELD_MAP if field_map is None else field_map
+    return tuple(_FieldSlot(key, field_spec) for key, field_spec in field_map.items())
+
+def get_layout_plan():
+    global _layout_plan
+    if _layout_plan is None:
+        _layout_plan = compile_layout_plan()
+    return _layout_plan
+
+def reload_layout_plan(field_map=None):
+    """좌표/폰트 설정을 수정한 뒤 레이아웃 플랜을 다시 컴파일합니다. field_map 을 주면 FIELD_MAP 을 교체합니다."""
+    global FIELD_MAP, _layout_plan
+    if field_map is not None:
+        FIELD_MAP = field_map
+    _layout_plan = compile_layout_plan()
+    return _layout_plan
+
 def _format_currency(amount_val):
     if amount_val is None or str(amount_val).strip() == "": return ""
     try:
@@ -348,7 +518,7 @@ def create_quote_image(state_data, calculated_cost_items, total_cost_overall, pe
         # utils_module은 None으로 유지됨
 
     try:
-        img = Image.open(BACKGROUND_IMAGE_PATH).convert("RGBA")
+        img = _get_background_template().copy()
         draw = ImageDraw.Draw(img)
         print("DEBUG [ImageGenerator]: Background image loaded.")
     except FileNotFoundError:
@@ -534,41 +704,23 @@ def create_quote_image(state_data, calculated_cost_items, total_cost_overall, pe
 
     # --- 텍스트 그리기 ---
     print("DEBUG [ImageGenerator]: Starting to draw text elements on image.")
-    for key, M_raw in FIELD_MAP.items():
-        # 좌표값 int 변환 (이미 위에서 처리되었어야 함, 안전장치)
-        M = {}
-        for k_map, v_map in M_raw.items():
-            if k_map in ["x", "y", "size", "max_width"]: # 숫자여야 하는 속성들
-                try: M[k_map] = int(v_map)
-                except (ValueError, TypeError) : M[k_map] = v_map # 변환 실패시 원본 유지
-            else: M[k_map] = v_map
-
-        text_content_value = M.get("text_override", data_to_draw.get(key)) # text_override 우선
+    for slot in get_layout_plan():
+        if slot.text_override is not _NO_TEXT_OVERRIDE: # text_override 우선
+            text_content_value = slot.text_override
+        else:
+            text_content_value = data_to_draw.get(slot.key)
         final_text_to_draw = ""
         if text_content_value is not None and str(text_content_value).strip() != "": # 공백만 있는 경우도 제외
             final_text_to_draw = str(text_content_value)
 
-        # 특정 레이블/값 쌍은 값이 있을 때만 그리도록 (예: 작업비)
-        if key in ["from_method_label", "from_method_fee_value",
-                   "to_method_label", "to_method_fee_value",
-                   "via_method_label", "via_method_fee_value"] and not final_text_to_draw.strip():
-            continue # 내용 없으면 다음 키로
-
-        # 내용이 있거나, 특이사항처럼 내용 없어도 영역 표시해야 하는 경우
-        if final_text_to_draw.strip() != "" or (key == "special_notes_display" and final_text_to_draw == ""):
-            size_to_use = get_adjusted_font_size(M.get("size", BASE_FONT_SIZE), key)
-            try:
-                font_obj = _get_font(font_type=M.get("font", "regular"), size=size_to_use)
-            except Exception as font_load_err_draw_img: # 폰트 로드 실패 시
-                print(f"ERROR [ImageGenerator]: Font loading error for key '{key}'. Skipping. Error: {font_load_err_draw_img}")
-                continue # 해당 텍스트 그리기는 건너뜀
-
-            color_val = M.get("color", TEXT_COLOR_DEFAULT)
-            align_val = M.get("align", "left")
-            max_w_val = M.get("max_width") # 자동 줄바꿈 최대 폭
-            line_spacing_factor = M.get("line_spacing_factor", 1.15) # 기본 줄간격 (기존 1.2에서 약간 줄임)
+        # 내용이 있거나, 특이사항처럼 내용 없어도 영역 표시해야 하는 경우 (작업비 등은 값이 있을 때만)
+        if final_text_to_draw.strip() == "" and (slot.requires_value or not slot.draw_when_empty):
+            continue
+        if slot.font is None:
+            print(f"ERROR [ImageGenerator]: Font loading error for key '{slot.key}'. Skipping. Error: {slot.font_error}")
+            continue
 
-            _draw_text_with_alignment(draw, final_text_to_draw, M["x"], M["y"], font_obj, color_val, align_val, max_w_val, line_spacing_factor)
+        _draw_text_with_alignment(draw, final_text_to_draw, slot.x, slot.y, slot.font, slot.color, slot.align, slot.max_width, slot.line_spacing_factor)
 
     print("DEBUG [ImageGenerator]: Text drawing complete. Saving image to bytes.")
     img_byte_arr = io.BytesIO()
@@ -579,7 +731,31 @@ def create_quote_image(state_data, calculated_cost_items, total_cost_overall, pe
 
 
 # --- 테스트용 코드 (선택적) ---
+def benchmark_long_notes(note_repeat=200, runs=5, max_width=400):
+    """긴 특이사항 텍스트의 줄바꿈/그리기 시간 측정 (python image_generator.py --benchmark)."""
+    import time
+    note_text = "스타일러 및 금고, 앵글 포함 견적 테스트 요청드립니다. 엘리베이터사용불가시간확인필요합니다 " * note_repeat
+    font = _get_font("regular", BASE_FONT_SIZE)
+    canvas = Image.new("RGBA", (max_width + 20, 20), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(canvas)
+    layout_times, draw_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        lines = layout_text_lines(note_text, font, max_width)
+        layout_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        _draw_text_with_alignment(draw, note_text, 10, 0, font, TEXT_COLOR_DEFAULT, "left", max_width)
+        draw_times.append(time.perf_counter() - start)
+    print(f"notes: {len(note_text):,} chars -> {len(lines)} lines (max_width={max_width})")
+    print(f"layout_text_lines: best {min(layout_times) * 1000:.2f} ms / {runs} runs")
+    print(f"_draw_text_with_alignment: best {min(draw_times) * 1000:.2f} ms / {runs} runs")
+    return min(layout_times), min(draw_times)
+
 if __name__ == '__main__':
+    import sys
+    if "--benchmark" in sys.argv:
+        benchmark_long_notes()
+        sys.exit(0)
     print("image_generator.py test mode")
 
     # 테스트 데이터 (via_point 관련 정보 포함, 차량 및 비용 정보 수정)
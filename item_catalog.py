@@ -0,0 +1,83 @@
+# item_catalog.py
+"""
+data.py 의 품목 정의(item_definitions / items)를 모듈 로드 시 한 번만 펼쳐 둔 카탈로그.
+매 rerun 마다 이사유형 → 섹션 → 품목을 순회하며 f"qty_{...}" 키를 다시 만드는 대신
+미리 계산된 (qty_key, 품목명, 부피, 무게) 목록과 품목명 → qty_key 맵을 사용합니다.
+data.py 를 다시 로드한 경우 reload_catalog() 로 갱신합니다.
+"""
+
+try:
+    import data
+except ImportError:
+    print("Warning [item_catalog.py]: data.py not found, item catalog will be empty.")
+    data = None
+
+DEFAULT_WASTE_SECTION_NAME = "폐기 처리 품목 🗑️"
+
+
+def make_qty_key(move_type, section, item_name):
+    """세션 상태에서 품목 수량을 담는 키 (예: 'qty_가정 이사 🏠_주요 품목_장롱')."""
+    return f"qty_{move_type}_{section}_{item_name}"
+
+
+class ItemCatalog:
+    """
+    move_type 별로 미리 계산된 품목 정보.
+    - volume_entries[move_type]: 부피/무게 계산 대상 (qty_key, item_name, volume_m3, weight_kg) 튜플 (섹션 순서)
+    - item_qty_keys[move_type][item_name]: 해당 품목이 속한 qty_key 튜플 (섹션 순서)
+    - all_qty_keys: 모든 이사유형의 저장 대상 qty_key 목록 (폐기 섹션 제외)
+    - qty_key_parts[qty_key]: (이사유형, 섹션, 품목명) (폐기 섹션 포함, 저장 형식 v2 의 품목 수량 묶음에 사용)
+    - tv_item_names: 'TV(' 로 시작하는 품목명
+    """
+
+    def __init__(self, item_definitions, items, waste_section_name=DEFAULT_WASTE_SECTION_NAME):
+        self.volume_entries = {}
+        self.item_qty_keys = {}
+        self.all_qty_keys = []
+        self.qty_key_parts = {}
+        items = items if isinstance(items, dict) else {}
+        self.tv_item_names = tuple(name for name in items if name.startswith("TV("))
+
+        if not isinstance(item_definitions, dict):
+            return
+        for move_type, sections in item_definitions.items():
+            entries = []
+            keys_by_item = {}
+            if isinstance(sections, dict):
+                for section, item_list in sections.items():
+                    if not isinstance(item_list, list):
+                        continue
+                    for item_name in item_list:
+                        qty_key = make_qty_key(move_type, section, item_name)
+                        keys_by_item.setdefault(item_name, []).append(qty_key)
+                        self.qty_key_parts[qty_key] = (move_type, section, item_name)
+                        if section == waste_section_name or item_name not in items:
+                            continue
+                        item_spec = items.get(item_name, {})
+                        entries.append((qty_key, item_name, item_spec.get("volume_m3", 0), item_spec.get("weight_kg", 0)))
+                        self.all_qty_keys.append(qty_key)
+            self.volume_entries[move_type] = tuple(entries)
+            self.item_qty_keys[move_type] = {name: tuple(keys) for name, keys in keys_by_item.items()}
+
+    def qty_keys_for_item(self, move_type, item_name):
+        return self.item_qty_keys.get(move_type, {}).get(item_name, ())
+
+
+def build_catalog():
+    if not data:
+        return ItemCatalog({}, {})
+    return ItemCatalog(
+        getattr(data, "item_definitions", {}),
+        getattr(data, "items", {}),
+        getattr(data, "WASTE_SECTION_NAME", DEFAULT_WASTE_SECTION_NAME),
+    )
+
+
+CATALOG = build_catalog()
+
+
+def reload_catalog():
+    """data.py 의 품목 정의가 바뀐 뒤 카탈로그를 다시 만듭니다."""
+    global CATALOG
+    CATALOG = build_catalog()
+    return CATALOG
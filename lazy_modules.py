@@ -0,0 +1,166 @@
+# lazy_modules.py
+"""
+무거운 라이브러리(pandas, reportlab, openpyxl, Pillow, Google API 클라이언트)를 끌어오는 모듈을 처음 사용할 때 가져오기.
+
+    pdf_generator = lazy_modules.lazy_import("pdf_generator")
+
+반환된 객체는 첫 속성 접근(pdf_generator.generate_pdf 등) 때 실제 import 를 수행하고 이후에는 모듈로 바로 위임합니다.
+is_available() 은 import 없이 모듈 파일 존재만 확인하며, 이미 로드를 시도했다가 실패한 모듈(모듈 안의 import 오류 등)은 False 입니다.
+각 모듈이 실제로 로드된 시점과 소요 시간은 import_time_report() 로 확인하며,
+`python lazy_modules.py` 는 모듈별 단독 import 시간(새 인터프리터 기준)을 측정해 출력합니다.
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+
+_import_records = [] # (모듈 이름, 소요 초, 로드 계기)
+_import_records_lock = threading.Lock()
+_preload_started = False
+
+
+class LazyModule:
+    """첫 속성 접근 때 import 되는 모듈 대리 객체."""
+
+    def __init__(self, module_name):
+        object.__setattr__(self, "_lazy_module_name", module_name)
+        object.__setattr__(self, "_lazy_module", None)
+        object.__setattr__(self, "_lazy_load_error", None)
+
+    def _load(self, reason="on demand"):
+        module = object.__getattribute__(self, "_lazy_module")
+        if module is None:
+            module_name = object.__getattribute__(self, "_lazy_module_name")
+            already_loaded = module_name in sys.modules
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                object.__setattr__(self, "_lazy_load_error", e)
+                raise
+            object.__setattr__(self, "_lazy_load_error", None)
+            if not already_loaded:
+                _record_import(module_name, time.perf_counter() - start, reason)
+            object.__setattr__(self, "_lazy_module", module)
+        return module
+
+    def __getattr__(self, attribute_name):
+        return getattr(self._load(), attribute_name)
+
+    def __setattr__(self, attribute_name, value):
+        setattr(self._load(), attribute_name, value)
+
+    def __repr__(self):
+        module_name = object.__getattribute__(self, "_lazy_module_name")
+        if object.__getattribute__(self, "_lazy_module") is not None:
+            state = "loaded"
+        elif object.__getattribute__(self, "_lazy_load_error") is not None:
+            state = "load failed"
+        else:
+            state = "not loaded"
+        return f"<lazy module '{module_name}' ({state})>"
+
+
+def _record_import(module_name, seconds, reason):
+    with _import_records_lock:
+        _import_records.append((module_name, seconds, reason))
+    print(f"INFO [lazy_modules]: {module_name} loaded in {seconds * 1000:.0f} ms ({reason})")
+
+
+def lazy_import(module_name):
+    """module_name 을 첫 사용 시 import 하는 LazyModule (이미 로드되어 있으면 모듈 그대로)."""
+    return sys.modules.get(module_name) or LazyModule(module_name)
+
+
+def is_loaded(module):
+    if isinstance(module, LazyModule):
+        return object.__getattribute__(module, "_lazy_module") is not None
+    return True
+
+
+def load_error(module):
+    """마지막 로드 시도에서 발생한 예외 (성공했거나 아직 시도하지 않았으면 None)."""
+    if isinstance(module, LazyModule):
+        return object.__getattribute__(module, "_lazy_load_error")
+    return None
+
+
+def ensure_loaded(module):
+    """지금 로드합니다 (버튼 클릭 처리 직전 등). 실패하면 예외를 그대로 전달하고 이후 is_available() 은 False."""
+    if isinstance(module, LazyModule):
+        return module._load()
+    return module
+
+
+def is_available(module):
+    """모듈을 import 하지 않고 사용 가능 여부(모듈 파일 존재, 이전 로드 실패 없음)를 확인합니다."""
+    if not isinstance(module, LazyModule):
+        return module is not None
+    if is_loaded(module):
+        return True
+    if load_error(module) is not None:
+        return False
+    try:
+        return importlib.util.find_spec(object.__getattribute__(module, "_lazy_module_name")) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def preload_in_background(modules, after_load=None):
+    """
+    프로세스당 한 번, 백그라운드 스레드에서 modules 를 미리 로드합니다 (첫 화면 출력 후 호출).
+    after_load: 로드가 끝난 뒤 같은 스레드에서 호출할 함수 (예: PDF 폰트 등록)
+    """
+    global _preload_started
+    with _import_records_lock:
+        if _preload_started:
+            return None
+        _preload_started = True
+
+    def _preload():
+        for module in modules:
+            if not isinstance(module, LazyModule):
+                continue
+            try:
+                module._load("background preload")
+            except Exception as e:
+                print(f"Warning [lazy_modules]: background preload failed: {e}")
+        if callable(after_load):
+            try:
+                after_load()
+            except Exception as e:
+                print(f"Warning [lazy_modules]: after_load failed: {e}")
+
+    preload_thread = threading.Thread(target=_preload, name="lazy-module-preload", daemon=True)
+    preload_thread.start()
+    return preload_thread
+
+
+def import_time_report():
+    """지금까지 지연 로드된 모듈 목록: [(모듈 이름, 소요 ms, 로드 계기)] (로드 순서)."""
+    with _import_records_lock:
+        return [(module_name, round(seconds * 1000), reason) for module_name, seconds, reason in _import_records]
+
+
+def measure_cold_import_times(module_names):
+    """각 모듈을 새 인터프리터에서 단독으로 import 하는 데 걸리는 시간(ms)."""
+    import os
+    import subprocess
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    timings = {}
+    for module_name in module_names:
+        code = f"import time; t = time.perf_counter(); import {module_name}; print((time.perf_counter() - t) * 1000)"
+        completed = subprocess.run([sys.executable, "-c", code], cwd=script_dir, capture_output=True, text=True)
+        output_lines = completed.stdout.strip().splitlines()
+        timings[module_name] = round(float(output_lines[-1])) if completed.returncode == 0 and output_lines else None
+    return timings
+
+
+HEAVY_APP_MODULES = ("pandas", "google_drive_helper", "pdf_generator", "excel_filler", "email_utils",
+                     "image_generator", "document_pipeline")
+
+
+if __name__ == "__main__":
+    for module_name, elapsed_ms in measure_cold_import_times(("streamlit",) + HEAVY_APP_MODULES).items():
+        print(f"{module_name:<22} {elapsed_ms if elapsed_ms is not None else '실패':>6} ms")
@@ -0,0 +1,81 @@
+# notifier.py
+"""
+문서 생성기/유틸리티가 사용자에게 보여줄 메시지(오류, 경고, 안내, 성공)를 내보내는 경로.
+
+기본값은 Streamlit 화면 출력(st.error 등)이며, streamlit 은 첫 메시지를 출력할 때 가져옵니다.
+브라우저 세션이 없는 배치 작업에서는 set_notifier(LoggingNotifier()) 로 바꿔
+메시지를 logging 으로 기록하고 결과 보고서용으로 모아 둡니다.
+"""
+import logging
+
+NOTICE_LEVELS = ("error", "warning", "info", "success")
+
+
+class StreamlitNotifier:
+    """st.error / st.warning / st.info / st.success 로 화면에 표시."""
+
+    def notify(self, level, message):
+        import streamlit as st
+        getattr(st, level)(message)
+
+    def stop(self):
+        import streamlit as st
+        st.stop()
+
+
+class LoggingNotifier:
+    """logging 으로 기록하고 (level, message) 목록을 모아 둡니다 (drain() 으로 꺼냄)."""
+
+    _LOG_LEVELS = {"error": logging.ERROR, "warning": logging.WARNING, "info": logging.INFO, "success": logging.INFO}
+
+    def __init__(self, logger_name="quote_documents"):
+        self.logger = logging.getLogger(logger_name)
+        self.messages = []
+
+    def notify(self, level, message):
+        self.messages.append((level, str(message)))
+        self.logger.log(self._LOG_LEVELS.get(level, logging.INFO), message)
+
+    def stop(self):
+        # 중단할 화면 실행이 없으므로 호출한 쪽이 실패 값(None 등)을 반환하도록 그대로 둠
+        pass
+
+    def drain(self):
+        collected_messages, self.messages = self.messages, []
+        return collected_messages
+
+
+_notifier = StreamlitNotifier()
+
+
+def get_notifier():
+    return _notifier
+
+
+def set_notifier(new_notifier):
+    """알림 출력 경로를 바꾸고 이전 notifier 를 반환합니다. None 이면 Streamlit 출력으로 되돌립니다."""
+    global _notifier
+    previous_notifier = _notifier
+    _notifier = new_notifier if new_notifier is not None else StreamlitNotifier()
+    return previous_notifier
+
+
+def error(message):
+    _notifier.notify("error", message)
+
+
+def warning(message):
+    _notifier.notify("warning", message)
+
+
+def info(message):
+    _notifier.notify("info", message)
+
+
+def success(message):
+    _notifier.notify("success", message)
+
+
+def stop():
+    """진행할 수 없는 오류 후 호출: Streamlit 에서는 현재 실행을 멈추고(st.stop), 그 외에는 아무것도 하지 않습니다."""
+    _notifier.stop()
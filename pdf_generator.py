@@ -2,11 +2,18 @@
 
 import pandas as pd
 import io
-import streamlit as st
+import notifier # 사용자 메시지 출력 (Streamlit 또는 배치 작업용 로그)
 import traceback
 import utils # utils.py 필요
+import excel_layout
 import data # data.py 필요
 import os
+import json
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
 from datetime import date, datetime
 
 # --- ReportLab 관련 모듈 임포트 ---
@@ -21,7 +28,7 @@ try:
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
     _REPORTLAB_AVAILABLE = True
 except ImportError as reportlab_error:
-    st.error(f"ReportLab 라이브러리를 찾을 수 없습니다: {reportlab_error}")
+    notifier.error(f"ReportLab 라이브러리를 찾을 수 없습니다: {reportlab_error}")
     print(f"ERROR [PDF]: ReportLab not found. PDF generation disabled. {reportlab_error}")
     _REPORTLAB_AVAILABLE = False
 
@@ -35,7 +42,7 @@ except ImportError:
     print("Warning [PDF_GENERATOR]: pdf2image 라이브러리를 찾을 수 없습니다. PDF를 이미지로 변환하는 기능이 비활성화됩니다.")
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageDraw, ImageFont
     _PILLOW_AVAILABLE = True
 except ImportError:
     print("Warning [PDF_GENERATOR]: Pillow 라이브러리를 찾을 수 없습니다. 이미지 처리에 문제가 발생할 수 있습니다.")
@@ -51,417 +58,507 @@ COMPANY_EMAIL = "move24day@gmail.com"
 FONT_DIR = os.path.dirname(os.path.abspath(__file__)) if "__file__" in locals() else "."
 NANUM_GOTHIC_FONT_PATH = os.path.join(FONT_DIR, "NanumGothic.ttf")
 
-# --- PDF 생성 함수 ---
-def generate_pdf(state_data, calculated_cost_items, total_cost, personnel_info):
+# --- 폰트 등록 (프로세스당 1회) ---
+_font_registration = None # (font_name, font_name_bold, 경고 메시지 또는 None)
+_font_registration_lock = threading.Lock()
+
+def register_pdf_fonts():
+    """
+    나눔고딕 TTF 를 ReportLab 에 한 번만 등록하고 (일반, 굵게) 폰트 이름을 반환합니다.
+    앱 시작 시 호출해 두면 (warm-up) 첫 PDF 생성 때 폰트 파싱 비용이 들지 않습니다.
+    """
+    global _font_registration
+    if _font_registration is None:
+        with _font_registration_lock:
+            if _font_registration is None:
+                _font_registration = _register_pdf_fonts_once()
+    return _font_registration[0], _font_registration[1]
+
+_warm_up_started = False
+
+def warm_up_pdf_fonts(background=True):
+    """앱 시작 시 폰트 등록을 미리 해 둡니다 (기본: 백그라운드 스레드, 여러 번 호출해도 1회만 수행)."""
+    global _warm_up_started
+    if _font_registration is not None or _warm_up_started:
+        return
+    _warm_up_started = True
+    if background:
+        threading.Thread(target=register_pdf_fonts, name="pdf-font-warmup", daemon=True).start()
+    else:
+        register_pdf_fonts()
+
+def _register_pdf_fonts_once():
+    font_path = NANUM_GOTHIC_FONT_PATH
     if not _REPORTLAB_AVAILABLE:
-        st.error("PDF 생성을 위한 ReportLab 라이브러리가 없어 PDF를 생성할 수 없습니다.")
-        return None
-
-    buffer = io.BytesIO()
+        return 'Helvetica', 'Helvetica-Bold', None
+    if not os.path.exists(font_path):
+        return 'Helvetica', 'Helvetica-Bold', ("warning", f"나눔고딕 폰트 파일({NANUM_GOTHIC_FONT_PATH})을 찾을 수 없습니다. 기본 폰트로 생성됩니다 (한글 깨짐 가능).")
     try:
-        font_path = NANUM_GOTHIC_FONT_PATH
-        font_name = 'Helvetica'
-        font_name_bold = 'Helvetica-Bold'
-        if os.path.exists(font_path):
-            try:
-                font_name = 'NanumGothic'
-                font_name_bold = 'NanumGothicBold' 
-                if font_name not in pdfmetrics.getRegisteredFontNames():
-                    pdfmetrics.registerFont(TTFont(font_name, font_path))
-                bold_font_path_candidate = os.path.join(FONT_DIR, "NanumGothicBold.ttf") 
-                if os.path.exists(bold_font_path_candidate) and font_name_bold not in pdfmetrics.getRegisteredFontNames():
-                     pdfmetrics.registerFont(TTFont(font_name_bold, bold_font_path_candidate))
-                elif font_name_bold not in pdfmetrics.getRegisteredFontNames(): 
-                     pdfmetrics.registerFont(TTFont(font_name_bold, font_path)) 
-
-            except Exception as font_e:
-                st.error(f"PDF 생성 오류: 폰트 로딩/등록 실패 ('{os.path.basename(font_path)}'). 상세: {font_e}")
-                font_name = 'Helvetica'
-                font_name_bold = 'Helvetica-Bold'
-        else:
-            st.warning(f"나눔고딕 폰트 파일({NANUM_GOTHIC_FONT_PATH})을 찾을 수 없습니다. 기본 폰트로 생성됩니다 (한글 깨짐 가능).")
-
-
-        c = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-        margin_x = 1.5*cm
-        margin_y = 1.5*cm
-        line_height = 0.6*cm
-        right_margin_x = width - margin_x
-        page_number = 1
-
-        def draw_page_template(canvas_obj, page_num):
-            canvas_obj.saveState()
-            canvas_obj.setFont(font_name, 7)
-            company_info_line_height = 0.35 * cm
-            company_info_y = height - margin_y
-            canvas_obj.drawRightString(right_margin_x, company_info_y, f"주소: {COMPANY_ADDRESS}")
-            company_info_y -= company_info_line_height
-            canvas_obj.drawRightString(right_margin_x, company_info_y, f"전화: {COMPANY_PHONE_1} | {COMPANY_PHONE_2}")
-            company_info_y -= company_info_line_height
-            canvas_obj.drawRightString(right_margin_x, company_info_y, f"이메일: {COMPANY_EMAIL}")
-            canvas_obj.restoreState()
-
+        font_name = 'NanumGothic'
+        font_name_bold = 'NanumGothicBold' 
+        if font_name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(font_name, font_path))
+        bold_font_path_candidate = os.path.join(FONT_DIR, "NanumGothicBold.ttf") 
+        if os.path.exists(bold_font_path_candidate) and font_name_bold not in pdfmetrics.getRegisteredFontNames():
+             pdfmetrics.registerFont(TTFont(font_name_bold, bold_font_path_candidate))
+        elif font_name_bold not in pdfmetrics.getRegisteredFontNames(): 
+             pdfmetrics.registerFont(TTFont(font_name_bold, font_path)) 
+        return font_name, font_name_bold, None
+    except Exception as font_e:
+        print(f"ERROR [PDF]: Font registration failed: {font_e}")
+        return 'Helvetica', 'Helvetica-Bold', ("error", f"PDF 생성 오류: 폰트 로딩/등록 실패 ('{os.path.basename(font_path)}'). 상세: {font_e}")
+
+# --- 생성된 PDF 캐시 (같은 견적 입력이면 PDF 생성/이미지 변환/이메일 발송에서 재사용) ---
+# generate_pdf 가 state_data 에서 읽는 키. generate_pdf 에서 새 키를 읽게 되면 여기에도 추가해야 합니다.
+PDF_STATE_KEYS = (
+    'customer_name', 'customer_phone', 'moving_date', 'final_selected_vehicle',
+    'from_location', 'from_address_full', 'to_location', 'to_address_full',
+    'has_via_point', 'via_point_location', 'via_point_address', 'via_point_method',
+    'is_storage_move', 'storage_duration', 'storage_type', 'storage_use_electricity',
+    'card_payment', 'issue_tax_invoice', 'deposit_amount', 'tab3_deposit_amount',
+    'special_notes',
+)
+PDF_CACHE_MAX_ENTRIES = 32
+_pdf_cache = OrderedDict() # 입력 해시 -> PDF bytes (LRU)
+_pdf_cache_lock = threading.Lock()
+
+def quote_input_hash(state_data, calculated_cost_items, total_cost, personnel_info):
+    """PDF 내용을 결정하는 입력(상태 키, 비용 항목, 총액, 인원, 발행일)의 해시."""
+    kst_date_str = utils.get_current_kst_time_str("%Y-%m-%d") if utils and hasattr(utils, 'get_current_kst_time_str') else datetime.now().strftime("%Y-%m-%d")
+    payload = {
+        "state": {key: state_data.get(key) for key in PDF_STATE_KEYS},
+        "cost_items": calculated_cost_items,
+        "total_cost": total_cost,
+        "personnel_info": personnel_info,
+        "issue_date": kst_date_str,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def get_or_generate_pdf(state_data, calculated_cost_items, total_cost, personnel_info):
+    """같은 견적 입력으로 이미 만든 PDF 가 있으면 재사용하고, 없으면 generate_pdf 로 생성합니다."""
+    cache_key = quote_input_hash(state_data, calculated_cost_items, total_cost, personnel_info)
+    with _pdf_cache_lock:
+        cached_pdf = _pdf_cache.get(cache_key)
+        if cached_pdf is not None:
+            _pdf_cache.move_to_end(cache_key)
+            return cached_pdf
+
+    pdf_bytes = generate_pdf(state_data, calculated_cost_items, total_cost, personnel_info)
+    if pdf_bytes:
+        with _pdf_cache_lock:
+            _pdf_cache[cache_key] = pdf_bytes
+            while len(_pdf_cache) > PDF_CACHE_MAX_ENTRIES:
+                _pdf_cache.popitem(last=False)
+    return pdf_bytes
+
+def clear_pdf_cache():
+    with _pdf_cache_lock:
+        _pdf_cache.clear()
+
+# --- 견적서 레이아웃 (PDF/이미지 공통) ---
+def _draw_quote_document(c, font_name, font_name_bold, state_data, calculated_cost_items, total_cost, personnel_info, make_paragraph):
+    """
+    견적서 내용을 캔버스에 그립니다. c 는 ReportLab canvas (PDF) 또는 PillowPageCanvas (이미지),
+    make_paragraph 는 각각 ReportLab Paragraph 또는 PillowParagraph 입니다.
+    """
+    width, height = A4
+    margin_x = 1.5*cm
+    margin_y = 1.5*cm
+    line_height = 0.6*cm
+    right_margin_x = width - margin_x
+    page_number = 1
+
+    def draw_page_template(canvas_obj, page_num):
+        canvas_obj.saveState()
+        canvas_obj.setFont(font_name, 7)
+        company_info_line_height = 0.35 * cm
+        company_info_y = height - margin_y
+        canvas_obj.drawRightString(right_margin_x, company_info_y, f"주소: {COMPANY_ADDRESS}")
+        company_info_y -= company_info_line_height
+        canvas_obj.drawRightString(right_margin_x, company_info_y, f"전화: {COMPANY_PHONE_1} | {COMPANY_PHONE_2}")
+        company_info_y -= company_info_line_height
+        canvas_obj.drawRightString(right_margin_x, company_info_y, f"이메일: {COMPANY_EMAIL}")
+        canvas_obj.restoreState()
+
+    current_y = height - margin_y - 1*cm
+    draw_page_template(c, page_number)
+    c.setFont(font_name_bold, 18)
+    c.drawCentredString(width / 2.0, current_y, "이삿날 견적서(계약서)")
+    current_y -= line_height * 2
+
+    styles = getSampleStyleSheet()
+    center_style = ParagraphStyle(name='CenterStyle', fontName=font_name, fontSize=10, leading=14, alignment=TA_CENTER)
+    service_text = """고객님의 이사를 안전하고 신속하게 책임지는 이삿날입니다."""
+    p_service = make_paragraph(service_text, center_style)
+    p_service_width, p_service_height = p_service.wrapOn(c, width - margin_x*2, 5*cm)
+    if current_y - p_service_height < margin_y:
+        c.showPage(); page_number += 1; draw_page_template(c, page_number); current_y = height - margin_y - 1*cm
+    p_service.drawOn(c, margin_x, current_y - p_service_height)
+    current_y -= (p_service_height + line_height)
+
+    c.setFont(font_name, 11)
+    is_storage = state_data.get('is_storage_move')
+    has_via_point = state_data.get('has_via_point', False)
+
+    kst_date_str = utils.get_current_kst_time_str("%Y-%m-%d") if utils and hasattr(utils, 'get_current_kst_time_str') else datetime.now().strftime("%Y-%m-%d")
+    customer_name = state_data.get('customer_name', '-')
+    customer_phone = state_data.get('customer_phone', '-')
+    moving_date_val = state_data.get('moving_date', '-')
+    moving_date_str = str(moving_date_val)
+    if isinstance(moving_date_val, date):
+         moving_date_str = moving_date_val.strftime('%Y-%m-%d')
+
+    from_location_pdf = state_data.get('from_address_full', state_data.get('from_location', '-'))
+    to_location_pdf = state_data.get('to_address_full', state_data.get('to_location', '-'))
+
+    p_info = personnel_info if isinstance(personnel_info, dict) else {}
+    final_men = p_info.get('final_men', 0)
+    final_women = p_info.get('final_women', 0)
+    personnel_text = f"남성 {final_men}명" + (f", 여성 {final_women}명" if final_women > 0 else "")
+    selected_vehicle = state_data.get('final_selected_vehicle', '미선택')
+
+    info_pairs = [
+        ("고 객 명:", customer_name),
+        ("연 락 처:", customer_phone),
+        ("이 사 일:", moving_date_str),
+        ("견 적 일:", kst_date_str),
+        ("출 발 지:", from_location_pdf), 
+        ("도 착 지:", to_location_pdf),   
+    ]
+
+    if has_via_point:
+        via_location_display_pdf = state_data.get('via_point_address', state_data.get('via_point_location', '-')) 
+        info_pairs.append(("경 유 지:", via_location_display_pdf))
+        info_pairs.append(("경유 작업:", state_data.get('via_point_method', '-')))
+
+    if is_storage:
+        storage_duration_str = f"{state_data.get('storage_duration', 1)} 일"
+        storage_type = state_data.get('storage_type', data.DEFAULT_STORAGE_TYPE if data and hasattr(data, 'DEFAULT_STORAGE_TYPE') else "-")
+        info_pairs.append(("보관 기간:", storage_duration_str))
+        info_pairs.append(("보관 유형:", storage_type))
+        if state_data.get('storage_use_electricity', False):
+             info_pairs.append(("보관 중 전기사용:", "예"))
+
+    info_pairs.append(("작업 인원:", personnel_text))
+    info_pairs.append(("선택 차량:", selected_vehicle))
+
+    value_style = ParagraphStyle(name='InfoValueStyle', fontName=font_name, fontSize=11, leading=13)
+    label_width = 3 * cm
+    value_x = margin_x + label_width
+    value_max_width = width - value_x - margin_x
+
+    for label, value in info_pairs:
+         value_para = make_paragraph(str(value), value_style)
+         value_para_width, value_para_height = value_para.wrapOn(c, value_max_width, line_height * 3)
+         row_height = max(line_height, value_para_height + 0.1*cm)
+
+         if current_y - row_height < margin_y:
+             c.showPage(); page_number += 1; draw_page_template(c, page_number); current_y = height - margin_y - 1*cm
+             c.setFont(font_name, 11)
+
+         label_y_pos = current_y - row_height + (row_height - 11) / 2 + 2
+         c.drawString(margin_x, label_y_pos, label)
+         para_y_pos = current_y - row_height + (row_height - value_para_height) / 2
+         value_para.drawOn(c, value_x, para_y_pos)
+         current_y -= row_height
+    current_y -= line_height * 0.5
+
+    cost_start_y = current_y
+    current_y -= 0.5*cm
+
+    estimated_table_height = (2 + len(calculated_cost_items) * 1.5 + 4) * line_height * 0.5
+    if current_y - estimated_table_height < margin_y:
+        c.showPage(); page_number += 1; draw_page_template(c, page_number)
         current_y = height - margin_y - 1*cm
-        draw_page_template(c, page_number)
-        c.setFont(font_name_bold, 18)
-        c.drawCentredString(width / 2.0, current_y, "이삿날 견적서(계약서)")
-        current_y -= line_height * 2
-
-        styles = getSampleStyleSheet()
-        center_style = ParagraphStyle(name='CenterStyle', fontName=font_name, fontSize=10, leading=14, alignment=TA_CENTER)
-        service_text = """고객님의 이사를 안전하고 신속하게 책임지는 이삿날입니다."""
-        p_service = Paragraph(service_text, center_style)
-        p_service_width, p_service_height = p_service.wrapOn(c, width - margin_x*2, 5*cm)
-        if current_y - p_service_height < margin_y:
-            c.showPage(); page_number += 1; draw_page_template(c, page_number); current_y = height - margin_y - 1*cm
-        p_service.drawOn(c, margin_x, current_y - p_service_height)
-        current_y -= (p_service_height + line_height)
-
         c.setFont(font_name, 11)
-        is_storage = state_data.get('is_storage_move')
-        has_via_point = state_data.get('has_via_point', False)
-
-        kst_date_str = utils.get_current_kst_time_str("%Y-%m-%d") if utils and hasattr(utils, 'get_current_kst_time_str') else datetime.now().strftime("%Y-%m-%d")
-        customer_name = state_data.get('customer_name', '-')
-        customer_phone = state_data.get('customer_phone', '-')
-        moving_date_val = state_data.get('moving_date', '-')
-        moving_date_str = str(moving_date_val)
-        if isinstance(moving_date_val, date):
-             moving_date_str = moving_date_val.strftime('%Y-%m-%d')
-
-        from_location_pdf = state_data.get('from_address_full', state_data.get('from_location', '-'))
-        to_location_pdf = state_data.get('to_address_full', state_data.get('to_location', '-'))
-
-        p_info = personnel_info if isinstance(personnel_info, dict) else {}
-        final_men = p_info.get('final_men', 0)
-        final_women = p_info.get('final_women', 0)
-        personnel_text = f"남성 {final_men}명" + (f", 여성 {final_women}명" if final_women > 0 else "")
-        selected_vehicle = state_data.get('final_selected_vehicle', '미선택')
-
-        info_pairs = [
-            ("고 객 명:", customer_name),
-            ("연 락 처:", customer_phone),
-            ("이 사 일:", moving_date_str),
-            ("견 적 일:", kst_date_str),
-            ("출 발 지:", from_location_pdf), 
-            ("도 착 지:", to_location_pdf),   
-        ]
-
-        if has_via_point:
-            via_location_display_pdf = state_data.get('via_point_address', state_data.get('via_point_location', '-')) 
-            info_pairs.append(("경 유 지:", via_location_display_pdf))
-            info_pairs.append(("경유 작업:", state_data.get('via_point_method', '-')))
-
-        if is_storage:
-            storage_duration_str = f"{state_data.get('storage_duration', 1)} 일"
-            storage_type = state_data.get('storage_type', data.DEFAULT_STORAGE_TYPE if data and hasattr(data, 'DEFAULT_STORAGE_TYPE') else "-")
-            info_pairs.append(("보관 기간:", storage_duration_str))
-            info_pairs.append(("보관 유형:", storage_type))
-            if state_data.get('storage_use_electricity', False):
-                 info_pairs.append(("보관 중 전기사용:", "예"))
-
-        info_pairs.append(("작업 인원:", personnel_text))
-        info_pairs.append(("선택 차량:", selected_vehicle))
-
-        value_style = ParagraphStyle(name='InfoValueStyle', fontName=font_name, fontSize=11, leading=13)
-        label_width = 3 * cm
-        value_x = margin_x + label_width
-        value_max_width = width - value_x - margin_x
-
-        for label, value in info_pairs:
-             value_para = Paragraph(str(value), value_style)
-             value_para_width, value_para_height = value_para.wrapOn(c, value_max_width, line_height * 3)
-             row_height = max(line_height, value_para_height + 0.1*cm)
-
-             if current_y - row_height < margin_y:
-                 c.showPage(); page_number += 1; draw_page_template(c, page_number); current_y = height - margin_y - 1*cm
-                 c.setFont(font_name, 11)
-
-             label_y_pos = current_y - row_height + (row_height - 11) / 2 + 2
-             c.drawString(margin_x, label_y_pos, label)
-             para_y_pos = current_y - row_height + (row_height - value_para_height) / 2
-             value_para.drawOn(c, value_x, para_y_pos)
-             current_y -= row_height
-        current_y -= line_height * 0.5
-
-        cost_start_y = current_y
-        current_y -= 0.5*cm
-
-        estimated_table_height = (2 + len(calculated_cost_items) * 1.5 + 4) * line_height * 0.5
-        if current_y - estimated_table_height < margin_y:
-            c.showPage(); page_number += 1; draw_page_template(c, page_number)
-            current_y = height - margin_y - 1*cm
-            c.setFont(font_name, 11)
-
-        c.setFont(font_name_bold, 12)
-        c.drawString(margin_x, current_y, "[ 비용 상세 내역 ]")
-        current_y -= line_height * 1.2
 
-        c.setFont(font_name_bold, 10)
-        cost_col1_x = margin_x
-        cost_col2_x = margin_x + 8*cm
-        cost_col3_x = margin_x + 11*cm
-        c.drawString(cost_col1_x, current_y, "항목")
-        c.drawRightString(cost_col2_x + 2*cm, current_y, "금액")
-        c.drawString(cost_col3_x, current_y, "비고")
-        c.setFont(font_name, 10)
-        current_y -= 0.2*cm
-        c.line(cost_col1_x, current_y, right_margin_x, current_y)
-        current_y -= line_height * 0.8
-
-        # --- 비용 항목 가공 시작 (PDF 표시용) ---
-        working_items = []
-        if calculated_cost_items and isinstance(calculated_cost_items, list):
-            working_items = [list(item) for item in calculated_cost_items if isinstance(item, (list, tuple)) and len(item) >= 2 and "오류" not in str(item[0])]
-
-        # 1. 날짜 할증 처리
-        date_surcharge_total = 0
-        date_surcharge_applied = False
-        date_surcharge_indices_to_remove = []
-        base_fare_item_ref = None
-
-        for i, item_list in enumerate(working_items):
-            item_name = str(item_list[0])
-            if item_name == "날짜 할증":
-                try:
-                    date_surcharge_total += int(item_list[1] or 0)
-                    date_surcharge_applied = True
-                    date_surcharge_indices_to_remove.append(i)
-                except (ValueError, TypeError):
-                    pass
-            elif item_name == "기본 운임":
-                base_fare_item_ref = item_list # Keep reference to modify directly
-
-        if base_fare_item_ref and date_surcharge_applied and date_surcharge_total > 0:
+    c.setFont(font_name_bold, 12)
+    c.drawString(margin_x, current_y, "[ 비용 상세 내역 ]")
+    current_y -= line_height * 1.2
+
+    c.setFont(font_name_bold, 10)
+    cost_col1_x = margin_x
+    cost_col2_x = margin_x + 8*cm
+    cost_col3_x = margin_x + 11*cm
+    c.drawString(cost_col1_x, current_y, "항목")
+    c.drawRightString(cost_col2_x + 2*cm, current_y, "금액")
+    c.drawString(cost_col3_x, current_y, "비고")
+    c.setFont(font_name, 10)
+    current_y -= 0.2*cm
+    c.line(cost_col1_x, current_y, right_margin_x, current_y)
+    current_y -= line_height * 0.8
+
+    # --- 비용 항목 가공 시작 (PDF 표시용) ---
+    working_items = []
+    if calculated_cost_items and isinstance(calculated_cost_items, list):
+        working_items = [list(item) for item in calculated_cost_items if isinstance(item, (list, tuple)) and len(item) >= 2 and "오류" not in str(item[0])]
+
+    # 1. 날짜 할증 처리
+    date_surcharge_total = 0
+    date_surcharge_applied = False
+    date_surcharge_indices_to_remove = []
+    base_fare_item_ref = None
+
+    for i, item_list in enumerate(working_items):
+        item_name = str(item_list[0])
+        if item_name == "날짜 할증":
             try:
-                current_base_fare_cost = int(base_fare_item_ref[1] or 0)
-                base_fare_item_ref[1] = current_base_fare_cost + date_surcharge_total
-                
-                # 비고 업데이트 (기존 비고에 추가 또는 새로 설정)
-                original_note = str(base_fare_item_ref[2] if len(base_fare_item_ref) > 2 and base_fare_item_ref[2] else "")
-                vehicle_remark = state_data.get('final_selected_vehicle', '')
-                if not original_note or not original_note.startswith(vehicle_remark): # 비고가 없거나 차량명으로 시작 안하면
-                    original_note = f"{vehicle_remark} 기준"
-                
-                base_fare_item_ref[2] = f"{original_note} (이사 집중일 운영 요금 적용)"
-            except Exception as e_ds_merge:
-                print(f"PDF Gen: Error merging date surcharge: {e_ds_merge}")
-
-        for index in sorted(date_surcharge_indices_to_remove, reverse=True):
-            del working_items[index]
-
-        # 2. 수동 사다리 비용 처리
-        departure_manual_ladder_surcharge = 0
-        arrival_manual_ladder_surcharge = 0
-        manual_ladder_indices_to_remove = []
-
-        for i, item_list in enumerate(working_items):
-            item_name = str(item_list[0])
-            cost = 0
-            try: cost = int(item_list[1] or 0)
-            except: pass
-
-            if item_name == "출발지 수동 사다리 추가" or item_name == "출발지 수동 사다리 할인":
-                departure_manual_ladder_surcharge += cost
-                manual_ladder_indices_to_remove.append(i)
-            elif item_name == "도착지 수동 사다리 추가" or item_name == "도착지 수동 사다리 할인":
-                arrival_manual_ladder_surcharge += cost
-                manual_ladder_indices_to_remove.append(i)
-        
-        # 수동 사다리 비용 병합 함수
-        def merge_manual_surcharge(items_list, surcharge_amount, primary_target_prefix, secondary_target_prefix, fallback_target_name, note_suffix):
-            if surcharge_amount == 0:
-                return False # 변경 없음
-
-            merged = False
-            # 1순위: "사다리차"
-            for item_list in items_list:
-                if str(item_list[0]).startswith(primary_target_prefix + " 사다리차"):
-                    item_list[1] = int(item_list[1] or 0) + surcharge_amount
-                    item_list[2] = str(item_list[2] or "") + note_suffix
-                    merged = True
-                    break
-            if merged: return True
+                date_surcharge_total += int(item_list[1] or 0)
+                date_surcharge_applied = True
+                date_surcharge_indices_to_remove.append(i)
+            except (ValueError, TypeError):
+                pass
+        elif item_name == "기본 운임":
+            base_fare_item_ref = item_list # Keep reference to modify directly
+
+    if base_fare_item_ref and date_surcharge_applied and date_surcharge_total > 0:
+        try:
+            current_base_fare_cost = int(base_fare_item_ref[1] or 0)
+            base_fare_item_ref[1] = current_base_fare_cost + date_surcharge_total
             
-            # 2순위: "스카이 장비"
-            for item_list in items_list:
-                if str(item_list[0]).startswith(primary_target_prefix + " 스카이 장비"):
-                    item_list[1] = int(item_list[1] or 0) + surcharge_amount
-                    item_list[2] = str(item_list[2] or "") + note_suffix
-                    merged = True
-                    break
-            if merged: return True
-
-            # 3순위: "기본 운임"
-            for item_list in items_list:
-                if str(item_list[0]) == fallback_target_name: # "기본 운임"
-                    item_list[1] = int(item_list[1] or 0) + surcharge_amount
-                    item_list[2] = str(item_list[2] or "") + f" ({primary_target_prefix} 수동조정 포함)"
-                    merged = True
-                    break
-            return merged
-
-        note_add_manual = " (+수동조정)" # 비고에 추가할 문자열
-
-        merge_manual_surcharge(working_items, departure_manual_ladder_surcharge, "출발지", "출발지", "기본 운임", note_add_manual)
-        merge_manual_surcharge(working_items, arrival_manual_ladder_surcharge, "도착지", "도착지", "기본 운임", note_add_manual)
-
-        for index in sorted(manual_ladder_indices_to_remove, reverse=True):
-            del working_items[index]
+            # 비고 업데이트 (기존 비고에 추가 또는 새로 설정)
+            original_note = str(base_fare_item_ref[2] if len(base_fare_item_ref) > 2 and base_fare_item_ref[2] else "")
+            vehicle_remark = state_data.get('final_selected_vehicle', '')
+            if not original_note or not original_note.startswith(vehicle_remark): # 비고가 없거나 차량명으로 시작 안하면
+                original_note = f"{vehicle_remark} 기준"
+            
+            base_fare_item_ref[2] = f"{original_note} (이사 집중일 운영 요금 적용)"
+        except Exception as e_ds_merge:
+            print(f"PDF Gen: Error merging date surcharge: {e_ds_merge}")
+
+    for index in sorted(date_surcharge_indices_to_remove, reverse=True):
+        del working_items[index]
+
+    # 2. 수동 사다리 비용 처리
+    departure_manual_ladder_surcharge = 0
+    arrival_manual_ladder_surcharge = 0
+    manual_ladder_indices_to_remove = []
+
+    for i, item_list in enumerate(working_items):
+        item_name = str(item_list[0])
+        cost = 0
+        try: cost = int(item_list[1] or 0)
+        except: pass
+
+        if item_name == "출발지 수동 사다리 추가" or item_name == "출발지 수동 사다리 할인":
+            departure_manual_ladder_surcharge += cost
+            manual_ladder_indices_to_remove.append(i)
+        elif item_name == "도착지 수동 사다리 추가" or item_name == "도착지 수동 사다리 할인":
+            arrival_manual_ladder_surcharge += cost
+            manual_ladder_indices_to_remove.append(i)
+    
+    # 수동 사다리 비용 병합 함수
+    def merge_manual_surcharge(items_list, surcharge_amount, primary_target_prefix, secondary_target_prefix, fallback_target_name, note_suffix):
+        if surcharge_amount == 0:
+            return False # 변경 없음
+
+        merged = False
+        # 1순위: "사다리차"
+        for item_list in items_list:
+            if str(item_list[0]).startswith(primary_target_prefix + " 사다리차"):
+                item_list[1] = int(item_list[1] or 0) + surcharge_amount
+                item_list[2] = str(item_list[2] or "") + note_suffix
+                merged = True
+                break
+        if merged: return True
         
-        # 최종 PDF 표시용 비용 항목 리스트 생성
-        cost_items_processed_for_pdf = []
-        for item_data_list in working_items: # working_items는 모든 병합/삭제 처리 후의 리스트
-            item_desc_pdf = str(item_data_list[0])
+        # 2순위: "스카이 장비"
+        for item_list in items_list:
+            if str(item_list[0]).startswith(primary_target_prefix + " 스카이 장비"):
+                item_list[1] = int(item_list[1] or 0) + surcharge_amount
+                item_list[2] = str(item_list[2] or "") + note_suffix
+                merged = True
+                break
+        if merged: return True
+
+        # 3순위: "기본 운임"
+        for item_list in items_list:
+            if str(item_list[0]) == fallback_target_name: # "기본 운임"
+                item_list[1] = int(item_list[1] or 0) + surcharge_amount
+                item_list[2] = str(item_list[2] or "") + f" ({primary_target_prefix} 수동조정 포함)"
+                merged = True
+                break
+        return merged
+
+    note_add_manual = " (+수동조정)" # 비고에 추가할 문자열
+
+    merge_manual_surcharge(working_items, departure_manual_ladder_surcharge, "출발지", "출발지", "기본 운임", note_add_manual)
+    merge_manual_surcharge(working_items, arrival_manual_ladder_surcharge, "도착지", "도착지", "기본 운임", note_add_manual)
+
+    for index in sorted(manual_ladder_indices_to_remove, reverse=True):
+        del working_items[index]
+    
+    # 최종 PDF 표시용 비용 항목 리스트 생성
+    cost_items_processed_for_pdf = []
+    for item_data_list in working_items: # working_items는 모든 병합/삭제 처리 후의 리스트
+        item_desc_pdf = str(item_data_list[0])
+        item_cost_int_pdf = 0
+        item_note_pdf = ""
+        try:
+            item_cost_int_pdf = int(item_data_list[1] or 0)
+        except (ValueError, TypeError):
             item_cost_int_pdf = 0
-            item_note_pdf = ""
-            try:
-                item_cost_int_pdf = int(item_data_list[1] or 0)
-            except (ValueError, TypeError):
-                item_cost_int_pdf = 0
-            if len(item_data_list) > 2:
-                item_note_pdf = str(item_data_list[2] or '')
-            
-            is_discount_or_negative = "할인" in item_desc_pdf or item_cost_int_pdf < 0
-            if item_desc_pdf != "보관료" and item_cost_int_pdf == 0 and not is_discount_or_negative:
-                continue
-            cost_items_processed_for_pdf.append((item_desc_pdf, item_cost_int_pdf, item_note_pdf))
-        # --- 비용 항목 가공 끝 ---
-
-
-        if cost_items_processed_for_pdf: 
-            styleDesc = ParagraphStyle(name='CostDesc', fontName=font_name, fontSize=9, leading=11, alignment=TA_LEFT)
-            styleCost = ParagraphStyle(name='CostAmount', fontName=font_name, fontSize=9, leading=11, alignment=TA_RIGHT)
-            styleNote = ParagraphStyle(name='CostNote', fontName=font_name, fontSize=9, leading=11, alignment=TA_LEFT)
-
-            for item_desc, item_cost, item_note in cost_items_processed_for_pdf: 
-                cost_str = f"{item_cost:,.0f} 원" if item_cost is not None else "0 원"
-                note_str = item_note if item_note else ""
-                p_desc = Paragraph(item_desc, styleDesc)
-                p_cost = Paragraph(cost_str, styleCost)
-                p_note = Paragraph(note_str, styleNote)
-                desc_width = cost_col2_x - cost_col1_x - 0.5*cm
-                cost_width = (cost_col3_x - cost_col2_x) + 1.5*cm
-                note_width = right_margin_x - cost_col3_x
-                desc_height = p_desc.wrap(desc_width, 1000)[1]
-                cost_height = p_cost.wrap(cost_width, 1000)[1]
-                note_height = p_note.wrap(note_width, 1000)[1]
-                max_row_height = max(desc_height, cost_height, note_height, line_height * 0.8)
-
-                if current_y - max_row_height < margin_y:
-                    c.showPage(); page_number += 1; draw_page_template(c, page_number)
-                    current_y = height - margin_y - 1*cm
-                    c.setFont(font_name_bold, 10)
-                    c.drawString(cost_col1_x, current_y, "항목")
-                    c.drawRightString(cost_col2_x + 2*cm, current_y, "금액")
-                    c.drawString(cost_col3_x, current_y, "비고")
-                    current_y -= 0.2*cm; c.line(cost_col1_x, current_y, right_margin_x, current_y); current_y -= line_height * 0.8
-                    c.setFont(font_name, 10)
-
-                y_draw_base = current_y - max_row_height
-                p_desc.drawOn(c, cost_col1_x, y_draw_base + (max_row_height - desc_height))
-                p_cost.drawOn(c, cost_col2_x + 2*cm - cost_width, y_draw_base + (max_row_height - cost_height))
-                p_note.drawOn(c, cost_col3_x, y_draw_base + (max_row_height - note_height))
-                current_y -= (max_row_height + 0.2*cm)
-        else:
-             if current_y < margin_y + 3*cm :
-                 c.showPage(); page_number += 1; draw_page_template(c, page_number)
-                 current_y = height - margin_y - 1*cm
-             c.drawString(cost_col1_x, current_y, "계산된 비용 내역이 없습니다.")
-             current_y -= line_height
-
-        summary_start_y = current_y
-        if summary_start_y < margin_y + line_height * 5 :
+        if len(item_data_list) > 2:
+            item_note_pdf = str(item_data_list[2] or '')
+        
+        is_discount_or_negative = "할인" in item_desc_pdf or item_cost_int_pdf < 0
+        if item_desc_pdf != "보관료" and item_cost_int_pdf == 0 and not is_discount_or_negative:
+            continue
+        cost_items_processed_for_pdf.append((item_desc_pdf, item_cost_int_pdf, item_note_pdf))
+    # --- 비용 항목 가공 끝 ---
+
+
+    if cost_items_processed_for_pdf: 
+        styleDesc = ParagraphStyle(name='CostDesc', fontName=font_name, fontSize=9, leading=11, alignment=TA_LEFT)
+        styleCost = ParagraphStyle(name='CostAmount', fontName=font_name, fontSize=9, leading=11, alignment=TA_RIGHT)
+        styleNote = ParagraphStyle(name='CostNote', fontName=font_name, fontSize=9, leading=11, alignment=TA_LEFT)
+
+        for item_desc, item_cost, item_note in cost_items_processed_for_pdf: 
+            cost_str = f"{item_cost:,.0f} 원" if item_cost is not None else "0 원"
+            note_str = item_note if item_note else ""
+            p_desc = make_paragraph(item_desc, styleDesc)
+            p_cost = make_paragraph(cost_str, styleCost)
+            p_note = make_paragraph(note_str, styleNote)
+            desc_width = cost_col2_x - cost_col1_x - 0.5*cm
+            cost_width = (cost_col3_x - cost_col2_x) + 1.5*cm
+            note_width = right_margin_x - cost_col3_x
+            desc_height = p_desc.wrap(desc_width, 1000)[1]
+            cost_height = p_cost.wrap(cost_width, 1000)[1]
+            note_height = p_note.wrap(note_width, 1000)[1]
+            max_row_height = max(desc_height, cost_height, note_height, line_height * 0.8)
+
+            if current_y - max_row_height < margin_y:
+                c.showPage(); page_number += 1; draw_page_template(c, page_number)
+                current_y = height - margin_y - 1*cm
+                c.setFont(font_name_bold, 10)
+                c.drawString(cost_col1_x, current_y, "항목")
+                c.drawRightString(cost_col2_x + 2*cm, current_y, "금액")
+                c.drawString(cost_col3_x, current_y, "비고")
+                current_y -= 0.2*cm; c.line(cost_col1_x, current_y, right_margin_x, current_y); current_y -= line_height * 0.8
+                c.setFont(font_name, 10)
+
+            y_draw_base = current_y - max_row_height
+            p_desc.drawOn(c, cost_col1_x, y_draw_base + (max_row_height - desc_height))
+            p_cost.drawOn(c, cost_col2_x + 2*cm - cost_width, y_draw_base + (max_row_height - cost_height))
+            p_note.drawOn(c, cost_col3_x, y_draw_base + (max_row_height - note_height))
+            current_y -= (max_row_height + 0.2*cm)
+    else:
+         if current_y < margin_y + 3*cm :
+             c.showPage(); page_number += 1; draw_page_template(c, page_number)
+             current_y = height - margin_y - 1*cm
+         c.drawString(cost_col1_x, current_y, "계산된 비용 내역이 없습니다.")
+         current_y -= line_height
+
+    summary_start_y = current_y
+    if summary_start_y < margin_y + line_height * 5 :
+        c.showPage(); page_number += 1; draw_page_template(c, page_number)
+        summary_start_y = height - margin_y - 1*cm
+        c.setFont(font_name, 11)
+
+    current_y = summary_start_y
+    c.line(cost_col1_x, current_y, right_margin_x, current_y)
+    current_y -= line_height
+
+    total_cost_num = 0
+    if isinstance(total_cost, (int, float)): # total_cost는 이미 모든 계산이 반영된 최종 금액
+        total_cost_num = int(total_cost)
+
+    deposit_amount_raw = state_data.get('deposit_amount', state_data.get('tab3_deposit_amount', 0))
+    deposit_amount = 0
+    try: deposit_amount = int(deposit_amount_raw or 0)
+    except (ValueError, TypeError): deposit_amount = 0
+    remaining_balance = total_cost_num - deposit_amount
+
+    is_tax_invoice_selected_pdf = state_data.get('issue_tax_invoice', False)
+    is_card_payment_selected_pdf = state_data.get('card_payment', False)
+    
+    final_total_label_suffix = ""
+    if is_card_payment_selected_pdf:
+        final_total_label_suffix = "(카드수수료 포함)" 
+    elif is_tax_invoice_selected_pdf:
+        final_total_label_suffix = "(VAT 포함)"
+    else:
+        final_total_label_suffix = "(VAT 별도)"
+
+    c.setFont(font_name_bold, 12)
+    total_cost_label_pdf = f"총 견적 비용 {final_total_label_suffix}" 
+    c.drawString(cost_col1_x, current_y, total_cost_label_pdf)
+    total_cost_str = f"{total_cost_num:,.0f} 원"
+    c.setFont(font_name_bold, 14)
+    c.drawRightString(right_margin_x, current_y, total_cost_str)
+    current_y -= line_height
+
+    c.setFont(font_name, 11)
+    c.drawString(cost_col1_x, current_y, "계약금 (현금)") 
+    deposit_str = f"{deposit_amount:,.0f} 원"
+    c.setFont(font_name, 12)
+    c.drawRightString(right_margin_x, current_y, deposit_str)
+    current_y -= line_height
+
+    c.setFont(font_name_bold, 12)
+    remaining_label_pdf = f"잔금 {final_total_label_suffix}" 
+    c.drawString(cost_col1_x, current_y, remaining_label_pdf)
+    remaining_str = f"{remaining_balance:,.0f} 원"
+    c.setFont(font_name_bold, 14)
+    c.drawRightString(right_margin_x, current_y, remaining_str)
+    current_y -= line_height
+
+    special_notes = state_data.get('special_notes', '').strip()
+    if special_notes:
+        notes_section_start_y = current_y
+        if notes_section_start_y < margin_y + line_height * 3 :
             c.showPage(); page_number += 1; draw_page_template(c, page_number)
-            summary_start_y = height - margin_y - 1*cm
+            current_y = height - margin_y - 1*cm; notes_section_start_y = current_y
             c.setFont(font_name, 11)
+        else:
+            current_y -= line_height
 
-        current_y = summary_start_y
-        c.line(cost_col1_x, current_y, right_margin_x, current_y)
-        current_y -= line_height
-
-        total_cost_num = 0
-        if isinstance(total_cost, (int, float)): # total_cost는 이미 모든 계산이 반영된 최종 금액
-            total_cost_num = int(total_cost)
-
-        deposit_amount_raw = state_data.get('deposit_amount', state_data.get('tab3_deposit_amount', 0))
-        deposit_amount = 0
-        try: deposit_amount = int(deposit_amount_raw or 0)
-        except (ValueError, TypeError): deposit_amount = 0
-        remaining_balance = total_cost_num - deposit_amount
+        c.setFont(font_name_bold, 11)
+        c.drawString(margin_x, current_y, "[ 고객요구사항 ]")
+        current_y -= line_height * 1.2
 
-        is_tax_invoice_selected_pdf = state_data.get('issue_tax_invoice', False)
-        is_card_payment_selected_pdf = state_data.get('card_payment', False)
-        
-        final_total_label_suffix = ""
-        if is_card_payment_selected_pdf:
-            final_total_label_suffix = "(카드수수료 포함)" 
-        elif is_tax_invoice_selected_pdf:
-            final_total_label_suffix = "(VAT 포함)"
-        else:
-            final_total_label_suffix = "(VAT 별도)"
+        styleNotes = ParagraphStyle(name='NotesParagraph', fontName=font_name, fontSize=10, leading=12, alignment=TA_LEFT)
+        available_width = width - margin_x * 2
+        notes_parts = [part.strip().replace('\n', '<br/>') for part in special_notes.split('\n') if part.strip()]
 
-        c.setFont(font_name_bold, 12)
-        total_cost_label_pdf = f"총 견적 비용 {final_total_label_suffix}" 
-        c.drawString(cost_col1_x, current_y, total_cost_label_pdf)
-        total_cost_str = f"{total_cost_num:,.0f} 원"
-        c.setFont(font_name_bold, 14)
-        c.drawRightString(right_margin_x, current_y, total_cost_str)
-        current_y -= line_height
+        for note_part in notes_parts:
+            if not note_part: continue
+            p_part = make_paragraph(note_part, styleNotes)
+            part_width, part_height = p_part.wrapOn(c, available_width, 1000)
 
-        c.setFont(font_name, 11)
-        c.drawString(cost_col1_x, current_y, "계약금 (현금)") 
-        deposit_str = f"{deposit_amount:,.0f} 원"
-        c.setFont(font_name, 12)
-        c.drawRightString(right_margin_x, current_y, deposit_str)
-        current_y -= line_height
-
-        c.setFont(font_name_bold, 12)
-        remaining_label_pdf = f"잔금 {final_total_label_suffix}" 
-        c.drawString(cost_col1_x, current_y, remaining_label_pdf)
-        remaining_str = f"{remaining_balance:,.0f} 원"
-        c.setFont(font_name_bold, 14)
-        c.drawRightString(right_margin_x, current_y, remaining_str)
-        current_y -= line_height
-
-        special_notes = state_data.get('special_notes', '').strip()
-        if special_notes:
-            notes_section_start_y = current_y
-            if notes_section_start_y < margin_y + line_height * 3 :
+            if current_y - part_height < margin_y:
                 c.showPage(); page_number += 1; draw_page_template(c, page_number)
-                current_y = height - margin_y - 1*cm; notes_section_start_y = current_y
+                current_y = height - margin_y - 1*cm
                 c.setFont(font_name, 11)
-            else:
-                current_y -= line_height
 
-            c.setFont(font_name_bold, 11)
-            c.drawString(margin_x, current_y, "[ 고객요구사항 ]")
-            current_y -= line_height * 1.2
+            p_part.drawOn(c, margin_x, current_y - part_height)
+            current_y -= (part_height + line_height * 0.2)
 
-            styleNotes = ParagraphStyle(name='NotesParagraph', fontName=font_name, fontSize=10, leading=12, alignment=TA_LEFT)
-            available_width = width - margin_x * 2
-            notes_parts = [part.strip().replace('\n', '<br/>') for part in special_notes.split('\n') if part.strip()]
-
-            for note_part in notes_parts:
-                if not note_part: continue
-                p_part = Paragraph(note_part, styleNotes)
-                part_width, part_height = p_part.wrapOn(c, available_width, 1000)
+# --- PDF 생성 함수 ---
+def generate_pdf(state_data, calculated_cost_items, total_cost, personnel_info):
+    if not _REPORTLAB_AVAILABLE:
+        notifier.error("PDF 생성을 위한 ReportLab 라이브러리가 없어 PDF를 생성할 수 없습니다.")
+        return None
 
-                if current_y - part_height < margin_y:
-                    c.showPage(); page_number += 1; draw_page_template(c, page_number)
-                    current_y = height - margin_y - 1*cm
-                    c.setFont(font_name, 11)
+    buffer = io.BytesIO()
+    try:
+        font_name, font_name_bold = register_pdf_fonts()
+        font_notice = _font_registration[2]
+        if font_notice:
+            notice_level, notice_message = font_notice
+            if notice_level == "error": notifier.error(notice_message)
+            else: notifier.warning(notice_message)
 
-                p_part.drawOn(c, margin_x, current_y - part_height)
-                current_y -= (part_height + line_height * 0.2)
 
+        c = canvas.Canvas(buffer, pagesize=A4)
+        _draw_quote_document(c, font_name, font_name_bold, state_data, calculated_cost_items, total_cost, personnel_info, Paragraph)
         c.save()
         buffer.seek(0)
         return buffer.getvalue()
 
     except Exception as e:
-        st.error(f"PDF 생성 중 예외 발생: {e}")
+        notifier.error(f"PDF 생성 중 예외 발생: {e}")
         print(f"Error during PDF generation: {e}")
         traceback.print_exc()
         return None
@@ -469,13 +566,13 @@ def generate_pdf(state_data, calculated_cost_items, total_cost, personnel_info):
 # --- PDF를 이미지로 변환하는 함수 ---
 def generate_quote_image_from_pdf(pdf_bytes, image_format='JPEG', poppler_path=None):
     if not _PDF2IMAGE_AVAILABLE:
-        st.error("pdf2image 라이브러리가 없어 PDF를 이미지로 변환할 수 없습니다. Poppler 설치 및 경로 설정을 확인하세요.")
+        notifier.error("pdf2image 라이브러리가 없어 PDF를 이미지로 변환할 수 없습니다. Poppler 설치 및 경로 설정을 확인하세요.")
         return None
     if not _PILLOW_AVAILABLE:
-        st.error("Pillow 라이브러리가 없어 이미지를 처리할 수 없습니다.")
+        notifier.error("Pillow 라이브러리가 없어 이미지를 처리할 수 없습니다.")
         return None
     if not pdf_bytes:
-        st.error("이미지로 변환할 PDF 데이터가 없습니다.")
+        notifier.error("이미지로 변환할 PDF 데이터가 없습니다.")
         return None
 
     try:
@@ -492,16 +589,253 @@ def generate_quote_image_from_pdf(pdf_bytes, image_format='JPEG', poppler_path=N
             img_byte_arr = img_byte_arr.getvalue()
             return img_byte_arr
         else:
-            st.error("PDF에서 이미지를 추출하지 못했습니다.")
+            notifier.error("PDF에서 이미지를 추출하지 못했습니다.")
             return None
     except Exception as e:
-        st.error(f"PDF를 이미지로 변환하는 중 오류 발생: {e}")
+        notifier.error(f"PDF를 이미지로 변환하는 중 오류 발생: {e}")
         print(f"Error converting PDF to image: {e}")
         traceback.print_exc()
         if "poppler" in str(e).lower():
-             st.info("Poppler가 시스템에 설치되어 있고 PATH에 등록되었는지 확인해주세요. Windows의 경우 Poppler 바이너리 경로를 직접 지정해야 할 수 있습니다.")
+             notifier.info("Poppler가 시스템에 설치되어 있고 PATH에 등록되었는지 확인해주세요. Windows의 경우 Poppler 바이너리 경로를 직접 지정해야 할 수 있습니다.")
+        return None
+
+# --- PDF 없이 Pillow 로 고객용 견적서 이미지 그리기 ---
+# generate_pdf 와 같은 레이아웃(_draw_quote_document)을 Pillow 캔버스에 그려, poppler 프로세스/임시파일 없이
+# 첫 페이지 이미지를 만듭니다. QUOTE_IMAGE_RENDER_MODE 또는 generate_quote_image(mode=...) 로 선택합니다.
+# 기본값은 PDF 와 똑같은 결과가 나오는 poppler 이며, pillow 는 poppler 를 설치할 수 없는 환경용 대체 경로입니다.
+QUOTE_IMAGE_RENDER_MODE = "poppler" # "poppler": PDF 생성 후 pdf2image 변환, "pillow": 직접 그리기
+QUOTE_IMAGE_DPI = 200 # pdf2image.convert_from_bytes 기본 해상도와 동일
+_BR_TAG_PATTERN = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_pil_font_cache = {} # (폰트 파일 경로 또는 None, 픽셀 크기) -> ImageFont (캔버스마다 TTF 를 다시 읽지 않도록)
+
+class PillowPageCanvas:
+    """_draw_quote_document 가 사용하는 ReportLab canvas 메서드만 구현한 Pillow 캔버스 (좌표 단위: pt, 원점 좌하단)."""
+
+    def __init__(self, pagesize, dpi=QUOTE_IMAGE_DPI):
+        self.page_width, self.page_height = pagesize
+        self.scale = dpi / 72.0
+        self.pixel_size = (int(round(self.page_width * self.scale)), int(round(self.page_height * self.scale)))
+        self.pages = []
+        self._font_cache = {}
+        self._state_stack = []
+        self._font_name, self._font_size = 'Helvetica', 12
+        self._new_page()
+
+    def _new_page(self):
+        self._image = Image.new("RGB", self.pixel_size, "white")
+        self._draw = ImageDraw.Draw(self._image)
+        self.pages.append(self._image)
+
+    def _to_px(self, x, y):
+        return x * self.scale, (self.page_height - y) * self.scale
+
+    def get_pil_font(self, font_name, font_size):
+        cache_key = (font_name, font_size)
+        pil_font = self._font_cache.get(cache_key)
+        if pil_font is None:
+            pil_font = _load_pil_font(font_name, font_size * self.scale)
+            self._font_cache[cache_key] = pil_font
+        return pil_font
+
+    def text_width(self, text, font_name=None, font_size=None):
+        """문자열 폭 (pt)."""
+        pil_font = self.get_pil_font(font_name or self._font_name, font_size or self._font_size)
+        return pil_font.getlength(str(text)) / self.scale
+
+    def draw_text(self, x, y, text, font_name=None, font_size=None):
+        pil_font = self.get_pil_font(font_name or self._font_name, font_size or self._font_size)
+        self._draw.text(self._to_px(x, y), str(text), font=pil_font, fill="black", anchor="ls")
+
+    def setFont(self, font_name, font_size):
+        self._font_name, self._font_size = font_name, font_size
+
+    def drawString(self, x, y, text):
+        self.draw_text(x, y, text)
+
+    def drawRightString(self, x, y, text):
+        self.draw_text(x - self.text_width(text), y, text)
+
+    def drawCentredString(self, x, y, text):
+        self.draw_text(x - self.text_width(text) / 2.0, y, text)
+
+    def line(self, x1, y1, x2, y2):
+        self._draw.line([self._to_px(x1, y1), self._to_px(x2, y2)], fill="black", width=max(1, int(round(self.scale))))
+
+    def saveState(self):
+        self._state_stack.append((self._font_name, self._font_size))
+
+    def restoreState(self):
+        if self._state_stack:
+            self._font_name, self._font_size = self._state_stack.pop()
+
+    def showPage(self):
+        self._new_page()
+
+    def save(self):
+        pass
+
+
+class PillowParagraph:
+    """
+    ReportLab Paragraph 의 wrap/wrapOn/drawOn 을 흉내낸 단순 문단.
+    공백 단위로 줄바꿈하고, 한 줄보다 긴 단어는 ReportLab 의 splitLongWords 처럼 글자 단위로 나눕니다.
+    마크업은 <br/> 와 문자 엔티티(&amp; 등)만 처리합니다.
+    """
+
+    def __init__(self, text, style):
+        self.text = str(text)
+        self.style = style
+        self._lines = []
+        self._width = 0
+
+    def wrapOn(self, canv, avail_width, avail_height):
+        self._canvas = canv
+        return self.wrap(avail_width, avail_height)
+
+    def wrap(self, avail_width, avail_height):
+        canv = getattr(self, "_canvas", None)
+        self._width = avail_width
+        self._lines = []
+        for paragraph_part in _BR_TAG_PATTERN.sub("\n", self.text).split("\n"):
+            current_line = ""
+            for word in html.unescape(paragraph_part).split():
+                candidate = f"{current_line} {word}" if current_line else word
+                if canv is None or self._fits(canv, candidate, avail_width):
+                    current_line = candidate
+                elif self._fits(canv, word, avail_width):
+                    self._lines.append(current_line)
+                    current_line = word
+                else:
+                    current_line = self._split_long_word(canv, current_line, word, avail_width)
+            self._lines.append(current_line)
+        return avail_width, len(self._lines) * self.style.leading
+
+    def _fits(self, canv, text, avail_width):
+        return canv.text_width(text, self.style.fontName, self.style.fontSize) <= avail_width
+
+    def _split_long_word(self, canv, current_line, word, avail_width):
+        """한 줄보다 긴 단어: 현재 줄의 남은 폭부터 글자 단위로 채우고 나머지는 다음 줄로 (마지막 조각 반환)."""
+        line_text = f"{current_line} " if current_line else ""
+        for char in word:
+            if line_text.strip() and not self._fits(canv, line_text + char, avail_width):
+                self._lines.append(line_text.rstrip())
+                line_text = ""
+            line_text += char
+        return line_text
+
+    def drawOn(self, canv, x, y):
+        if getattr(self, "_canvas", None) is not canv:
+            self._canvas = canv
+            self.wrap(self._width, 0)
+        baseline_y = y + len(self._lines) * self.style.leading - self.style.fontSize
+        for line_text in self._lines:
+            line_x = x
+            if self.style.alignment in (TA_CENTER, TA_RIGHT):
+                line_width = canv.text_width(line_text, self.style.fontName, self.style.fontSize)
+                line_x = x + (self._width - line_width) / (2.0 if self.style.alignment == TA_CENTER else 1.0)
+            canv.draw_text(line_x, baseline_y, line_text, self.style.fontName, self.style.fontSize)
+            baseline_y -= self.style.leading
+
+
+def _load_pil_font(font_name, pixel_size):
+    font_path = None
+    if font_name.startswith('NanumGothic'):
+        bold_font_path = os.path.join(FONT_DIR, "NanumGothicBold.ttf")
+        font_path = bold_font_path if font_name == 'NanumGothicBold' and os.path.exists(bold_font_path) else NANUM_GOTHIC_FONT_PATH
+    if not (font_path and os.path.exists(font_path)):
+        font_path = None
+    pixel_size = max(1, int(round(pixel_size)))
+    cache_key = (font_path, pixel_size)
+    pil_font = _pil_font_cache.get(cache_key)
+    if pil_font is None:
+        if font_path:
+            pil_font = ImageFont.truetype(font_path, pixel_size)
+        else:
+            try:
+                pil_font = ImageFont.load_default(size=pixel_size)
+            except TypeError: # Pillow 10.1 미만은 size 인자가 없어 고정 크기 비트맵 폰트만 사용 가능
+                pil_font = ImageFont.load_default()
+        _pil_font_cache[cache_key] = pil_font
+    return pil_font
+
+
+def render_quote_page_images(state_data, calculated_cost_items, total_cost, personnel_info, dpi=QUOTE_IMAGE_DPI):
+    """견적서 레이아웃을 Pillow 로 그려 페이지별 PIL 이미지 목록을 반환합니다."""
+    font_name, font_name_bold = register_pdf_fonts()
+    page_canvas = PillowPageCanvas(A4, dpi=dpi)
+    _draw_quote_document(page_canvas, font_name, font_name_bold, state_data, calculated_cost_items, total_cost, personnel_info, PillowParagraph)
+    return page_canvas.pages
+
+
+def _encode_quote_image(img_to_save, image_format):
+    img_byte_arr = io.BytesIO()
+    if img_to_save.mode == 'RGBA' and image_format.upper() == 'JPEG':
+        img_to_save = img_to_save.convert('RGB')
+    save_options = {'quality': 90} if image_format.upper() == 'JPEG' else {}
+    img_to_save.save(img_byte_arr, format=image_format, **save_options)
+    return img_byte_arr.getvalue()
+
+
+def generate_quote_image(state_data, calculated_cost_items, total_cost, personnel_info, image_format='JPEG', mode=None, poppler_path=None):
+    """
+    고객용 견적서 첫 페이지 이미지.
+    mode="pillow" 는 PDF 레이아웃을 Pillow 로 직접 그리고, mode="poppler" 는 PDF 를 만든 뒤 pdf2image 로 변환합니다.
+    """
+    mode = mode or QUOTE_IMAGE_RENDER_MODE
+    if mode == "poppler":
+        pdf_bytes = get_or_generate_pdf(state_data, calculated_cost_items, total_cost, personnel_info)
+        return generate_quote_image_from_pdf(pdf_bytes, image_format=image_format, poppler_path=poppler_path)
+
+    if not _REPORTLAB_AVAILABLE or not _PILLOW_AVAILABLE:
+        notifier.error("ReportLab/Pillow 라이브러리가 없어 견적서 이미지를 생성할 수 없습니다.")
+        return None
+    try:
+        pages = render_quote_page_images(state_data, calculated_cost_items, total_cost, personnel_info)
+        return _encode_quote_image(pages[0], image_format)
+    except Exception as e:
+        notifier.error(f"견적서 이미지 생성 중 오류 발생: {e}")
+        print(f"Error rendering quote image with Pillow: {e}")
+        traceback.print_exc()
         return None
 
+
+def benchmark_quote_image_modes(runs=5):
+    """pillow / poppler 이미지 생성 지연시간과 메모리 비교 (python pdf_generator.py --benchmark-image)."""
+    import time
+    import tracemalloc
+    import resource
+    import shutil
+    sample_state = {
+        "customer_name": "홍길동", "customer_phone": "010-1234-5678", "moving_date": date.today(),
+        "from_address_full": "서울특별시 은평구 가좌로10길 33-1 101동 1001호", "to_address_full": "경기도 고양시 덕양구 화정로 12",
+        "final_selected_vehicle": "5톤", "special_notes": "엘리베이터 사용 가능 시간 확인 필요\n피아노 운반 포함" * 3,
+    }
+    sample_costs = [("기본 운임", 1200000, "5톤 기준"), ("출발지 사다리차", 150000, "10층"), ("추가 인력", 200000, "남성 1명")]
+    register_pdf_fonts()
+    for mode in ("pillow", "poppler"):
+        if mode == "poppler" and (not _PDF2IMAGE_AVAILABLE or not shutil.which("pdftoppm")):
+            print("poppler: pdf2image 또는 poppler(pdftoppm) 미설치 - 건너뜀")
+            continue
+        clear_pdf_cache()
+        children_rss_before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        tracemalloc.start()
+        timings = []
+        image_bytes = None
+        for _ in range(runs):
+            clear_pdf_cache()
+            start = time.perf_counter()
+            image_bytes = generate_quote_image(sample_state, sample_costs, 1550000, {"final_men": 3}, image_format="PNG", mode=mode)
+            timings.append(time.perf_counter() - start)
+        _, python_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        if not image_bytes:
+            print(f"{mode}: 이미지 생성 실패")
+            continue
+        print(f"{mode}: best {min(timings) * 1000:.1f} ms, mean {sum(timings) / len(timings) * 1000:.1f} ms / {runs} runs, "
+              f"python peak {python_peak / 1024 / 1024:.1f} MB, child max RSS {max(children_rss, children_rss_before) / 1024:.1f} MB, "
+              f"{len(image_bytes):,} bytes")
+
 # --- 엑셀 생성 함수 (generate_excel) ---
 def generate_excel(state_data, calculated_cost_items, total_cost, personnel_info):
     output = io.BytesIO()
@@ -652,51 +986,25 @@ def generate_excel(state_data, calculated_cost_items, total_cost, personnel_info
         df_summary = pd.DataFrame(summary_data, columns=["항목", "금액", "비고"])
         df_costs_final = pd.concat([df_costs, df_summary], ignore_index=True)
 
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
             df_info.to_excel(writer, sheet_name='견적 정보', index=False)
             df_all_items.to_excel(writer, sheet_name='전체 품목 수량', index=False)
             df_costs_final.to_excel(writer, sheet_name='비용 내역 및 요약', index=False)
-            workbook = writer.book
-            ws_info = writer.sheets['견적 정보']
-            ws_items = writer.sheets['전체 품목 수량']
-            ws_costs = writer.sheets['비용 내역 및 요약']
             num_format = '#,##0'
-            cost_cols_to_format = ['B']
-            item_cols_to_format = ['B']
-            for ws in [ws_info, ws_items, ws_costs]:
-                 cols_to_format = []
-                 if ws.title == '비용 내역 및 요약': cols_to_format = cost_cols_to_format
-                 elif ws.title == '전체 품목 수량': cols_to_format = item_cols_to_format
-                 for col_letter in cols_to_format:
-                     for row in range(2, ws.max_row + 1):
-                         cell = ws[f'{col_letter}{row}']
-                         if isinstance(cell.value, (int, float)): cell.number_format = num_format
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                for col in worksheet.columns:
-                    max_length = 0; column = col[0].column_letter
-                    try:
-                        header_value = worksheet[f"{column}1"].value
-                        header_len = sum(2 if '\uac00' <= char <= '\ud7a3' else 1 for char in str(header_value)) if header_value else 0
-                        max_length = header_len
-                    except Exception: header_len = 0; max_length = 0
-                    for cell in col[1:]:
-                        try:
-                            if cell.value is not None:
-                                if isinstance(cell.value, (int, float)) and cell.number_format == num_format: cell_text = f"{cell.value:,}"
-                                else: cell_text = str(cell.value)
-                                lines = cell_text.split('\n'); current_max_line_len = 0
-                                if lines:
-                                     line_lengths = [sum(2 if '\uac00' <= char <= '\ud7a3' else 1 for char in str(line or '')) for line in lines]
-                                     if line_lengths: current_max_line_len = max(line_lengths)
-                                if current_max_line_len > max_length: max_length = current_max_line_len
-                        except Exception as cell_proc_err: print(f"Warning: Error processing cell {cell.coordinate} for width calc: {cell_proc_err}")
-                    adjusted_width = max_length + 2; adjusted_width = max(adjusted_width, 8); adjusted_width = min(adjusted_width, 50)
-                    worksheet.column_dimensions[column].width = adjusted_width
+            # 열 너비 추정과 숫자 서식은 열 단위로 한 번에 지정 (셀 단위 순회 없음)
+            excel_layout.apply_column_layout(writer, '견적 정보', df_info)
+            excel_layout.apply_column_layout(writer, '전체 품목 수량', df_all_items, {"수량": num_format})
+            excel_layout.apply_column_layout(writer, '비용 내역 및 요약', df_costs_final, {"금액": num_format})
         excel_data = output.getvalue()
         return excel_data
     except Exception as e:
-        st.error(f"엑셀 파일 생성 중 오류: {e}")
+        notifier.error(f"엑셀 파일 생성 중 오류: {e}")
         print(f"Error during Excel generation: {e}")
         traceback.print_exc()
         return None
+
+
+if __name__ == "__main__":
+    import sys
+    if "--benchmark-image" in sys.argv:
+        benchmark_quote_image_modes()
@@ -0,0 +1,242 @@
+# quote_state.py
+"""
+견적 상태(세션 상태와 같은 키 구조)의 기본값과 저장된 견적 JSON 복원 규칙.
+state_manager 가 st.session_state 에 적용하고, 배치 작업(batch_render 등)은 일반 dict 에 적용합니다.
+
+저장 형식
+- v1: 저장 대상 키 전부(대부분 0 인 품목 수량 qty_ 포함)를 들여쓴 JSON 으로 기록
+- v2 (save_format: 2): 기본값과 다른 값만 기록하고 품목 수량은 {이사유형: {섹션: {품목: 수량}}} 로 묶음,
+  선택적으로 gzip 압축. 읽을 때 expand_saved_data() 가 기본값을 채워 v1 과 같은 dict 로 펼칩니다.
+"""
+from datetime import datetime, date
+import gzip
+import json
+import pytz
+import item_catalog
+
+try:
+    import data
+    MOVE_TYPE_OPTIONS = list(data.item_definitions.keys()) if hasattr(data, 'item_definitions') and data.item_definitions else ["가정 이사 🏠", "사무실 이사 🏢"]
+except ImportError:
+    print("Warning [quote_state]: data.py not found, using fallback defaults.")
+    MOVE_TYPE_OPTIONS = ["가정 이사 🏠", "사무실 이사 🏢"]
+    data = None
+
+DATE_STATE_KEYS = ("moving_date", "arrival_date", "contract_date")
+
+# prepare_state_for_save 가 저장하는 키 (품목 수량 qty_ 키는 item_catalog 에서 추가)
+SAVED_STATE_KEYS = (
+    "base_move_type", "is_storage_move", "storage_type", "apply_long_distance", "long_distance_selector",
+    "customer_name", "customer_phone", "customer_email",
+    "moving_date", "arrival_date", "storage_duration", "storage_use_electricity",
+    "contract_date",
+    "from_address_full", "from_floor", "from_method",
+    "to_address_full", "to_floor", "to_method",
+    "has_via_point", "via_point_address", "via_point_floor", "via_point_method", "via_point_surcharge",
+    "special_notes",
+    "vehicle_select_radio", "manual_vehicle_select_value", "final_selected_vehicle",
+    "add_men", "add_women", "remove_base_housewife", "remove_base_man",
+    "sky_hours_from", "sky_hours_final",
+    "dispatched_1t", "dispatched_2_5t","dispatched_3_5t", "dispatched_5t",
+    "has_waste_check", "waste_tons_input",
+    "manual_ladder_from_check", "manual_ladder_to_check",
+    "issue_tax_invoice", "card_payment",
+    "move_time_option", "afternoon_move_details",
+    "uploaded_images",
+    "tab3_deposit_amount", "tab3_adjustment_amount",
+    "tab3_departure_ladder_surcharge_manual",
+    "tab3_arrival_ladder_surcharge_manual",
+    "tab3_date_opt_0_widget", "tab3_date_opt_1_widget", "tab3_date_opt_2_widget",
+    "tab3_date_opt_3_widget", "tab3_date_opt_4_widget",
+    "prev_final_selected_vehicle"
+)
+
+SAVE_FORMAT_KEY = "save_format"
+SAVE_FORMAT_V2 = 2
+DEFAULT_SAVE_FORMAT = SAVE_FORMAT_V2 # 1 로 바꾸면 이전 형식(v1)으로 저장
+ITEM_QUANTITIES_KEY = "item_quantities"
+# 기본값이 data.py 설정에서 오는 키: 설정이 바뀌어도 저장 당시 값이 유지되도록 v2 에서도 항상 기록
+SPARSE_ALWAYS_SAVED_KEYS = frozenset(DATE_STATE_KEYS + (
+    "base_move_type", "customer_phone", "storage_type", "long_distance_selector",
+    "from_method", "to_method", "via_point_method",
+    "tab3_departure_ladder_surcharge_manual", "tab3_arrival_ladder_surcharge_manual",
+))
+
+
+def default_state_values():
+    """새 견적의 기본 상태 (품목 수량 qty_ 키 포함, 날짜는 오늘 KST)."""
+    try:
+        KST_init = pytz.timezone("Asia/Seoul")
+    except pytz.UnknownTimeZoneError:
+        KST_init = pytz.utc
+    today_kst = datetime.now(KST_init).date()
+    default_storage_type = data.DEFAULT_STORAGE_TYPE if data and hasattr(data, "DEFAULT_STORAGE_TYPE") else "컨테이너 보관 📦"
+    default_long_dist_selector = data.long_distance_options[0] if data and hasattr(data, "long_distance_options") and data.long_distance_options else "선택 안 함"
+    default_from_method = data.METHOD_OPTIONS[0] if data and hasattr(data, "METHOD_OPTIONS") and data.METHOD_OPTIONS else "계단 🚶"
+    default_to_method = default_from_method
+    default_via_method = default_from_method
+    default_manual_ladder_surcharge = getattr(data, 'MANUAL_LADDER_SURCHARGE_DEFAULT', 0) if data else 0
+
+    defaults = {
+        "base_move_type": MOVE_TYPE_OPTIONS[0],
+        "is_storage_move": False, "storage_type": default_storage_type,
+        "apply_long_distance": False, "long_distance_selector": default_long_dist_selector,
+        "customer_name": "", "customer_phone": "", "customer_email": "",
+        "moving_date": today_kst, "arrival_date": today_kst, "contract_date": today_kst,
+        "storage_duration": 1, "storage_use_electricity": False,
+        "from_address_full": "", "from_floor": "", "from_method": default_from_method,
+        "to_address_full": "", "to_floor": "", "to_method": default_to_method,
+        "has_via_point": False, "via_point_address": "", "via_point_floor": "", "via_point_method": default_via_method, "via_point_surcharge": 0,
+        "special_notes": "",
+        "vehicle_select_radio": "자동 추천 차량 사용", "manual_vehicle_select_value": None, "final_selected_vehicle": None,
+        "recommended_vehicle_auto": None, "recommended_base_price_auto": 0.0,
+        "total_volume": 0.0, "total_weight": 0.0,
+        "add_men": 0, "add_women": 0, "remove_base_housewife": False, "remove_base_man": False,
+        "sky_hours_from": 1, "sky_hours_final": 1,
+        "dispatched_1t":0, "dispatched_2_5t":0, "dispatched_3_5t":0, "dispatched_5t":0,
+        "has_waste_check": False, "waste_tons_input": 0.5,
+        "date_opt_0_widget": False, "date_opt_1_widget": False, "date_opt_2_widget": False, "date_opt_3_widget": False, "date_opt_4_widget": False,
+        "manual_ladder_from_check": False, "departure_ladder_surcharge_manual": default_manual_ladder_surcharge,
+        "manual_ladder_to_check": False, "arrival_ladder_surcharge_manual": default_manual_ladder_surcharge,
+        "deposit_amount": 0, "adjustment_amount": 0,
+        "issue_tax_invoice": False, "card_payment": False,
+        "pdf_ready": False, "pdf_bytes": None, "selected_items": {},
+        "move_time_option": "오전", "afternoon_move_details": "",
+        "customer_final_pdf_data": None, "uploaded_images": [],
+        "tab3_deposit_amount": 0, "tab3_adjustment_amount": 0,
+        "tab3_departure_ladder_surcharge_manual": default_manual_ladder_surcharge,
+        "tab3_arrival_ladder_surcharge_manual": default_manual_ladder_surcharge,
+        "tab3_date_opt_0_widget": False, "tab3_date_opt_1_widget": False, "tab3_date_opt_2_widget": False, "tab3_date_opt_3_widget": False, "tab3_date_opt_4_widget": False,
+        "prev_final_selected_vehicle": None, "_app_initialized": True
+    }
+    for qty_key in item_catalog.CATALOG.all_qty_keys:
+        defaults.setdefault(qty_key, 0)
+    return defaults
+
+
+def apply_saved_state(loaded_data_dict, target_state):
+    """
+    저장된 견적 dict (v1 또는 v2) 를 target_state(st.session_state 또는 dict)에 적용합니다.
+    target_state 에 이미 있는 키만 덮어쓰므로, 먼저 기본값으로 채워 두어야 합니다.
+    """
+    loaded_data_dict = expand_saved_data(loaded_data_dict)
+    for key, value in loaded_data_dict.items():
+        # 날짜 문자열을 date 객체로 변환
+        if key in DATE_STATE_KEYS and isinstance(value, str):
+            try:
+                target_state[key] = date.fromisoformat(value)
+            except (ValueError, TypeError):
+                # 파싱 실패 시 기본값(오늘 날짜)이 이미 설정되어 있으므로 그대로 둠
+                pass
+        # 호환성을 위해 옛날 주소 키 처리
+        elif key == "from_location" and "from_address_full" not in loaded_data_dict:
+            target_state["from_address_full"] = value
+        elif key == "to_location" and "to_address_full" not in loaded_data_dict:
+            target_state["to_address_full"] = value
+        # 호환성을 위해 옛날 이미지 경로 키 처리
+        elif key == "uploaded_image_paths" and "uploaded_images" not in loaded_data_dict:
+            # 예전 경로 데이터는 이제 사용할 수 없으므로 비움
+            target_state["uploaded_images"] = []
+        elif key in target_state:
+            target_state[key] = value
+
+    # UI 입력 필드와 tab3_ 저장용 필드 동기화 (로드 후)
+    target_state["deposit_amount"] = target_state.get("tab3_deposit_amount", 0)
+    target_state["adjustment_amount"] = target_state.get("tab3_adjustment_amount", 0)
+    target_state["departure_ladder_surcharge_manual"] = target_state.get("tab3_departure_ladder_surcharge_manual", 0)
+    target_state["arrival_ladder_surcharge_manual"] = target_state.get("tab3_arrival_ladder_surcharge_manual", 0)
+    for i in range(5):
+        target_state[f"date_opt_{i}_widget"] = target_state.get(f"tab3_date_opt_{i}_widget", False)
+
+    # 이사 유형 동기화
+    if "base_move_type" in target_state:
+        target_state["base_move_type_widget_tab1"] = target_state["base_move_type"]
+        target_state["base_move_type_widget_tab3"] = target_state["base_move_type"]
+
+
+def state_from_saved_data(loaded_data_dict):
+    """저장된 견적 dict 로 세션 없이 완전한 견적 상태 dict 를 만듭니다 (앱에서 불러오기와 같은 결과)."""
+    state = default_state_values()
+    apply_saved_state(loaded_data_dict, state)
+    return state
+
+
+# --- 저장 형식 v2 (sparse + 선택적 gzip) ---
+def _serialized_defaults():
+    """v1 저장 대상 키의 기본값 (저장된 JSON 과 같은 직렬화 형태)."""
+    defaults = default_state_values()
+    serialized = {}
+    for key in SAVED_STATE_KEYS:
+        value = defaults.get(key)
+        serialized[key] = value.isoformat() if isinstance(value, date) else value
+    for qty_key in item_catalog.CATALOG.all_qty_keys:
+        serialized[qty_key] = 0
+    return serialized
+
+
+def _same_saved_value(value, default_value):
+    # True == 1 처럼 타입이 다른 값은 같은 값으로 보지 않음
+    return type(value) is type(default_value) and value == default_value
+
+
+def compact_saved_data(saved_data):
+    """
+    v1 저장 dict (prepare_state_for_save 결과) -> v2 dict.
+    기본값과 같은 값은 생략하고, 카탈로그에 있는 품목 수량은 0 이 아닌 것만 item_quantities 에 묶습니다.
+    """
+    if not isinstance(saved_data, dict) or saved_data.get(SAVE_FORMAT_KEY) == SAVE_FORMAT_V2:
+        return saved_data
+    serialized_defaults = _serialized_defaults()
+    qty_key_parts = item_catalog.CATALOG.qty_key_parts
+    compact = {SAVE_FORMAT_KEY: SAVE_FORMAT_V2}
+    item_quantities = {}
+    for key, value in saved_data.items():
+        if key in qty_key_parts:
+            if not _same_saved_value(value, 0):
+                move_type, section, item_name = qty_key_parts[key]
+                item_quantities.setdefault(move_type, {}).setdefault(section, {})[item_name] = value
+        elif (key in serialized_defaults and key not in SPARSE_ALWAYS_SAVED_KEYS
+              and _same_saved_value(value, serialized_defaults[key])):
+            continue
+        else:
+            # 카탈로그에 없는 qty_ 키(삭제된 품목 등)와 그 외 키는 그대로 기록
+            compact[key] = value
+    if item_quantities:
+        compact[ITEM_QUANTITIES_KEY] = item_quantities
+    return compact
+
+
+def expand_saved_data(loaded_data_dict):
+    """v2 dict -> 기본값을 채운 v1 형태 dict. v1 dict 는 그대로 반환합니다."""
+    if not isinstance(loaded_data_dict, dict) or loaded_data_dict.get(SAVE_FORMAT_KEY) != SAVE_FORMAT_V2:
+        return loaded_data_dict
+    expanded = _serialized_defaults()
+    for key, value in loaded_data_dict.items():
+        if key == ITEM_QUANTITIES_KEY:
+            for move_type, sections in (value or {}).items():
+                for section, quantities in (sections or {}).items():
+                    for item_name, quantity in (quantities or {}).items():
+                        expanded[item_catalog.make_qty_key(move_type, section, item_name)] = quantity
+        elif key != SAVE_FORMAT_KEY:
+            expanded[key] = value
+    return expanded
+
+
+def encode_saved_data(saved_data, save_format=None, compress=False):
+    """저장 dict -> 파일 내용(bytes). v2 는 공백 없는 JSON, compress=True 이면 gzip 압축."""
+    save_format = DEFAULT_SAVE_FORMAT if save_format is None else save_format
+    if save_format == SAVE_FORMAT_V2:
+        encoded = json.dumps(compact_saved_data(saved_data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    else:
+        encoded = json.dumps(expand_saved_data(saved_data), ensure_ascii=False, indent=2).encode("utf-8")
+    if compress:
+        # mtime=0: 같은 내용이면 같은 바이트 (Drive md5Checksum 이 내용 변경 시에만 바뀜)
+        encoded = gzip.compress(encoded, mtime=0)
+    return encoded
+
+
+def decode_saved_data(raw_bytes):
+    """파일 내용(bytes, gzip 여부 자동 판별) -> v1 형태 저장 dict (v2 는 기본값을 채워 펼침)."""
+    if raw_bytes[:2] == b"\x1f\x8b":
+        raw_bytes = gzip.decompress(raw_bytes)
+    return expand_saved_data(json.loads(raw_bytes.decode("utf-8-sig")))
@@ -0,0 +1,475 @@
+# quote_store.py
+"""
+Drive 견적 폴더의 로컬 SQLite 사본 (견적 1건 = 1행).
+
+전화번호, 끝 4자리, 이사일, 도착일, 계약일에 인덱스가 있어 조회 화면은 Drive 목록/다운로드 없이 로컬에서 검색합니다.
+- 처음에는 폴더의 JSON 을 한 번 모두 내려받아 채우고, 이후에는 Drive changes 피드로 바뀐 파일만 다시 받습니다.
+  (sync 는 QUOTE_STORE_SYNC_INTERVAL_SEC 마다 한 번, 검색 직전에 자동 수행)
+- 처음 채우기는 수천 건을 내려받을 수 있으므로 백그라운드 스레드에서 진행하고,
+  끝날 때까지 검색은 google_drive_helper 의 기존 검색을 사용합니다.
+- 내려받지 못한 파일(손상된 JSON 등)은 failed_files 에 기록해 다음 sync 마다 다시 시도하고, 나머지 동기화는 그대로 진행합니다.
+- 견적 내용(state JSON)도 함께 보관하므로 요약 계산(quote_summary)도 다운로드 없이 처리합니다.
+- 저장소를 쓸 수 없으면 google_drive_helper 의 기존 검색으로 대체합니다 (find_quotes_by_phone_suffix 등).
+
+DB 파일은 .gdrive_cache/quote_store_<폴더 ID>.sqlite3 이며 지워도 다음 sync 때 다시 만들어집니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+
+import google_drive_helper as gdrive
+import notifier
+
+QUOTE_STORE_DIR = gdrive.PHONE_INDEX_CACHE_DIR
+QUOTE_STORE_SCHEMA_VERSION = "2"
+QUOTE_STORE_SYNC_INTERVAL_SEC = 30
+QUOTE_STORE_DOWNLOAD_WORKERS = 8
+QUOTE_FILE_FIELDS = "id, name, mimeType, trashed, parents, md5Checksum, modifiedTime, appProperties"
+
+_SCHEMA_STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS quotes (
+        file_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        version TEXT,
+        phone TEXT,
+        phone_last4 TEXT,
+        customer_name TEXT,
+        moving_date TEXT,
+        arrival_date TEXT,
+        contract_date TEXT,
+        move_type TEXT,
+        app_properties TEXT,
+        state_json TEXT,
+        synced_at REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_quotes_phone ON quotes (phone)",
+    "CREATE INDEX IF NOT EXISTS idx_quotes_phone_last4 ON quotes (phone_last4)",
+    "CREATE INDEX IF NOT EXISTS idx_quotes_moving_date ON quotes (moving_date)",
+    "CREATE INDEX IF NOT EXISTS idx_quotes_arrival_date ON quotes (arrival_date)",
+    "CREATE INDEX IF NOT EXISTS idx_quotes_contract_date ON quotes (contract_date)",
+    "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)",
+    # 내려받지 못했거나 JSON 객체가 아닌 파일: 다음 sync 마다 다시 시도 (file_item 은 Drive 메타데이터 JSON)
+    "CREATE TABLE IF NOT EXISTS failed_files (file_id TEXT PRIMARY KEY, file_item TEXT NOT NULL, failed_at REAL)",
+)
+
+_LISTING_COLUMNS = "file_id, name, version, phone, customer_name, moving_date, arrival_date, contract_date, move_type, app_properties"
+
+
+def _digits(value):
+    return "".join(c for c in str(value or "") if c.isdigit())
+
+
+def _date_text(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value).strip() if value else ""
+
+
+def _file_version(file_item):
+    return file_item.get("md5Checksum") or file_item.get("modifiedTime")
+
+
+def quote_row_values(file_id, file_name, state_data, version=None, app_properties=None):
+    """quotes 테이블 한 행의 값 (검색 컬럼은 파일명 '<전화번호>.json' 을 우선, 없으면 견적의 고객 전화번호 사용)."""
+    state_data = state_data if isinstance(state_data, dict) else {}
+    phone = _digits(os.path.splitext(file_name or "")[0]) or _digits(state_data.get("customer_phone"))
+    return {
+        "file_id": file_id,
+        "name": file_name,
+        "version": version,
+        "phone": phone,
+        "phone_last4": gdrive.phone_suffix_of(file_name, phone) or "",
+        "customer_name": str(state_data.get("customer_name") or "").strip(),
+        "moving_date": _date_text(state_data.get("moving_date")),
+        "arrival_date": _date_text(state_data.get("arrival_date")),
+        "contract_date": _date_text(state_data.get("contract_date")),
+        "move_type": state_data.get("base_move_type") or "",
+        "app_properties": json.dumps(app_properties or {}, ensure_ascii=False),
+        "state_json": json.dumps(state_data, ensure_ascii=False),
+        "synced_at": time.time(),
+    }
+
+
+class QuoteStore:
+    """Drive 폴더 하나에 대한 로컬 견적 저장소."""
+
+    def __init__(self, folder_id=None, path=None):
+        self.folder_id = folder_id
+        safe_folder = "".join(c if c.isalnum() or c in "-_" else "_" for c in (folder_id or "root"))
+        self.path = path or os.path.join(QUOTE_STORE_DIR, f"quote_store_{safe_folder}.sqlite3")
+        self._sync_lock = threading.Lock()
+        self._last_sync = 0.0
+        self._seed_thread = None
+        self._initialize()
+
+    # --- DB ---
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _initialize(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA_STATEMENTS:
+                connection.execute(statement)
+            stored = dict(connection.execute("SELECT key, value FROM store_meta").fetchall())
+            if stored.get("schema_version") != QUOTE_STORE_SCHEMA_VERSION or stored.get("folder_id", self.folder_id or "") != (self.folder_id or ""):
+                # 다른 스키마/폴더로 만든 DB 는 비우고 다음 sync 에서 다시 채움
+                connection.execute("DELETE FROM quotes")
+                connection.execute("DELETE FROM failed_files")
+                connection.execute("DELETE FROM store_meta")
+            connection.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('schema_version', ?)", (QUOTE_STORE_SCHEMA_VERSION,))
+            connection.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('folder_id', ?)", (self.folder_id or "",))
+
+    def _get_meta(self, key):
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _upsert_rows(self, connection, rows):
+        connection.executemany(
+            """INSERT OR REPLACE INTO quotes (file_id, name, version, phone, phone_last4, customer_name, moving_date,
+                   arrival_date, contract_date, move_type, app_properties, state_json, synced_at)
+               VALUES (:file_id, :name, :version, :phone, :phone_last4, :customer_name, :moving_date,
+                   :arrival_date, :contract_date, :move_type, :app_properties, :state_json, :synced_at)""",
+            rows
+        )
+
+    def is_seeded(self):
+        """처음 전체 동기화가 끝나 changes 피드 토큰이 있으면 True (일부 파일을 받지 못했어도 True)."""
+        return bool(self._get_meta("start_page_token"))
+
+    def start_background_seed(self):
+        """처음 전체 동기화를 백그라운드 스레드에서 시작합니다 (이미 진행 중이면 그 스레드 반환)."""
+        with _stores_lock:
+            if self._seed_thread is None or not self._seed_thread.is_alive():
+                self._seed_thread = threading.Thread(target=self._seed, name="quote-store-seed", daemon=True)
+                self._seed_thread.start()
+            return self._seed_thread
+
+    def _seed(self):
+        try:
+            counts = self.sync(force=True)
+            print(f"INFO [quote_store]: 처음 동기화 완료 ({self.count()}건, {counts})")
+        except Exception as e:
+            print(f"Warning [quote_store]: 백그라운드 처음 동기화 실패, 다음 검색 때 다시 시도합니다: {e}")
+            traceback.print_exc()
+
+    def count(self):
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+
+    def failed_file_ids(self):
+        """내려받지 못해 다음 sync 에서 다시 시도할 파일 id 목록."""
+        with self._connect() as connection:
+            return [row["file_id"] for row in connection.execute("SELECT file_id FROM failed_files ORDER BY file_id")]
+
+    # --- Drive 동기화 ---
+    def _list_folder_json_files(self, service):
+        query = "trashed = false and mimeType='application/json'"
+        if self.folder_id:
+            query += f" and '{self.folder_id}' in parents"
+        listed_files = []
+        page_token = None
+        while True:
+            response = gdrive._execute_with_retry(lambda: service.files().list(
+                q=query, spaces="drive", fields=f"nextPageToken, files({QUOTE_FILE_FIELDS})",
+                pageSize=1000, pageToken=page_token))
+            listed_files.extend(response.get("files", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return listed_files
+
+    def _changed_files_since(self, service, page_token):
+        """changes 피드: ({file_id: file_item (범위 안) 또는 None (삭제/범위 밖)}, 새 시작 토큰)."""
+        changed_files = {}
+        while page_token:
+            response = gdrive._execute_with_retry(lambda: service.changes().list(
+                pageToken=page_token, spaces="drive", includeRemoved=True, pageSize=1000,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({QUOTE_FILE_FIELDS}))"))
+            for change in response.get("changes", []):
+                file_item = change.get("file") or {}
+                in_scope = (
+                    not change.get("removed")
+                    and not file_item.get("trashed")
+                    and file_item.get("mimeType") == "application/json"
+                    and (not self.folder_id or self.folder_id in (file_item.get("parents") or []))
+                )
+                changed_files[change.get("fileId")] = file_item if in_scope else None
+            if "newStartPageToken" in response:
+                return changed_files, response["newStartPageToken"]
+            page_token = response.get("nextPageToken")
+        return changed_files, None
+
+    def sync(self, force=False):
+        """
+        Drive 와 동기화합니다 (force=False 이면 QUOTE_STORE_SYNC_INTERVAL_SEC 안에 다시 호출될 때 생략).
+        반환: {'mode': 'full'/'changes'/'skipped', 'downloaded', 'removed', 'failed'}
+        """
+        counts = {"mode": "skipped", "downloaded": 0, "removed": 0, "failed": 0}
+        with self._sync_lock:
+            if not force and time.time() - self._last_sync < QUOTE_STORE_SYNC_INTERVAL_SEC:
+                return counts
+            service = gdrive.get_drive_service()
+            if not service:
+                return counts
+
+            start_page_token = self._get_meta("start_page_token")
+            with self._connect() as connection:
+                known_versions = {row["file_id"]: row["version"] for row in connection.execute("SELECT file_id, version FROM quotes")}
+                failed_items = {}
+                for row in connection.execute("SELECT file_id, file_item FROM failed_files"):
+                    try:
+                        failed_items[row["file_id"]] = json.loads(row["file_item"])
+                    except ValueError:
+                        failed_items[row["file_id"]] = {"id": row["file_id"]}
+
+            files_in_scope = None
+            if start_page_token:
+                try:
+                    changed_files, new_start_page_token = self._changed_files_since(service, start_page_token)
+                except Exception as e:
+                    # 토큰이 만료되었거나 잘못된 경우 전체 목록으로 다시 맞춤
+                    print(f"Warning [quote_store]: changes 피드 조회 실패, 전체 목록으로 동기화합니다: {e}")
+                    new_start_page_token = None
+                if new_start_page_token:
+                    counts["mode"] = "changes"
+                    files_in_scope = {file_id: item for file_id, item in changed_files.items() if item is not None}
+                    removed_ids = [file_id for file_id, item in changed_files.items() if item is None and file_id in known_versions]
+            if files_in_scope is None:
+                counts["mode"] = "full"
+                # 목록 조회 도중 발생한 변경도 다음 sync 에서 잡히도록 토큰을 먼저 받습니다.
+                new_start_page_token = gdrive._execute_with_retry(lambda: service.changes().getStartPageToken()).get("startPageToken")
+                files_in_scope = {item["id"]: item for item in self._list_folder_json_files(service)}
+                removed_ids = [file_id for file_id in known_versions if file_id not in files_in_scope]
+
+            # 이름/메타데이터만 바뀐 파일은 다운로드 없이 갱신, 내용이 바뀐 파일만 내려받음
+            files_to_download = {file_id: item for file_id, item in files_in_scope.items()
+                                 if known_versions.get(file_id) != _file_version(item)}
+            metadata_only = [item for file_id, item in files_in_scope.items() if file_id not in files_to_download]
+            # 이전에 실패한 파일은 바뀌지 않았어도 다시 시도
+            for file_id, file_item in failed_items.items():
+                if file_id not in files_to_download and file_id not in removed_ids:
+                    files_to_download[file_id] = file_item
+
+            rows = []
+            failed_rows = []
+            for file_id, state_data in gdrive.load_json_files(list(files_to_download), max_workers=QUOTE_STORE_DOWNLOAD_WORKERS):
+                file_item = files_to_download[file_id]
+                if not isinstance(state_data, dict):
+                    # 파일명(전화번호)으로는 검색되도록 내용 없이 기록 (version 이 없어 다음 전체 목록 동기화에서도 다시 받음)
+                    counts["failed"] += 1
+                    failed_row = quote_row_values(file_id, file_item.get("name"), None, app_properties=file_item.get("appProperties"))
+                    failed_row["state_json"] = None
+                    failed_rows.append(failed_row)
+                    continue
+                rows.append(quote_row_values(file_id, file_item.get("name"), state_data,
+                                             version=_file_version(file_item), app_properties=file_item.get("appProperties")))
+
+            with self._connect() as connection:
+                self._upsert_rows(connection, rows + failed_rows)
+                connection.executemany("DELETE FROM failed_files WHERE file_id = ?", [(row["file_id"],) for row in rows])
+                connection.executemany(
+                    "INSERT OR REPLACE INTO failed_files (file_id, file_item, failed_at) VALUES (?, ?, ?)",
+                    [(row["file_id"], json.dumps(files_to_download[row["file_id"]], ensure_ascii=False), time.time())
+                     for row in failed_rows]
+                )
+                connection.executemany(
+                    "UPDATE quotes SET name = ?, app_properties = ?, synced_at = ? WHERE file_id = ?",
+                    [(item.get("name"), json.dumps(item.get("appProperties") or {}, ensure_ascii=False), time.time(), item["id"])
+                     for item in metadata_only]
+                )
+                connection.executemany("DELETE FROM quotes WHERE file_id = ?", [(file_id,) for file_id in removed_ids])
+                connection.executemany("DELETE FROM failed_files WHERE file_id = ?", [(file_id,) for file_id in removed_ids])
+                if new_start_page_token:
+                    # 내려받지 못한 파일은 failed_files 에서 다시 시도하므로 토큰은 항상 앞으로 옮김
+                    connection.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('start_page_token', ?)", (new_start_page_token,))
+            counts["downloaded"] = len(rows)
+            counts["removed"] = len(removed_ids)
+            self._last_sync = time.time()
+        return counts
+
+    def note_saved(self, file_id, file_name, state_data, version=None, app_properties=None):
+        """방금 저장한 견적을 다음 sync 전에도 바로 검색되도록 반영 (version 이 없으면 다음 sync 때 다시 받음)."""
+        if not file_id:
+            return
+        with self._connect() as connection:
+            self._upsert_rows(connection, [quote_row_values(file_id, file_name, state_data, version=version,
+                                                            app_properties=app_properties)])
+            connection.execute("DELETE FROM failed_files WHERE file_id = ?", (file_id,))
+
+    def note_deleted(self, file_id):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM quotes WHERE file_id = ?", (file_id,))
+            connection.execute("DELETE FROM failed_files WHERE file_id = ?", (file_id,))
+
+    # --- 조회 (모두 google_drive_helper 검색 결과와 같은 {'id', 'name', 'mimeType', 'appProperties', 'version', ...} 목록) ---
+    def _query(self, where_clause, parameters, order_by="name"):
+        with self._connect() as connection:
+            rows = connection.execute(f"SELECT {_LISTING_COLUMNS} FROM quotes WHERE {where_clause} ORDER BY {order_by}", parameters).fetchall()
+        results = []
+        for row in rows:
+            try:
+                app_properties = json.loads(row["app_properties"] or "{}")
+            except ValueError:
+                app_properties = {}
+            results.append({
+                "id": row["file_id"], "name": row["name"], "mimeType": "application/json",
+                "appProperties": app_properties, "phone": row["phone"], "customer_name": row["customer_name"],
+                "moving_date": row["moving_date"], "arrival_date": row["arrival_date"],
+                "contract_date": row["contract_date"], "move_type": row["move_type"],
+                "version": row["version"],
+            })
+        return results
+
+    def find_by_phone_suffix(self, last_digits):
+        return self._query("phone_last4 = ?", (str(last_digits or "").strip(),))
+
+    def find_by_phone(self, phone):
+        return self._query("phone = ?", (_digits(phone),))
+
+    def find_by_name_contains(self, text):
+        """파일명(전화번호)에 text 가 포함된 견적 (Drive 'name contains' 검색 대체)."""
+        escaped_text = str(text or "").strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return self._query("name LIKE ? ESCAPE '\\'", (f"%{escaped_text}%",))
+
+    def find_by_customer_name(self, text):
+        escaped_text = str(text or "").strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return self._query("customer_name LIKE ? ESCAPE '\\'", (f"%{escaped_text}%",))
+
+    def find_by_date(self, date_column, start_date, end_date=None):
+        """date_column ('moving_date', 'arrival_date', 'contract_date') 이 start_date ~ end_date (포함) 인 견적."""
+        if date_column not in ("moving_date", "arrival_date", "contract_date"):
+            raise ValueError(f"지원하지 않는 날짜 컬럼: {date_column}")
+        end_date = end_date or start_date
+        return self._query(f"{date_column} BETWEEN ? AND ?", (_date_text(start_date), _date_text(end_date)),
+                           order_by=f"{date_column}, name")
+
+    def load_states(self, file_ids):
+        """
+        (file_id, state dict 또는 None) 를 file_ids 순서대로 반환하는 iterator.
+        저장소에 없는 견적만 Drive 에서 내려받으며, 내려받은 결과는 도착하는 대로 반환합니다.
+        """
+        file_ids = list(file_ids)
+        stored_states = {}
+        with self._connect() as connection:
+            for start in range(0, len(file_ids), 500):
+                chunk = file_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in connection.execute(f"SELECT file_id, state_json FROM quotes WHERE file_id IN ({placeholders})", chunk):
+                    try:
+                        stored_states[row["file_id"]] = json.loads(row["state_json"]) if row["state_json"] else None
+                    except ValueError:
+                        pass
+        missing_ids = list(dict.fromkeys(file_id for file_id in file_ids if not isinstance(stored_states.get(file_id), dict)))
+        downloaded_states = gdrive.load_json_files(missing_ids, max_workers=QUOTE_STORE_DOWNLOAD_WORKERS)
+        return _states_in_order(file_ids, stored_states, downloaded_states)
+
+
+def _states_in_order(file_ids, stored_states, downloaded_states):
+    # downloaded_states 는 저장소에 없던 id 를 file_ids 에서 처음 나온 순서대로 반환하므로 필요한 만큼만 읽음
+    for file_id in file_ids:
+        while not isinstance(stored_states.get(file_id), dict):
+            try:
+                downloaded_id, state = next(downloaded_states)
+            except StopIteration:
+                break
+            stored_states[downloaded_id] = state
+            if downloaded_id == file_id:
+                break
+        yield file_id, stored_states.get(file_id)
+
+
+_stores_lock = threading.Lock()
+_stores = {} # folder_id -> QuoteStore
+
+
+def get_quote_store(folder_id=None):
+    """폴더별 QuoteStore (프로세스당 하나)."""
+    with _stores_lock:
+        store = _stores.get(folder_id)
+        if store is None:
+            store = QuoteStore(folder_id)
+            _stores[folder_id] = store
+        return store
+
+
+def synced_quote_store(folder_id=None):
+    """
+    동기화된 QuoteStore, 사용할 수 없거나 처음 채우기가 아직 끝나지 않았으면 None (호출한 쪽은 Drive 직접 검색으로 대체).
+    처음 채우기는 백그라운드에서 시작하므로 검색 버튼이 전체 다운로드를 기다리지 않습니다.
+    """
+    try:
+        store = get_quote_store(folder_id)
+        if not store.is_seeded():
+            store.start_background_seed()
+            return None
+        store.sync()
+        return store
+    except Exception as e:
+        print(f"Warning [quote_store]: 로컬 견적 저장소를 사용할 수 없어 Drive 검색으로 대체합니다: {e}")
+        traceback.print_exc()
+        return None
+
+
+def find_quotes_by_phone_suffix(last_digits, folder_id=None):
+    """전화번호 끝 4자리 검색 (로컬 저장소, 실패 시 gdrive.find_json_files_by_phone_suffix)."""
+    store = synced_quote_store(folder_id)
+    if store is not None:
+        try:
+            return store.find_by_phone_suffix(last_digits)
+        except sqlite3.Error as e:
+            print(f"Warning [quote_store]: 로컬 검색 실패, Drive 검색으로 대체합니다: {e}")
+    return gdrive.find_json_files_by_phone_suffix(last_digits, folder_id=folder_id)
+
+
+def find_quotes_by_name_contains(text, folder_id=None):
+    """파일명 포함 검색 (로컬 저장소, 실패 시 gdrive.find_files_by_name_contains)."""
+    store = synced_quote_store(folder_id)
+    if store is not None:
+        try:
+            return store.find_by_name_contains(text)
+        except sqlite3.Error as e:
+            print(f"Warning [quote_store]: 로컬 검색 실패, Drive 검색으로 대체합니다: {e}")
+    return gdrive.find_files_by_name_contains(text, mime_types="application/json", folder_id=folder_id)
+
+
+def load_quote_states(file_ids, folder_id=None):
+    """quote_summary.load_quote_summaries 의 state_loader: 저장소의 견적 내용을 사용하고 없으면 Drive 에서 받음."""
+    try:
+        return get_quote_store(folder_id).load_states(file_ids)
+    except Exception as e:
+        print(f"Warning [quote_store]: 저장된 견적 내용을 읽지 못해 Drive 에서 받습니다: {e}")
+        return list(gdrive.load_json_files(file_ids, max_workers=QUOTE_STORE_DOWNLOAD_WORKERS))
+
+
+def find_quotes_by_customer_name(text, folder_id=None):
+    """
+    고객명 포함 검색 (로컬 저장소 전용). Drive 에는 고객명 검색 수단이 없어,
+    저장소가 준비되기 전에는 저장소 도입 전처럼 파일명 포함 검색으로 대체하고 사용할 수 없으면 빈 목록.
+    """
+    store = synced_quote_store(folder_id)
+    if store is None:
+        notifier.info("고객명 검색용 로컬 견적 저장소를 준비하는 중입니다. 지금은 파일명으로 검색합니다.")
+        return gdrive.find_files_by_name_contains(text, mime_types="application/json", folder_id=folder_id)
+    try:
+        return store.find_by_customer_name(text)
+    except sqlite3.Error as e:
+        print(f"Warning [quote_store]: 고객명 검색 실패: {e}")
+        return []
+
+
+def note_quote_saved(file_id, file_name, state_data, folder_id=None):
+    """ui 에서 견적을 저장한 직후 호출: 다음 sync 전에도 저장소 검색에 바로 반영."""
+    try:
+        get_quote_store(folder_id).note_saved(file_id, file_name, state_data,
+                                              app_properties=gdrive.quote_app_properties(state_data, file_name))
+    except Exception as e:
+        print(f"Warning [quote_store]: 저장한 견적을 로컬 저장소에 반영하지 못했습니다: {e}")
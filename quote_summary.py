@@ -0,0 +1,270 @@
+# quote_summary.py
+"""
+조회 화면용 견적 요약: 세금계산서 발행 전 이사비, 보관이사 구간별 금액, 날짜, 연락처.
+
+견적 JSON 을 Drive 에 저장할 때 요약을 appProperties 로 함께 기록해 두면
+조회 화면(info_retrieval_app, batch_quote_retriever)은 파일 메타데이터만으로 결과를 만들고 JSON 을 내려받지 않습니다.
+요금표(data.py), 계산 로직(calculations.py) 또는 이 모듈의 구간 분류 규칙이 바뀌면 PRICING_FINGERPRINT 가 달라져 이전 요약은 무시되고,
+조회 시 JSON 을 내려받아 현재 요금으로 다시 계산합니다 (요약 도입 전과 같은 결과).
+"""
+import hashlib
+from datetime import date, datetime
+
+import pytz
+
+import calculations
+import data
+
+BATCH_DOWNLOAD_WORKERS = 8 # 요약이 없는 견적 JSON 동시 다운로드 수
+SUMMARY_SCHEMA_VERSION = "1" # 요약 appProperties 의 키/의미를 바꾸면 올림 (PRICING_FINGERPRINT 에 포함)
+
+# save_json_file 이 기록하는 요약 appProperties (moving_date / contract_date 는 google_drive_helper 의 검색용 키를 함께 사용)
+QUOTE_SUMMARY_PROPERTY_KEYS = ("summary_version", "pre_vat_total", "cost_common", "cost_departure", "cost_arrival",
+                               "cost_storage", "is_storage_move", "arrival_date", "customer_phone")
+
+DEPARTURE_COST_LABELS = ["출발지 사다리차", "출발지 스카이 장비", "출발지 수동 사다리 추가", "출발지 수동 사다리 할인"] # 할인 항목도 고려
+ARRIVAL_COST_LABELS = ["도착지 사다리차", "도착지 스카이 장비", "도착지 수동 사다리 추가", "도착지 수동 사다리 할인"] # 할인 항목도 고려
+STORAGE_COST_LABEL = "보관료"
+EXCLUDE_LABELS_FOR_COMMON = DEPARTURE_COST_LABELS + ARRIVAL_COST_LABELS + [STORAGE_COST_LABEL, "오류", "부가세 (10%)", "카드결제 (VAT 및 수수료 포함)"]
+
+
+def _pricing_fingerprint():
+    """
+    요금표/계산 로직/요약 규칙 소스의 해시 (하나라도 바뀌면 저장된 요약을 쓰지 않음).
+    구간 분류 라벨(DEPARTURE_COST_LABELS 등)과 기본 상태는 이 모듈에 있으므로 이 파일도 포함합니다.
+    """
+    digest = hashlib.sha1(SUMMARY_SCHEMA_VERSION.encode("utf-8"))
+    for source_name, source_path in (("data", getattr(data, "__file__", None)),
+                                     ("calculations", getattr(calculations, "__file__", None)),
+                                     ("quote_summary", __file__)):
+        try:
+            with open(source_path, "rb") as f:
+                digest.update(f.read())
+        except (OSError, TypeError):
+            digest.update(source_name.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+PRICING_FINGERPRINT = _pricing_fingerprint()
+
+
+def _today_kst():
+    try:
+        return datetime.now(pytz.timezone("Asia/Seoul")).date()
+    except pytz.UnknownTimeZoneError:
+        return datetime.now(pytz.utc).date()
+
+
+def get_minimal_default_state_for_calc():
+    """calculations.py가 요구하는 최소한의 기본 상태값 반환"""
+    today = _today_kst()
+    default_method = data.METHOD_OPTIONS[0] if hasattr(data, 'METHOD_OPTIONS') and data.METHOD_OPTIONS else "계단 🚶"
+    move_type_options = list(data.item_definitions.keys()) if getattr(data, 'item_definitions', None) and isinstance(data.item_definitions, dict) else ["가정 이사 🏠", "사무실 이사 🏢"]
+    return {
+        "base_move_type": move_type_options[0],
+        "is_storage_move": False, "apply_long_distance": False, "has_via_point": False,
+        "moving_date": today,
+        "arrival_date": today,
+        "contract_date": today,
+        "from_floor": "1", "to_floor": "1",
+        "from_method": default_method, "to_method": default_method,
+        "via_point_method": default_method,
+        "final_selected_vehicle": "1톤",
+        "add_men": 0, "add_women": 0,
+        "remove_base_housewife": False, "remove_base_man": False,
+        "sky_hours_from": 1, "sky_hours_final": 1,
+        "adjustment_amount": 0,
+        "departure_ladder_surcharge_manual": 0, "arrival_ladder_surcharge_manual": 0,
+        "storage_duration": 1, "storage_type": data.DEFAULT_STORAGE_TYPE if hasattr(data, 'DEFAULT_STORAGE_TYPE') else "컨테이너 보관 📦",
+        "storage_use_electricity": False,
+        "long_distance_selector": data.long_distance_options[0] if hasattr(data, 'long_distance_options') and data.long_distance_options else "선택 안 함",
+        "has_waste_check": False, "waste_tons_input": 0.5,
+        "date_opt_0_widget": False, "date_opt_1_widget": False, "date_opt_2_widget": False,
+        "date_opt_3_widget": False, "date_opt_4_widget": False,
+        "via_point_surcharge": 0,
+        "issue_tax_invoice": False,
+        "card_payment": False,
+    }
+
+
+def get_relevant_costs_from_state(loaded_state_data):
+    """
+    로드된 견적 상태를 기반으로, VAT/카드 수수료 전의 총 이사비용과
+    보관이사시 각 레그별 비용요소, 주요 날짜 및 연락처를 계산합니다.
+    """
+    temp_state = get_minimal_default_state_for_calc()
+    today = temp_state["moving_date"]
+
+    if loaded_state_data and isinstance(loaded_state_data, dict):
+        for key, value in loaded_state_data.items():
+            if key in ["moving_date", "arrival_date", "contract_date"] and isinstance(value, str):
+                try: temp_state[key] = date.fromisoformat(value)
+                except ValueError: temp_state[key] = today
+            elif key in temp_state and isinstance(temp_state[key], (int, float)) and not isinstance(value, (int, float)):
+                try:
+                    if isinstance(temp_state[key], float): temp_state[key] = float(value or 0.0)
+                    else: temp_state[key] = int(float(value or 0))
+                except (ValueError, TypeError):
+                     pass
+            elif key.startswith("qty_") or key in temp_state :
+                temp_state[key] = value
+
+    temp_state['issue_tax_invoice'] = False
+    temp_state['card_payment'] = False
+
+    overall_pre_vat_total_cost, cost_items_pre_vat, _ = calculations.calculate_total_moving_cost(temp_state)
+
+    departure_specific_sum = 0
+    arrival_specific_sum = 0
+    storage_fee_sum = 0
+    common_splitable_sum = 0
+
+    for name, cost, _note in cost_items_pre_vat:
+        cost_int = 0
+        try: cost_int = int(float(cost or 0))
+        except (ValueError, TypeError): pass
+
+        if name in DEPARTURE_COST_LABELS:
+            departure_specific_sum += cost_int
+        elif name in ARRIVAL_COST_LABELS:
+            arrival_specific_sum += cost_int
+        elif name == STORAGE_COST_LABEL:
+            storage_fee_sum = cost_int
+        elif name not in EXCLUDE_LABELS_FOR_COMMON:
+            common_splitable_sum += cost_int
+
+    return {
+        "overall_pre_vat_total": overall_pre_vat_total_cost,
+        "common_splitable": common_splitable_sum,
+        "departure_specific": departure_specific_sum,
+        "arrival_specific": arrival_specific_sum,
+        "storage_fee": storage_fee_sum,
+        "is_storage_move": temp_state.get("is_storage_move", False),
+        "moving_date": temp_state.get("moving_date"),
+        "arrival_date": temp_state.get("arrival_date"),
+        "contract_date": temp_state.get("contract_date"),
+        "customer_phone": str((loaded_state_data or {}).get("customer_phone") or "").strip()
+    }
+
+
+def _date_text(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip() if value else ""
+
+
+def _parse_date_text(value):
+    """'YYYY-MM-DD' 는 date 로, 그 외(빈 값 포함)는 원래 문자열로 반환."""
+    try:
+        return date.fromisoformat(value)
+    except (ValueError, TypeError):
+        return value or ""
+
+
+def summary_app_properties(state_data):
+    """
+    견적 JSON 저장 시 함께 기록할 요약 appProperties (모두 문자열). 계산에 실패하면 빈 dict.
+    이사일/계약일은 google_drive_helper 의 moving_date / contract_date 검색용 키를 함께 사용합니다.
+    """
+    try:
+        costs_info = get_relevant_costs_from_state(state_data)
+    except Exception as e:
+        print(f"Warning [quote_summary]: 요약 계산 실패, 요약 없이 저장합니다: {e}")
+        return {}
+    return {
+        "summary_version": PRICING_FINGERPRINT,
+        "pre_vat_total": str(int(costs_info["overall_pre_vat_total"])),
+        "cost_common": str(int(costs_info["common_splitable"])),
+        "cost_departure": str(int(costs_info["departure_specific"])),
+        "cost_arrival": str(int(costs_info["arrival_specific"])),
+        "cost_storage": str(int(costs_info["storage_fee"])),
+        "is_storage_move": "1" if costs_info["is_storage_move"] else "0",
+        "arrival_date": _date_text(state_data.get("arrival_date")) if isinstance(state_data, dict) else "",
+        "customer_phone": costs_info["customer_phone"],
+    }
+
+
+def summary_from_app_properties(app_properties):
+    """
+    appProperties 에 기록된 요약 -> get_relevant_costs_from_state 와 같은 형태의 dict.
+    요약이 없거나 다른 요금표/계산 로직으로 만든 요약이면 None.
+    """
+    if not app_properties or app_properties.get("summary_version") != PRICING_FINGERPRINT:
+        return None
+    try:
+        return {
+            "overall_pre_vat_total": int(app_properties["pre_vat_total"]),
+            "common_splitable": int(app_properties["cost_common"]),
+            "departure_specific": int(app_properties["cost_departure"]),
+            "arrival_specific": int(app_properties["cost_arrival"]),
+            "storage_fee": int(app_properties["cost_storage"]),
+            "is_storage_move": app_properties.get("is_storage_move") == "1",
+            "moving_date": _parse_date_text(app_properties.get("moving_date")),
+            "arrival_date": _parse_date_text(app_properties.get("arrival_date")),
+            "contract_date": _parse_date_text(app_properties.get("contract_date")),
+            "customer_phone": app_properties.get("customer_phone", ""),
+        }
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def summary_from_state(state_data):
+    """다운로드한 견적 상태로 계산한 요약 (summary_from_app_properties 와 같은 형태)."""
+    costs_info = get_relevant_costs_from_state(state_data)
+    for date_key in ("moving_date", "arrival_date", "contract_date"):
+        costs_info[date_key] = _parse_date_text(_date_text(state_data.get(date_key)))
+    return costs_info
+
+
+def iter_quote_summaries(file_infos, max_workers=BATCH_DOWNLOAD_WORKERS, state_loader=None):
+    """
+    Drive 견적 파일들의 요약을 입력 순서대로 하나씩 반환합니다: (file_info, summary 또는 None, 오류 메시지 또는 None).
+    - file_info 에 appProperties 가 없으면 Drive 일괄 요청으로 메타데이터만 가져옴 (100개당 요청 1회)
+    - 유효한 요약이 없는 파일만 견적 내용을 읽어 계산하며, 내려받은 결과가 도착하는 대로 반환하므로 진행 표시에 사용할 수 있음
+    state_loader: file_ids -> [(file_id, state dict 또는 None)] 순서대로 (기본: Drive 에서 JSON 다운로드, 예: quote_store.load_quote_states)
+    """
+    import google_drive_helper as gdrive
+
+    file_infos = list(file_infos)
+    missing_metadata_ids = [f['id'] for f in file_infos if f.get('id') and 'appProperties' not in f]
+    fetched_properties = gdrive.get_files_app_properties(missing_metadata_ids) if missing_metadata_ids else {}
+
+    summaries = {}
+    ids_to_download = []
+    for file_info in file_infos:
+        file_id = file_info.get('id')
+        app_properties = file_info.get('appProperties') if 'appProperties' in file_info else fetched_properties.get(file_id)
+        summary = summary_from_app_properties(app_properties)
+        if summary is not None:
+            summaries[file_id] = (summary, None)
+        elif file_id:
+            ids_to_download.append(file_id)
+
+    ids_to_download = list(dict.fromkeys(ids_to_download))
+    if state_loader is None:
+        loaded_states = gdrive.load_json_files(ids_to_download, max_workers=max_workers)
+    else:
+        loaded_states = state_loader(ids_to_download) if ids_to_download else []
+    loaded_states = iter(loaded_states)
+
+    for file_info in file_infos:
+        file_id = file_info.get('id')
+        # 다운로드 결과는 ids_to_download 순서(= 입력에서 처음 나온 순서)로 오므로 이 파일 결과가 나올 때까지만 읽음
+        while file_id and file_id not in summaries:
+            try:
+                loaded_id, loaded_state = next(loaded_states)
+            except StopIteration:
+                break
+            if not isinstance(loaded_state, dict):
+                summaries[loaded_id] = (None, "파일 로드 또는 JSON 파싱 실패")
+                continue
+            try:
+                summaries[loaded_id] = (summary_from_state(loaded_state), None)
+            except Exception as e:
+                summaries[loaded_id] = (None, f"데이터 처리 중 오류: {str(e)[:100]}")
+        yield (file_info, *summaries.get(file_id, (None, "파일 ID 없음")))
+
+
+def load_quote_summaries(file_infos, max_workers=BATCH_DOWNLOAD_WORKERS, state_loader=None):
+    """iter_quote_summaries 의 결과 전체를 목록으로 반환합니다: [(file_info, summary 또는 None, 오류 메시지 또는 None)]."""
+    return list(iter_quote_summaries(file_infos, max_workers=max_workers, state_loader=state_loader))
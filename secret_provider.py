@@ -0,0 +1,86 @@
+# secret_provider.py
+"""
+비밀 설정(서비스 계정, 이메일 계정 등) 조회 경로.
+
+기본값은 Streamlit Secrets(st.secrets)이며 streamlit 은 처음 조회할 때 가져옵니다.
+배치 작업/테스트에서는 set_secret_provider() 로 dict, TOML 파일, 환경 변수 기반 provider 로 바꿉니다.
+모든 provider 는 get_section(name) 으로 섹션(dict 형태)을 반환하고, 없으면 KeyError 를 냅니다.
+"""
+import json
+import os
+
+DEFAULT_SECRETS_TOML_PATH = os.path.join(".streamlit", "secrets.toml")
+SECRETS_ENV_PREFIX = "MOVING_SECRET_"
+
+
+class StreamlitSecretProvider:
+    """st.secrets 조회."""
+
+    def get_section(self, name):
+        import streamlit as st
+        return st.secrets[name]
+
+
+class DictSecretProvider:
+    """{섹션 이름: dict} 매핑에서 조회 (테스트/스크립트용)."""
+
+    def __init__(self, sections):
+        self.sections = dict(sections)
+
+    def get_section(self, name):
+        return self.sections[name]
+
+
+class TomlFileSecretProvider(DictSecretProvider):
+    """secrets.toml 파일을 읽어 조회 (Streamlit 없이 같은 설정 파일 사용)."""
+
+    def __init__(self, path=DEFAULT_SECRETS_TOML_PATH):
+        try:
+            import tomllib
+            with open(path, "rb") as f:
+                sections = tomllib.load(f)
+        except ImportError: # Python 3.10 이하
+            import toml
+            sections = toml.load(path)
+        super().__init__(sections)
+
+
+class EnvSecretProvider:
+    """환경 변수 MOVING_SECRET_<섹션 이름 대문자> 에 담긴 JSON 으로 조회 (예: MOVING_SECRET_GCP_SERVICE_ACCOUNT)."""
+
+    def __init__(self, prefix=SECRETS_ENV_PREFIX):
+        self.prefix = prefix
+
+    def get_section(self, name):
+        raw_value = os.environ.get(f"{self.prefix}{name.upper()}")
+        if raw_value is None:
+            raise KeyError(name)
+        return json.loads(raw_value)
+
+
+_provider = StreamlitSecretProvider()
+
+
+def get_secret_provider():
+    return _provider
+
+
+def set_secret_provider(new_provider):
+    """비밀 설정 조회 경로를 바꾸고 이전 provider 를 반환합니다. None 이면 Streamlit Secrets 로 되돌립니다."""
+    global _provider
+    previous_provider = _provider
+    _provider = new_provider if new_provider is not None else StreamlitSecretProvider()
+    return previous_provider
+
+
+def get_section(name):
+    """비밀 설정 섹션 (없으면 KeyError)."""
+    return _provider.get_section(name)
+
+
+def has_section(name):
+    try:
+        get_section(name)
+        return True
+    except KeyError:
+        return False
@@ -0,0 +1,71 @@
+import random
+
+import pandas as pd
+import pytest
+
+import bulk_calculations
+import calculations
+import data
+import quote_state
+
+
+def _random_state(rng):
+    move_types = list(data.vehicle_prices.keys())
+    move_type = rng.choice(move_types + ["알 수 없는 이사"])
+    vehicles = list(data.vehicle_prices.get(move_type, {}).keys()) or ["1톤"]
+    return {
+        "base_move_type": move_type,
+        "final_selected_vehicle": rng.choice(vehicles + [None, "없는 차량"]),
+        "is_storage_move": rng.random() < 0.3,
+        "from_method": rng.choice(data.METHOD_OPTIONS), "to_method": rng.choice(data.METHOD_OPTIONS),
+        "from_floor": rng.choice(["1", "5", "B1", "12", "25", "-3", "", None]),
+        "to_floor": str(rng.randint(-2, 30)),
+        "sky_hours_from": rng.choice([0, 1, 2, 3, "", None]), "sky_hours_final": rng.randint(0, 4),
+        "remove_base_housewife": rng.random() < 0.3, "remove_base_man": rng.random() < 0.3,
+        "add_men": rng.choice([0, 1, 2, "", None]), "add_women": rng.randint(0, 2),
+        "adjustment_amount": rng.choice([0, -50000, 30000, None]),
+        "manual_ladder_from_check": rng.random() < 0.5,
+        "departure_ladder_surcharge_manual": rng.choice([0, 10000, -5000]),
+        "storage_duration": rng.choice([0, 1, 10, None]),
+        "storage_use_electricity": rng.random() < 0.5,
+        "storage_type": rng.choice(list(data.BASE_STORAGE_UNIT_RATES) + ["?"]),
+        "apply_long_distance": rng.random() < 0.3,
+        "long_distance_selector": rng.choice(list(data.long_distance_prices)),
+        "has_waste_check": rng.random() < 0.3, "waste_tons_input": rng.choice([0.5, 1.3, 0, None]),
+        "date_opt_0_widget": rng.random() < 0.3, "date_opt_2_widget": rng.random() < 0.3,
+        "has_via_point": rng.random() < 0.3, "via_point_surcharge": rng.choice([0, 20000]),
+        "card_payment": rng.random() < 0.3, "issue_tax_invoice": rng.random() < 0.4,
+        "deposit_amount": rng.choice([0, 50000, 10 ** 7]),
+    }
+
+
+def _assert_matches_single(states, results):
+    for position, state in enumerate(states):
+        total_cost, cost_items, personnel_info = calculations.calculate_total_moving_cost(state)
+        row = results.iloc[position]
+        assert row["total_cost"] == total_cost, state
+        assert [tuple(item) for item in row["cost_items"]] == [tuple(item) for item in cost_items], state
+        assert row["personnel_info"] == personnel_info, state
+
+
+@pytest.fixture(scope="module")
+def random_states():
+    rng = random.Random(6)
+    return [_random_state(rng) for _ in range(400)]
+
+
+def test_batch_matches_single_calculation(random_states):
+    _assert_matches_single(random_states, bulk_calculations.calculate_total_moving_cost_batch(random_states))
+
+
+def test_batch_accepts_dataframe_input(random_states):
+    from_list = bulk_calculations.calculate_total_moving_cost_batch(random_states)
+    from_frame = bulk_calculations.calculate_total_moving_cost_batch(pd.DataFrame(random_states))
+    assert from_frame["total_cost"].tolist() == from_list["total_cost"].tolist()
+
+
+def test_batch_matches_single_for_loaded_quotes(random_states):
+    # 앱에서 불러온 것과 같은 완전한 상태 (tab3_ 값 동기화 포함)
+    states = [quote_state.state_from_saved_data(dict(state, tab3_deposit_amount=30000, tab3_adjustment_amount=-10000))
+              for state in random_states[:100]]
+    _assert_matches_single(states, bulk_calculations.calculate_total_moving_cost_batch(states))
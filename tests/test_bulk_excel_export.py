@@ -0,0 +1,88 @@
+import io
+import json
+import random
+import sys
+import types
+
+import openpyxl
+import pytest
+
+import bulk_excel_export
+import calculations
+import data
+import quote_state
+import state_manager
+
+TOTAL_COLUMN = 8
+DEPOSIT_COLUMN = 9
+
+
+def _random_saved_data(rng):
+    state = quote_state.state_from_saved_data({})
+    move_type = rng.choice(list(data.vehicle_prices.keys()))
+    state.update({
+        "base_move_type": move_type,
+        "final_selected_vehicle": rng.choice(list(data.vehicle_prices[move_type].keys())),
+        "from_floor": str(rng.randint(1, 20)), "to_floor": str(rng.randint(1, 20)),
+        "from_method": rng.choice(data.METHOD_OPTIONS), "to_method": rng.choice(data.METHOD_OPTIONS),
+        "add_men": rng.randint(0, 2), "add_women": rng.randint(0, 1),
+        "manual_ladder_from_check": rng.random() < 0.5, "manual_ladder_to_check": rng.random() < 0.5,
+        "deposit_amount": rng.choice([50000, 100000, 300000]),
+        "adjustment_amount": rng.choice([-30000, 20000, 70000]),
+        "departure_ladder_surcharge_manual": rng.choice([10000, 40000]),
+        "arrival_ladder_surcharge_manual": rng.choice([15000, 30000]),
+        "date_opt_0_widget": rng.random() < 0.5, "date_opt_2_widget": rng.random() < 0.5,
+    })
+    # 저장 파일에는 tab3_ 키로만 기록됨 (계약금/조정/수동 사다리/날짜 할증)
+    return state_manager.prepare_state_for_save(state)
+
+
+@pytest.fixture(scope="module")
+def saved_quotes():
+    rng = random.Random(15)
+    return [_random_saved_data(rng) for _ in range(20)]
+
+
+def _expected_rows(saved_quotes):
+    expected = []
+    for saved_data in saved_quotes:
+        total_cost = calculations.calculate_total_moving_cost(quote_state.state_from_saved_data(saved_data))[0]
+        expected.append((total_cost, saved_data["tab3_deposit_amount"]))
+    return expected
+
+
+def _exported_rows(quote_sources, chunk_size=bulk_excel_export.DEFAULT_CHUNK_SIZE):
+    output = io.BytesIO()
+    bulk_excel_export.export_quotes_to_excel(quote_sources, output, chunk_size=chunk_size)
+    sheet = openpyxl.load_workbook(io.BytesIO(output.getvalue()), read_only=True)["견적 목록"]
+    return [(row[TOTAL_COLUMN], row[DEPOSIT_COLUMN]) for row in sheet.iter_rows(min_row=2, values_only=True)]
+
+
+def test_json_dir_export_matches_app_calculation(saved_quotes, tmp_path):
+    for position, saved_data in enumerate(saved_quotes):
+        # v1 (들여쓰기 JSON) 과 v2 (gzip) 저장 파일을 섞어서 기록
+        if position % 2:
+            raw = quote_state.encode_saved_data(saved_data, save_format=quote_state.SAVE_FORMAT_V2, compress=True)
+        else:
+            raw = json.dumps(saved_data, ensure_ascii=False, indent=2).encode("utf-8")
+        (tmp_path / f"quote_{position:03d}.json").write_bytes(raw)
+
+    rows = _exported_rows(bulk_excel_export.iter_states_from_json_dir(tmp_path), chunk_size=7)
+    assert rows == _expected_rows(saved_quotes)
+    assert any(deposit for _, deposit in rows)
+
+
+def test_drive_export_loads_in_chunks(saved_quotes, monkeypatch):
+    files = {f"id{position}": saved_data for position, saved_data in enumerate(saved_quotes)}
+    requested_chunks = []
+
+    def load_json_files(file_ids, max_workers=None):
+        requested_chunks.append(list(file_ids))
+        return [(file_id, json.loads(json.dumps(files[file_id]))) for file_id in file_ids]
+
+    fake_gdrive = types.SimpleNamespace(load_json_files=load_json_files)
+    monkeypatch.setitem(sys.modules, "google_drive_helper", fake_gdrive)
+
+    rows = _exported_rows(bulk_excel_export.iter_states_from_drive(list(files), chunk_size=6))
+    assert rows == _expected_rows(saved_quotes)
+    assert [len(chunk) for chunk in requested_chunks] == [6, 6, 6, 2]
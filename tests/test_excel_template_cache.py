@@ -0,0 +1,74 @@
+import io
+import os
+
+import openpyxl
+from openpyxl.styles import Alignment, Font
+
+import calculations
+import data
+import excel_filler
+import quote_state
+
+TEMPLATE_PATH = os.path.join(excel_filler.TEMPLATE_DIR, "final.xlsx")
+
+
+def _sample_state(**overrides):
+    saved = {
+        "base_move_type": list(data.item_definitions.keys())[0], "final_selected_vehicle": "5톤",
+        "customer_name": "홍길동", "customer_phone": "010-1234-5678",
+        "from_address_full": "서울특별시 은평구", "to_address_full": "경기도 고양시",
+        "from_floor": "7", "to_floor": "3", "add_men": 1, "special_notes": "피아노 있음",
+    }
+    saved.update(overrides)
+    return quote_state.state_from_saved_data(saved)
+
+
+def _fill(state):
+    total_cost, cost_items, personnel_info = calculations.calculate_total_moving_cost(state)
+    return excel_filler.fill_final_excel_template(state, cost_items, total_cost, personnel_info)
+
+
+def _cells(excel_bytes):
+    ws = openpyxl.load_workbook(io.BytesIO(excel_bytes)).active
+    return {cell.coordinate: (cell.value, cell.number_format, cell.font.b, cell.alignment.horizontal)
+            for row in ws.iter_rows() for cell in row}
+
+
+def test_reused_template_matches_fresh_load():
+    excel_filler.clear_template_cache()
+    _fill(_sample_state(is_storage_move=True, has_via_point=True, card_payment=True))
+    reused_output = _fill(_sample_state())
+    excel_filler.clear_template_cache()
+    assert _cells(reused_output) == _cells(_fill(_sample_state()))
+
+
+def test_release_restores_cell_styles():
+    excel_filler.clear_template_cache()
+    ws = excel_filler._template_cache.acquire(TEMPLATE_PATH).active
+    original = (ws["B2"].value, ws["B2"].font.b, ws["B2"].alignment.horizontal, ws["B2"].number_format)
+    ws["B2"].value = "변경"
+    ws["B2"].font = Font(bold=not original[1])
+    ws["B2"].alignment = Alignment(horizontal="right" if original[2] != "right" else "left")
+    ws["B2"].number_format = "0.00%"
+    excel_filler._template_cache.release()
+
+    ws = excel_filler._template_cache.acquire(TEMPLATE_PATH).active
+    try:
+        assert (ws["B2"].value, ws["B2"].font.b, ws["B2"].alignment.horizontal, ws["B2"].number_format) == original
+    finally:
+        excel_filler._template_cache.release()
+
+
+def test_layout_change_reloads_template():
+    excel_filler.clear_template_cache()
+    ws = excel_filler._template_cache.acquire(TEMPLATE_PATH).active
+    ws.merge_cells("AA100:AB100")
+    ws.row_dimensions[200].height = 40
+    excel_filler._template_cache.release()
+    assert excel_filler._template_cache._workbook is None
+
+    ws = excel_filler._template_cache.acquire(TEMPLATE_PATH).active
+    try:
+        assert "AA100:AB100" not in {str(merged) for merged in ws.merged_cells.ranges}
+    finally:
+        excel_filler._template_cache.release()
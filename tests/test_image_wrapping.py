@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import image_generator
+
+
+def _old_wrap_lines(text, font, max_width):
+    """layout_text_lines 도입 전 _draw_text_with_alignment 의 줄바꿈 (단어마다 줄 전체를 다시 측정)."""
+    get_text_dimensions = image_generator.get_text_dimensions
+    lines = []
+    words = text.split(' ')
+    current_line = ""
+    for word in words:
+        word_width, _ = get_text_dimensions(word, font)
+        if word_width > max_width and len(word) > 1:
+            if current_line: lines.append(current_line.strip())
+            temp_word_line = ""
+            for char_in_word in word:
+                temp_word_line_plus_char_width, _ = get_text_dimensions(temp_word_line + char_in_word, font)
+                if temp_word_line_plus_char_width <= max_width:
+                    temp_word_line += char_in_word
+                else:
+                    lines.append(temp_word_line)
+                    temp_word_line = char_in_word
+            if temp_word_line: lines.append(temp_word_line)
+            current_line = ""
+            continue
+
+        current_line_plus_word_width, _ = get_text_dimensions(current_line + word + " ", font) if current_line else get_text_dimensions(word + " ", font)
+        if current_line_plus_word_width <= max_width:
+            current_line += word + " "
+        else:
+            if current_line: lines.append(current_line.strip())
+            current_line = word + " "
+    if current_line.strip(): lines.append(current_line.strip())
+    if not lines and text: lines.append(text)
+    return lines
+
+
+WORD_POOL = ["이사", "보관이사", "사다리차", "엘리베이터", "Ave.", "WAVE", "To", "AV", "Ty", "LT",
+             "서울특별시", "강남구", "테헤란로", "123-45", "VAT", "Yoga", "fi", "W.", "r,", "", "---",
+             "냉장고(양문형)", "피아노(일반)", "TV(75인치)", "AWAY", "Tokyo", "VVVVVVVVVVVVVV",
+             "가나다라마바사아자차카타파하가나다라마바사아자차카타파하"]
+
+
+def _sample_texts(count, seed=20240501):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield " ".join(rng.choice(WORD_POOL) for _ in range(rng.randint(1, 30)))
+
+
+@pytest.fixture(scope="module", params=[("regular", 18), ("bold", 21), ("regular", 13)])
+def font(request):
+    font_type, size = request.param
+    return image_generator._get_font(font_type, size)
+
+
+@pytest.mark.parametrize("max_width", [8, 40, 95, 180, 333])
+def test_layout_matches_old_wrapper(font, max_width):
+    for text in _sample_texts(60):
+        assert image_generator.layout_text_lines(text, font, max_width) == _old_wrap_lines(text, font, max_width), text
+
+
+@pytest.mark.parametrize("max_width", [40, 95, 180, 333])
+def test_wrapped_lines_fit_max_width(font, max_width):
+    for text in _sample_texts(60, seed=7):
+        for line in image_generator.layout_text_lines(text, font, max_width):
+            if len(line) <= 1:
+                continue # 글자 하나가 max_width 보다 넓은 경우만 예외
+            assert image_generator.get_text_dimensions(line, font)[0] <= max_width, (text, line)
+
+
+def test_layout_without_max_width_splits_on_newlines(font):
+    assert image_generator.layout_text_lines("a b\nc", font) == ["a b", "c"]
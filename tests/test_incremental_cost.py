@@ -0,0 +1,60 @@
+import copy
+
+import calculations
+import data
+import quote_state
+
+SAMPLE_STATE = {
+    "base_move_type": list(data.item_definitions.keys())[0],
+    "final_selected_vehicle": "5톤",
+    "from_floor": "7", "to_floor": "3",
+    "from_method": data.METHOD_OPTIONS[0], "to_method": data.METHOD_OPTIONS[0],
+    "add_men": 1,
+}
+
+
+def _state(**overrides):
+    return quote_state.state_from_saved_data(dict(SAMPLE_STATE, **overrides))
+
+
+def test_incremental_matches_full_calculation_after_edits():
+    calculator = calculations.IncrementalCostCalculator()
+    state = _state()
+    assert calculator.calculate(state) == calculations.calculate_total_moving_cost(state)
+    state["add_men"] = 3
+    state["card_payment"] = True
+    assert calculator.calculate(state) == calculations.calculate_total_moving_cost(state)
+    assert "base_fare" not in calculator.last_recomputed
+
+
+def test_incremental_recomputes_when_pricing_data_is_replaced(monkeypatch):
+    calculator = calculations.IncrementalCostCalculator()
+    state = _state()
+    before_total = calculator.calculate(state)[0]
+
+    # data.py 를 다시 로드한 것처럼 가격 객체를 새 값으로 교체
+    raised_prices = copy.deepcopy(data.vehicle_prices)
+    for vehicle_prices in raised_prices.values():
+        for vehicle_name, price_info in vehicle_prices.items():
+            price_info["price"] = price_info["price"] + 100000
+    monkeypatch.setattr(data, "vehicle_prices", raised_prices)
+
+    after = calculator.calculate(state)
+    assert after == calculations.calculate_total_moving_cost(state)
+    assert after[0] > before_total
+
+
+def test_incremental_watches_special_days_added_on_reload(monkeypatch):
+    calculator = calculations.IncrementalCostCalculator()
+    extended_prices = dict(data.special_day_prices)
+    extended_prices["추가 할증일"] = 70000
+    monkeypatch.setattr(data, "special_day_prices", extended_prices)
+    new_option_key = f"date_opt_{len(extended_prices) - 1}_widget"
+
+    state = _state()
+    assert calculator.calculate(state) == calculations.calculate_total_moving_cost(state)
+    # 다시 로드로 새로 생긴 날짜 옵션만 바꿔도 할증이 반영되어야 함
+    state[new_option_key] = True
+    after = calculator.calculate(state)
+    assert after == calculations.calculate_total_moving_cost(state)
+    assert ("날짜 할증", 70000, "추가") in after[1]
@@ -0,0 +1,65 @@
+import io
+import random
+
+import pytest
+
+import pdf_generator
+
+pytest.importorskip("reportlab")
+from reportlab.lib.styles import ParagraphStyle  # noqa: E402
+from reportlab.pdfgen import canvas as reportlab_canvas  # noqa: E402
+from reportlab.platypus import Paragraph  # noqa: E402
+
+WORDS = ["서울특별시", "은평구", "가좌로10길", "33-1", "101동", "1001호", "A&amp;B", "&lt;주의&gt;", "엘리베이터",
+         "사용가능시간확인필요피아노운반포함사다리차대기", "0101234567801012345678", "x"]
+
+
+@pytest.fixture(scope="module")
+def font_name():
+    return pdf_generator.register_pdf_fonts()[0]
+
+
+def _random_text(rng):
+    parts = [rng.choice(WORDS) for _ in range(rng.randint(1, 14))]
+    if rng.random() < 0.3:
+        parts.insert(rng.randrange(len(parts)), "<br/>")
+    return " ".join(parts)
+
+
+def _reportlab_overflows(paragraph):
+    # ReportLab 도 일부 줄은 폭을 조금 넘겨 그대로 두므로 (extraSpace < 0) 그런 문단은 줄 수 비교에서 제외
+    for line in paragraph.blPara.lines:
+        extra_space = line.extraSpace if hasattr(line, "extraSpace") else line[0]
+        if extra_space < 0:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("avail_width", [120, 250, 480])
+def test_pillow_paragraph_wraps_like_reportlab(font_name, avail_width):
+    style = ParagraphStyle(name="Test", fontName=font_name, fontSize=10, leading=12)
+    page_canvas = pdf_generator.PillowPageCanvas(pdf_generator.A4)
+    pdf_canvas = reportlab_canvas.Canvas(io.BytesIO())
+    rng = random.Random(13)
+    for _ in range(200):
+        text = _random_text(rng)
+        pillow_paragraph = pdf_generator.PillowParagraph(text, style)
+        _, pillow_height = pillow_paragraph.wrapOn(page_canvas, avail_width, 1000)
+        reportlab_paragraph = Paragraph(text, style)
+        _, reportlab_height = reportlab_paragraph.wrapOn(pdf_canvas, avail_width, 1000)
+        if not _reportlab_overflows(reportlab_paragraph):
+            assert pillow_height == pytest.approx(reportlab_height), text
+        for line_text in pillow_paragraph._lines:
+            assert "&amp;" not in line_text and "<br/>" not in line_text
+            if len(line_text) > 1:
+                assert page_canvas.text_width(line_text, font_name, 10) <= avail_width, (text, line_text)
+
+
+def test_pil_fonts_are_cached_across_canvases(font_name):
+    first_canvas = pdf_generator.PillowPageCanvas(pdf_generator.A4)
+    second_canvas = pdf_generator.PillowPageCanvas(pdf_generator.A4)
+    assert first_canvas.get_pil_font(font_name, 10) is second_canvas.get_pil_font(font_name, 10)
+
+
+def test_poppler_is_default_quote_image_mode():
+    assert pdf_generator.QUOTE_IMAGE_RENDER_MODE == "poppler"
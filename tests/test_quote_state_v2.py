@@ -0,0 +1,81 @@
+import json
+import random
+
+import pytest
+
+import item_catalog
+import quote_state
+import state_manager
+
+
+def _random_saved_data(rng):
+    state = quote_state.state_from_saved_data({})
+    move_types = list(quote_state.MOVE_TYPE_OPTIONS)
+    state.update({
+        "base_move_type": rng.choice(move_types),
+        "customer_name": rng.choice(["", "홍길동", "김 철수"]),
+        "customer_phone": rng.choice(["", "010-1234-5678", "01099998888"]),
+        "is_storage_move": rng.random() < 0.3,
+        "storage_duration": rng.choice([1, 10, 30]),
+        "from_floor": rng.choice(["", "3", "B1", "15"]),
+        "to_floor": str(rng.randint(-2, 30)),
+        "special_notes": rng.choice(["", "피아노 있음\n주차 불가"]),
+        "add_men": rng.choice([0, 1, 2]), "add_women": rng.choice([0, 1]),
+        "sky_hours_from": rng.choice([1, 2, 3]),
+        "has_waste_check": rng.random() < 0.3, "waste_tons_input": rng.choice([0.5, 1.0, 2.3]),
+        "card_payment": rng.random() < 0.3, "issue_tax_invoice": rng.random() < 0.3,
+        "uploaded_images": rng.choice([[], ["img1", "img2"]]),
+        "deposit_amount": rng.choice([0, 50000, 100000]),
+        "adjustment_amount": rng.choice([0, -30000, 20000]),
+        "departure_ladder_surcharge_manual": rng.choice([0, 10000]),
+        "date_opt_1_widget": rng.random() < 0.3,
+    })
+    for qty_key in rng.sample(item_catalog.CATALOG.all_qty_keys, min(15, len(item_catalog.CATALOG.all_qty_keys))):
+        state[qty_key] = rng.choice([0, 1, 2, 5])
+    return state_manager.prepare_state_for_save(state)
+
+
+@pytest.fixture(scope="module")
+def saved_quotes():
+    rng = random.Random(25)
+    quotes = [_random_saved_data(rng) for _ in range(100)]
+    # 기본값과 타입만 다른 값, 카탈로그에 없는 품목 수량, 알 수 없는 키
+    odd = _random_saved_data(rng)
+    odd.update({"add_men": False, "has_via_point": 0, "qty_없는이사_없는섹션_없는품목": 3, "extra_key": {"a": 1}})
+    quotes.append(odd)
+    return quotes
+
+
+def _canonical(saved_data):
+    # False == 0 이므로 dict 비교 대신 JSON 문자열로 비교 (값의 타입까지 확인)
+    return json.dumps(saved_data, ensure_ascii=False, sort_keys=True)
+
+
+def _v1_round_trip(saved_data):
+    return quote_state.decode_saved_data(quote_state.encode_saved_data(saved_data, save_format=1))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_v2_round_trip_matches_v1(saved_quotes, compress):
+    for saved_data in saved_quotes:
+        encoded = quote_state.encode_saved_data(saved_data, save_format=quote_state.SAVE_FORMAT_V2, compress=compress)
+        decoded = quote_state.decode_saved_data(encoded)
+        assert _canonical(decoded) == _canonical(_v1_round_trip(saved_data))
+        assert _canonical(decoded) == _canonical(saved_data)
+        assert quote_state.state_from_saved_data(decoded) == quote_state.state_from_saved_data(saved_data)
+
+
+def test_v2_omits_default_values(saved_quotes):
+    for saved_data in saved_quotes:
+        compact = json.loads(quote_state.encode_saved_data(saved_data, save_format=quote_state.SAVE_FORMAT_V2))
+        assert compact[quote_state.SAVE_FORMAT_KEY] == quote_state.SAVE_FORMAT_V2
+        assert not any(key.startswith("qty_") and key in item_catalog.CATALOG.qty_key_parts for key in compact)
+        for key in quote_state.SPARSE_ALWAYS_SAVED_KEYS:
+            if key in saved_data:
+                assert compact[key] == saved_data[key]
+
+
+def test_v1_files_load_unchanged(saved_quotes):
+    saved_data = saved_quotes[0]
+    raw = json.dumps(saved_data, ensure_ascii=False, indent=2).encode("utf-8-sig")
+    assert _canonical(quote_state.decode_saved_data(raw)) == _canonical(saved_data)
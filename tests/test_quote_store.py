@@ -0,0 +1,106 @@
+import pytest
+
+import google_drive_helper as gdrive
+import quote_store
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result()
+
+
+class _FakeDrive:
+    """files().list / changes() 만 흉내 내는 Drive 서비스 (폴더 'F' 의 JSON 파일)."""
+
+    def __init__(self):
+        self.files_by_id = {}
+        self.states = {}
+        self.changes_log = []
+
+    def put(self, file_id, phone, state, version="v1"):
+        item = {"id": file_id, "name": f"{phone}.json", "mimeType": "application/json",
+                "parents": ["F"], "md5Checksum": version}
+        self.files_by_id[file_id] = item
+        self.states[file_id] = state
+        self.changes_log.append({"fileId": file_id, "file": item})
+
+    def files(self):
+        return self
+
+    def changes(self):
+        return _FakeChanges(self)
+
+    def list(self, **kwargs):
+        return _Request(lambda: {"files": list(self.files_by_id.values())})
+
+    def load_json_files(self, file_ids, max_workers=None):
+        for file_id in file_ids:
+            state = self.states.get(file_id)
+            yield file_id, state if isinstance(state, dict) else None
+
+
+class _FakeChanges:
+    def __init__(self, drive):
+        self.drive = drive
+
+    def getStartPageToken(self):
+        return _Request(lambda: {"startPageToken": str(len(self.drive.changes_log))})
+
+    def list(self, pageToken, **kwargs):
+        log = self.drive.changes_log
+        return _Request(lambda: {"changes": log[int(pageToken):], "newStartPageToken": str(len(log))})
+
+
+@pytest.fixture
+def drive(monkeypatch):
+    fake_drive = _FakeDrive()
+    monkeypatch.setattr(gdrive, "get_drive_service", lambda: fake_drive)
+    monkeypatch.setattr(gdrive, "load_json_files", fake_drive.load_json_files)
+    return fake_drive
+
+
+def test_failed_file_does_not_block_seed_and_is_retried(drive, tmp_path):
+    drive.put("good", "01012345678", {"customer_name": "홍길동", "moving_date": "2026-01-05"})
+    drive.put("broken", "01099990000", ["손상된", "견적"])
+    store = quote_store.QuoteStore("F", path=str(tmp_path / "store.sqlite3"))
+
+    counts = store.sync(force=True)
+    assert counts["mode"] == "full" and counts["downloaded"] == 1 and counts["failed"] == 1
+    assert store.is_seeded()
+    assert store.failed_file_ids() == ["broken"]
+    # 내용은 없어도 파일명(전화번호)으로는 검색됨
+    assert [item["id"] for item in store.find_by_phone_suffix("0000")] == ["broken"]
+
+    # 바뀌지 않은 실패 파일도 다음 sync (changes 모드) 에서 다시 시도
+    drive.states["broken"] = {"customer_name": "김철수"}
+    drive.put("new", "01055556666", {"customer_name": "새 고객"})
+    token_before = store._get_meta("start_page_token")
+    counts = store.sync(force=True)
+    assert counts["mode"] == "changes" and counts["failed"] == 0 and counts["downloaded"] == 2
+    assert store._get_meta("start_page_token") != token_before
+    assert store.failed_file_ids() == []
+    assert dict(store.load_states(["broken"]))["broken"] == {"customer_name": "김철수"}
+    assert [item["id"] for item in store.find_by_customer_name("김철수")] == ["broken"]
+
+
+def test_failed_file_removed_from_drive_is_forgotten(drive, tmp_path):
+    drive.put("broken", "01099990000", None)
+    store = quote_store.QuoteStore("F", path=str(tmp_path / "store.sqlite3"))
+    store.sync(force=True)
+    assert store.failed_file_ids() == ["broken"]
+
+    del drive.files_by_id["broken"]
+    drive.changes_log.append({"fileId": "broken", "removed": True})
+    counts = store.sync(force=True)
+    assert counts["removed"] == 1
+    assert store.failed_file_ids() == [] and store.count() == 0
+
+
+def test_row_phone_suffix_uses_file_name_then_customer_phone():
+    assert quote_store.quote_row_values("a", "01012345678.json", {})["phone_last4"] == "5678"
+    assert quote_store.quote_row_values("b", "견적.json", {"customer_phone": "010-9999-4321"})["phone_last4"] == "4321"
+    assert quote_store.quote_row_values("c", "견적.json", {})["phone_last4"] == ""
+    assert gdrive.phone_suffix_of("01012345678.json", "010-0000-1111") == "5678"
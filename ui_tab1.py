@@ -9,7 +9,7 @@ import re
 try:
     import data
     import utils
-    import google_drive_helper as gdrive
+    import lazy_modules
     # 'from ... import ...' 대신 모듈 전체를 import 하도록 수정
     import state_manager 
     import callbacks
@@ -23,6 +23,10 @@ except Exception as e:
     traceback.print_exc()
     st.stop()
 
+# Google API 클라이언트는 Drive 검색/저장 등을 처음 사용할 때 로드
+gdrive = lazy_modules.lazy_import("google_drive_helper")
+quote_store = lazy_modules.lazy_import("quote_store") # 견적 검색용 로컬 SQLite 저장소 (Drive 와 동기화)
+
 # UPLOAD_DIR 관련 코드는 이미지 영구 저장을 위해 제거됨
 
 def render_tab1():
@@ -51,7 +55,7 @@ def render_tab1():
 
         with col_load:
             st.markdown("**견적 불러오기**")
-            search_term = st.text_input("검색 (전화번호 전체 또는 끝 4자리)", key="gdrive_search_term_tab1", help="전체 전화번호 또는 전화번호 끝 4자리를 입력하세요.")
+            search_term = st.text_input("검색 (전화번호 전체, 끝 4자리 또는 고객명)", key="gdrive_search_term_tab1", help="전체 전화번호, 전화번호 끝 4자리 또는 고객명을 입력하세요.")
 
             if st.button("견적 검색", key="gdrive_search_button_tab1"):
                 st.session_state.gdrive_search_results = []
@@ -64,13 +68,12 @@ def render_tab1():
                 if search_term_strip:
                     with st.spinner("Google Drive에서 검색 중..."):
                         if len(search_term_strip) == 4 and search_term_strip.isdigit():
-                            all_json_files_in_folder = gdrive.find_files_by_name_contains(
-                                name_query="",
-                                mime_types="application/json",
+                            suffix_matched_files = quote_store.find_quotes_by_phone_suffix(
+                                search_term_strip,
                                 folder_id=gdrive_folder_id_from_secrets
                             )
-                            if all_json_files_in_folder:
-                                for r_item in all_json_files_in_folder:
+                            if suffix_matched_files:
+                                for r_item in suffix_matched_files:
                                     file_name = r_item.get('name', '')
                                     if file_name:
                                         try:
@@ -79,14 +82,18 @@ def render_tab1():
                                                 processed_results.append(r_item)
                                         except Exception:
                                             pass
-                        else:
-                            all_gdrive_results = gdrive.find_files_by_name_contains(
-                                name_query=search_term_strip,
-                                mime_types="application/json",
+                        elif any(c.isdigit() for c in search_term_strip):
+                            all_gdrive_results = quote_store.find_quotes_by_name_contains(
+                                search_term_strip,
                                 folder_id=gdrive_folder_id_from_secrets
                             )
                             if all_gdrive_results:
                                 processed_results = all_gdrive_results
+                        else:
+                            processed_results = quote_store.find_quotes_by_customer_name(
+                                search_term_strip,
+                                folder_id=gdrive_folder_id_from_secrets
+                            )
 
                     if processed_results:
                         st.session_state.gdrive_search_results = processed_results
@@ -129,8 +136,11 @@ def render_tab1():
                 json_file_id = st.session_state.get('gdrive_selected_file_id')
                 selected_filename_display = st.session_state.get('gdrive_selected_filename', '선택된 파일')
                 if json_file_id:
+                    # 검색 결과에 있는 파일 버전을 넘기면 캐시된 견적은 메타데이터 요청 없이 바로 불러옴
+                    json_file_version = next((r_item.get('version') for r_item in st.session_state.get('gdrive_search_results') or []
+                                              if r_item.get('id') == json_file_id), None)
                     with st.spinner(f"'{selected_filename_display}' 로딩 중..."):
-                        loaded_content = gdrive.load_json_file(json_file_id)
+                        loaded_content = gdrive.load_json_file(json_file_id, version=json_file_version)
                     if loaded_content:
                         update_basket_callback_ref = getattr(callbacks, 'update_basket_quantities', lambda: None)
                         if 'uploaded_images' not in loaded_content or \
@@ -180,6 +190,8 @@ def render_tab1():
                                     folder_id=gdrive_folder_id_from_secrets
                                 )
                             if save_json_result and save_json_result.get('id'):
+                                quote_store.note_quote_saved(save_json_result['id'], json_filename, state_data_to_save,
+                                                             folder_id=gdrive_folder_id_from_secrets)
                                 st.success(f"'{json_filename}' 저장 완료.")
                             else: st.error(f"'{json_filename}' 저장 실패.")
                         except Exception as save_err:
@@ -370,15 +382,22 @@ def render_tab1():
     if current_uploaded_images:
         st.markdown("**업로드된 이미지:**")
         
-        def delete_image_action(image_id_to_delete):
+        def delete_images_action(image_ids_to_delete):
+            # 여러 장도 Drive 일괄 요청 한 번으로 삭제하고, 성공한 이미지만 목록에서 제거
             with st.spinner("이미지 삭제 중..."):
-                success = gdrive.delete_file_from_drive(image_id_to_delete)
-            if success:
-                st.session_state.uploaded_images = [img for img in st.session_state.uploaded_images if img['id'] != image_id_to_delete]
-                st.toast("이미지 삭제 완료.", icon="🗑️")
+                delete_results = gdrive.delete_files_from_drive(image_ids_to_delete)
+            deleted_ids = {image_id for image_id, deleted in delete_results.items() if deleted}
+            if deleted_ids:
+                st.session_state.uploaded_images = [img for img in st.session_state.uploaded_images if img['id'] not in deleted_ids]
+                st.toast(f"이미지 {len(deleted_ids)}개 삭제 완료.", icon="🗑️")
+            if len(deleted_ids) < len(delete_results):
+                st.error(f"이미지 {len(delete_results) - len(deleted_ids)}개 삭제에 실패했습니다.")
+            elif deleted_ids:
                 st.rerun()
-            else:
-                st.error("이미지 삭제에 실패했습니다.")
+
+        if len(current_uploaded_images) > 1:
+            st.button("모든 이미지 삭제", key="del_all_images_btn", type="secondary",
+                      on_click=delete_images_action, args=([img['id'] for img in current_uploaded_images],))
 
         cols_per_row_display = 3
         for i in range(0, len(current_uploaded_images), cols_per_row_display):
@@ -387,14 +406,17 @@ def render_tab1():
             for col_idx, img_info in enumerate(image_info_in_row):
                 with cols_display[col_idx]:
                     try:
+                        if not img_info.get('md5Checksum'):
+                            # 예전에 저장된 견적의 이미지: 버전을 한 번만 조회해 두고 재실행 때는 캐시에서 바로 표시
+                            img_info['md5Checksum'] = gdrive.get_file_version(img_info['id'])
                         with st.spinner(f"'{img_info['name']}' 로딩 중..."):
-                            image_bytes = gdrive.download_file_bytes(img_info['id'])
+                            image_bytes = gdrive.download_file_bytes(img_info['id'], version=img_info.get('md5Checksum'))
                         
                         if image_bytes:
                             st.image(image_bytes, caption=img_info.get('name', '이름없음'), use_container_width=True)
                             delete_btn_key = f"del_btn_{img_info['id']}"
                             st.button(f"삭제", key=delete_btn_key, type="secondary", 
-                                      help=f"{img_info.get('name', '')} 삭제하기", on_click=delete_image_action, args=(img_info['id'],))
+                                      help=f"{img_info.get('name', '')} 삭제하기", on_click=delete_images_action, args=([img_info['id']],))
                         else:
                             st.error(f"'{img_info.get('name', '이름없음')}'\n이미지를 불러올 수 없습니다.")
                     except Exception as img_display_err:
@@ -1,32 +1,24 @@
 # ui_tab3.py
 import streamlit as st
-import pandas as pd
-import io
 import pytz
 from datetime import datetime, date, timedelta
 import traceback
 import re
 import math 
+import threading
 
 try:
     import data
     import utils
     import calculations
-    import pdf_generator
-    import excel_filler
-    import email_utils
     import callbacks
     from state_manager import MOVE_TYPE_OPTIONS # state_manager에서 가져옴
-    import image_generator
+    import lazy_modules
 except ImportError as e:
     st.error(f"UI Tab 3: 필수 모듈 로딩 실패 - {e}")
-    if hasattr(e, "name"):
-        if e.name == "email_utils": st.warning("email_utils.py 로드 실패. 이메일 발송 비활성화.")
-        elif e.name == "pdf_generator": st.warning("pdf_generator.py 로드 실패. PDF 관련 기능 제한 가능.")
-        elif e.name == "image_generator": st.error("image_generator.py 로드 실패! 회사 양식 이미지 생성 비활성화.")
     if "MOVE_TYPE_OPTIONS" not in globals(): # globals()로 전역변수 확인
         MOVE_TYPE_OPTIONS = ["가정 이사 🏠", "사무실 이사 🏢"] 
-    if not all(module_name in globals() for module_name in ["data", "utils", "calculations", "callbacks", "state_manager", "image_generator", "pdf_generator"]):
+    if not all(module_name in globals() for module_name in ["data", "utils", "calculations", "callbacks", "state_manager", "lazy_modules"]):
         st.error("UI Tab 3: 핵심 데이터/유틸리티 모듈 로딩 실패.")
 except Exception as e:
     st.error(f"UI Tab 3: 모듈 로딩 중 오류 - {e}")
@@ -35,6 +27,27 @@ except Exception as e:
         MOVE_TYPE_OPTIONS = ["가정 이사 🏠", "사무실 이사 🏢"]
     st.stop()
 
+# 문서 생성 모듈(reportlab, openpyxl, Pillow 등)은 버튼을 눌러 처음 사용할 때 로드
+pdf_generator = lazy_modules.lazy_import("pdf_generator")
+excel_filler = lazy_modules.lazy_import("excel_filler")
+email_utils = lazy_modules.lazy_import("email_utils")
+image_generator = lazy_modules.lazy_import("image_generator")
+document_pipeline = lazy_modules.lazy_import("document_pipeline")
+
+def modules_ready(*modules):
+    """
+    버튼 처리 직전에 모듈을 실제로 로드합니다. is_available() 은 모듈 파일 존재만 보므로
+    모듈 안의 import 가 실패하는 경우 여기서 오류를 표시하고 False (다음 실행부터는 버튼 비활성화).
+    """
+    for module in modules:
+        try:
+            lazy_modules.ensure_loaded(module)
+        except Exception as e:
+            st.error(f"기능 모듈을 불러오지 못했습니다: {e}")
+            traceback.print_exc()
+            return False
+    return True
+
 def get_method_full_name(method_key):
     method_str = str(st.session_state.get(method_key, '')).strip() 
     method_parts = method_str.split(" ") 
@@ -71,6 +84,65 @@ def get_validation_warnings(state):
             warnings.append("실제 투입 차량 대수가 입력되지 않았습니다. '실제 투입 차량' 섹션에서 각 톤수별 차량 대수를 입력해주세요.")
     return warnings
 
+def get_cost_calculator():
+    """세션별 증분 비용 계산기 (입력이 바뀐 비용 항목만 다시 계산)."""
+    calculator = st.session_state.get("_cost_calculator")
+    if not isinstance(calculator, calculations.IncrementalCostCalculator):
+        calculator = calculations.IncrementalCostCalculator()
+        st.session_state["_cost_calculator"] = calculator
+    return calculator
+
+def build_customer_pdf_args():
+    """고객용 PDF 생성 인자 (PDF 버튼/이메일 발송 공통)."""
+    pdf_specific_state_data, _ = document_pipeline.build_document_states(st.session_state.to_dict())
+
+    return {
+        "state_data": pdf_specific_state_data, 
+        "calculated_cost_items": st.session_state.get("calculated_cost_items_for_pdf", []),
+        "total_cost": st.session_state.get("total_cost_for_pdf", 0),
+        "personnel_info": st.session_state.get("personnel_info_for_pdf", {})
+    }
+
+# document_pipeline 산출물(ARTIFACT_* 이름) -> 개별 생성 버튼이 사용하는 세션 키 / 표시 이름
+ALL_DOCUMENTS_SESSION_KEYS = {
+    'customer_pdf': 'customer_final_pdf_data',
+    'customer_image': 'customer_pdf_image_data_tab3',
+    'internal_image': 'internal_form_image_data_tab3',
+    'internal_excel': 'internal_excel_data_for_download_tab3',
+}
+ALL_DOCUMENTS_LABELS = {
+    'customer_pdf': "고객용 PDF",
+    'customer_image': "고객용 이미지",
+    'internal_image': "내부 양식 이미지",
+    'internal_excel': "내부용 Excel",
+}
+
+def _attach_script_run_ctx_initializer():
+    """작업 스레드에서도 st.* 호출(생성기 내부 st.error 등)이 현재 세션에 표시되도록 실행 컨텍스트를 연결하는 함수."""
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except ImportError:
+        return None
+    script_ctx = get_script_run_ctx()
+    if script_ctx is None:
+        return None
+    return lambda: add_script_run_ctx(threading.current_thread(), script_ctx)
+
+def generate_all_documents_for_session():
+    """비용을 한 번 계산한 뒤 4종 문서를 동시에 생성하고 결과를 각 버튼과 같은 세션 키에 저장합니다."""
+    cost_result = get_cost_calculator().calculate(st.session_state)
+    results = document_pipeline.generate_all_documents(
+        st.session_state.to_dict(), cost_result=cost_result,
+        worker_initializer=_attach_script_run_ctx_initializer()
+    )
+    for artifact_name, session_key in ALL_DOCUMENTS_SESSION_KEYS.items():
+        artifact_data = results.get(artifact_name, {}).get("data")
+        if artifact_data:
+            st.session_state[session_key] = artifact_data
+        elif session_key in st.session_state:
+            del st.session_state[session_key]
+    return results
+
 def format_cost_item_for_detailed_list(name, cost, note, storage_details_text_param=""):
     cost_val = int(float(cost or 0))
     
@@ -327,7 +399,7 @@ def render_tab3():
     final_selected_vehicle_for_calc_val = st.session_state.get("final_selected_vehicle")
     total_cost_display, cost_items_display, personnel_info_display, has_cost_error = 0, [], {}, False
 
-    validation_messages = get_validation_warnings(st.session_state.to_dict())
+    validation_messages = get_validation_warnings(st.session_state)
     if validation_messages:
         warning_html = "<div style='padding:10px; border: 1px solid #FFC107; background-color: #FFF3CD; border-radius: 5px; color: #664D03; margin-bottom: 15px;'>"
         warning_html += "<h5 style='margin-top:0; margin-bottom:10px;'>다음 필수 정보를 확인하거나 수정해주세요:</h5><ul style='margin-bottom: 0px; padding-left: 20px;'>"
@@ -350,9 +422,9 @@ def render_tab3():
                     if isinstance(m_dt, date) and (not isinstance(a_dt, date) or a_dt < m_dt) : 
                          st.session_state.arrival_date = m_dt + timedelta(days=1) 
 
-            current_state_dict = st.session_state.to_dict()
-            if hasattr(calculations, "calculate_total_moving_cost") and callable(calculations.calculate_total_moving_cost):
-                total_cost_display, cost_items_display, personnel_info_display = calculations.calculate_total_moving_cost(current_state_dict)
+            if hasattr(calculations, "IncrementalCostCalculator"):
+                # session_state 를 복사하지 않고 그대로 넘김 - 바뀐 입력에 해당하는 항목만 재계산
+                total_cost_display, cost_items_display, personnel_info_display = get_cost_calculator().calculate(st.session_state)
                 st.session_state.update({
                     "calculated_cost_items_for_pdf": cost_items_display,
                     "total_cost_for_pdf": total_cost_display,
@@ -781,32 +853,40 @@ def render_tab3():
                           st.session_state.get("total_cost_for_pdf", 0) > 0
     actions_disabled = not can_generate_anything
 
+    all_documents_possible = can_generate_anything and all(
+        lazy_modules.is_available(module) for module in (document_pipeline, pdf_generator, image_generator, excel_filler)
+    )
+    if st.button("모든 견적 파일 한 번에 생성", key="generate_all_documents_btn_tab3", disabled=actions_disabled or not all_documents_possible) \
+            and modules_ready(document_pipeline, pdf_generator, image_generator, excel_filler):
+        with st.spinner("고객용 PDF/이미지, 내부용 양식 이미지/Excel 동시 생성 중..."):
+            all_documents_results = generate_all_documents_for_session()
+        failed_labels = [label for artifact_name, label in ALL_DOCUMENTS_LABELS.items()
+                         if not all_documents_results.get(artifact_name, {}).get("data")]
+        timing_text = ", ".join(
+            f"{label} {all_documents_results[artifact_name]['seconds']:.2f}초"
+            for artifact_name, label in ALL_DOCUMENTS_LABELS.items() if artifact_name in all_documents_results
+        )
+        if failed_labels:
+            st.error(f"일부 파일 생성 실패: {', '.join(failed_labels)}")
+        else:
+            st.success("모든 견적 파일 생성 완료! 아래에서 다운로드하세요.")
+        st.caption(f"총 {all_documents_results['total_seconds']:.2f}초 (비용 계산 {all_documents_results['cost_seconds']:.2f}초 / {timing_text})")
+
     with st.container(border=True):
         st.markdown("**고객 전달용 파일**")
         col_pdf_btn, col_pdf_img_btn = st.columns(2)
 
-        pdf_generation_possible = hasattr(pdf_generator, "generate_pdf") and callable(pdf_generator.generate_pdf) and can_generate_anything
-        pdf_to_image_possible = hasattr(pdf_generator, "generate_quote_image_from_pdf") and callable(pdf_generator.generate_quote_image_from_pdf) and pdf_generation_possible
+        pdf_generation_possible = lazy_modules.is_available(pdf_generator) and lazy_modules.is_available(document_pipeline) and can_generate_anything
+        pdf_to_image_possible = pdf_generation_possible
+        # pillow 모드는 PDF 레이아웃을 직접 그리므로 PDF 를 먼저 만들 필요가 없음
+        # (화면 출력만으로 pdf_generator 를 로드하지 않도록 로드 전에는 확인 생략 - poppler 모드도 이미지 생성 시 PDF 를 직접 만듦)
+        quote_image_needs_pdf = lazy_modules.is_loaded(pdf_generator) and getattr(pdf_generator, "QUOTE_IMAGE_RENDER_MODE", "poppler") == "poppler"
 
         with col_pdf_btn:
-            if st.button("고객용 PDF 생성", key="generate_customer_pdf_btn_tab3", disabled=actions_disabled or not pdf_generation_possible):
-                current_session_data_for_pdf = st.session_state.to_dict()
-                pdf_specific_state_data = current_session_data_for_pdf.copy()
-                pdf_specific_state_data['from_location'] = current_session_data_for_pdf.get('from_address_full', '-')
-                pdf_specific_state_data['to_location'] = current_session_data_for_pdf.get('to_address_full', '-')
-                if current_session_data_for_pdf.get('has_via_point', False):
-                    pdf_specific_state_data['via_point_location'] = current_session_data_for_pdf.get('via_point_address', '-')
-                else:
-                    pdf_specific_state_data['via_point_location'] = '-'
-
-                pdf_args_to_pass = {
-                    "state_data": pdf_specific_state_data, 
-                    "calculated_cost_items": st.session_state.get("calculated_cost_items_for_pdf", []),
-                    "total_cost": st.session_state.get("total_cost_for_pdf", 0),
-                    "personnel_info": st.session_state.get("personnel_info_for_pdf", {})
-                }
+            if st.button("고객용 PDF 생성", key="generate_customer_pdf_btn_tab3", disabled=actions_disabled or not pdf_generation_possible) \
+                    and modules_ready(document_pipeline, pdf_generator):
                 with st.spinner("고객용 PDF 생성 중..."):
-                    pdf_data = pdf_generator.generate_pdf(**pdf_args_to_pass) 
+                    pdf_data = pdf_generator.get_or_generate_pdf(**build_customer_pdf_args())
                 if pdf_data:
                     st.session_state['customer_final_pdf_data'] = pdf_data
                     st.success("고객용 PDF 생성 완료!")
@@ -825,11 +905,11 @@ def render_tab3():
 
         with col_pdf_img_btn: 
             if pdf_to_image_possible:
-                if st.button("고객용 견적서 이미지 생성 (PDF기반)", key="generate_customer_pdf_image_btn_tab3", disabled=actions_disabled or not st.session_state.get('customer_final_pdf_data')):
+                if st.button("고객용 견적서 이미지 생성 (PDF기반)", key="generate_customer_pdf_image_btn_tab3", disabled=actions_disabled or (quote_image_needs_pdf and not st.session_state.get('customer_final_pdf_data'))) \
+                        and modules_ready(document_pipeline, pdf_generator):
                     with st.spinner("PDF 기반 고객용 이미지 생성 중..."):
-                        pdf_to_convert = st.session_state.get('customer_final_pdf_data')
-                        if pdf_to_convert:
-                            img_data_from_pdf = pdf_generator.generate_quote_image_from_pdf(pdf_to_convert) 
+                        if not quote_image_needs_pdf or st.session_state.get('customer_final_pdf_data'):
+                            img_data_from_pdf = pdf_generator.generate_quote_image(**build_customer_pdf_args()) 
                             if img_data_from_pdf:
                                 st.session_state['customer_pdf_image_data_tab3'] = img_data_from_pdf
                                 st.success("PDF 기반 고객용 이미지 생성 완료!")
@@ -853,10 +933,11 @@ def render_tab3():
         st.markdown("**내부 검토용 파일**")
         col_internal_img_btn, col_internal_excel_btn = st.columns(2)
         
-        company_image_possible = hasattr(image_generator, "create_quote_image") and callable(image_generator.create_quote_image) and can_generate_anything
+        company_image_possible = lazy_modules.is_available(image_generator) and can_generate_anything
 
         with col_internal_img_btn:
-            if st.button("내부 검토용 양식 이미지 생성", key="generate_internal_form_image_btn_tab3", disabled=actions_disabled or not company_image_possible):
+            if st.button("내부 검토용 양식 이미지 생성", key="generate_internal_form_image_btn_tab3", disabled=actions_disabled or not company_image_possible) \
+                    and modules_ready(image_generator):
                 current_session_data_for_img = st.session_state.to_dict()
                 img_specific_state_data = current_session_data_for_img.copy()
                 img_specific_state_data['from_location'] = current_session_data_for_img.get('from_address_full', '-')
@@ -889,8 +970,9 @@ def render_tab3():
                 )
         
         with col_internal_excel_btn:
-            excel_possible = hasattr(excel_filler, "fill_final_excel_template") and callable(excel_filler.fill_final_excel_template) and can_generate_anything
-            if st.button("내부용 Excel 생성", key="generate_internal_excel_btn_tab3", disabled=actions_disabled or not excel_possible):
+            excel_possible = lazy_modules.is_available(excel_filler) and can_generate_anything
+            if st.button("내부용 Excel 생성", key="generate_internal_excel_btn_tab3", disabled=actions_disabled or not excel_possible) \
+                    and modules_ready(excel_filler):
                 if excel_possible:
                     _current_state_excel_orig = st.session_state.to_dict()
                     excel_specific_state_data = _current_state_excel_orig.copy()
@@ -899,7 +981,7 @@ def render_tab3():
                     if _current_state_excel_orig.get('has_via_point', False):
                         excel_specific_state_data['via_point_location'] = _current_state_excel_orig.get('via_point_address', '-')
                     
-                    _total_cost_excel_calc, _cost_items_excel_calc, _personnel_info_excel_calc = calculations.calculate_total_moving_cost(st.session_state.to_dict())
+                    _total_cost_excel_calc, _cost_items_excel_calc, _personnel_info_excel_calc = get_cost_calculator().calculate(st.session_state)
 
                     with st.spinner("내부용 Excel 파일 생성 중..."):
                         filled_excel_data_dl = excel_filler.fill_final_excel_template(
@@ -923,32 +1005,19 @@ def render_tab3():
     with st.container(border=True):
         st.markdown("**이메일 발송 (고객용 PDF 첨부)**")
         email_recipient_exists = bool(st.session_state.get("customer_email", "").strip())
-        email_modules_ok = hasattr(email_utils, "send_quote_email") and callable(email_utils.send_quote_email) and hasattr(pdf_generator, "generate_pdf") and callable(pdf_generator.generate_pdf)
+        email_modules_ok = lazy_modules.is_available(email_utils) and lazy_modules.is_available(pdf_generator) and lazy_modules.is_available(document_pipeline)
         email_possible = email_modules_ok and can_generate_anything and email_recipient_exists
 
-        if st.button("이메일 발송", key="email_send_button_main_tab3", disabled=actions_disabled or not email_possible):
+        if st.button("이메일 발송", key="email_send_button_main_tab3", disabled=actions_disabled or not email_possible) \
+                and modules_ready(document_pipeline, email_utils, pdf_generator):
             recipient_email_send = st.session_state.get("customer_email")
             customer_name_send = st.session_state.get("customer_name", "고객")
 
-            pdf_email_bytes_send = st.session_state.get('customer_final_pdf_data')
-            if not pdf_email_bytes_send and pdf_generation_possible:
-                current_session_data_for_email_pdf = st.session_state.to_dict()
-                email_pdf_specific_state_data = current_session_data_for_email_pdf.copy()
-                email_pdf_specific_state_data['from_location'] = current_session_data_for_email_pdf.get('from_address_full', '-')
-                email_pdf_specific_state_data['to_location'] = current_session_data_for_email_pdf.get('to_address_full', '-')
-                if current_session_data_for_email_pdf.get('has_via_point', False):
-                    email_pdf_specific_state_data['via_point_location'] = current_session_data_for_email_pdf.get('via_point_address', '-')
-                else:
-                    email_pdf_specific_state_data['via_point_location'] = '-'
-                
-                email_pdf_args_to_pass = {
-                    "state_data": email_pdf_specific_state_data,
-                    "calculated_cost_items": st.session_state.get("calculated_cost_items_for_pdf", []),
-                    "total_cost": st.session_state.get("total_cost_for_pdf", 0),
-                    "personnel_info": st.session_state.get("personnel_info_for_pdf", {})
-                }
-                with st.spinner("이메일 첨부용 PDF 생성 중..."):
-                    pdf_email_bytes_send = pdf_generator.generate_pdf(**email_pdf_args_to_pass)
+            pdf_email_bytes_send = None
+            if pdf_generation_possible:
+                # 현재 견적 입력과 같은 PDF 가 이미 생성되어 있으면 캐시에서 재사용
+                with st.spinner("이메일 첨부용 PDF 준비 중..."):
+                    pdf_email_bytes_send = pdf_generator.get_or_generate_pdf(**build_customer_pdf_args())
                 if pdf_email_bytes_send:
                      st.session_state['customer_final_pdf_data'] = pdf_email_bytes_send
 
@@ -11,6 +11,8 @@ except ImportError:
     print("Warning [utils.py]: data.py not found, get_item_qty might not work correctly.")
     data = None
 
+import item_catalog
+
 def get_current_kst_time_str(format="%Y-%m-%d %H:%M"):
     """
     현재 한국 표준시(KST) 기준의 날짜와 시간을 지정된 형식의 문자열로 반환합니다.
@@ -61,28 +63,19 @@ def get_item_qty(state_data, item_name_to_find):
         # print(f"Warning [get_item_qty]: base_move_type not found in state_data for item '{item_name_to_find}'")
         return 0 # 이사 유형 없으면 검색 불가
 
-    # 해당 이사 유형의 품목 정의 가져오기
-    item_definitions_for_type = data.item_definitions.get(current_move_type, {})
-    if isinstance(item_definitions_for_type, dict):
-        # 정의된 모든 섹션 순회
-        for section, item_list in item_definitions_for_type.items():
-            # 품목 리스트가 리스트 형태이고, 찾는 품목이 리스트 안에 있으면
-            if isinstance(item_list, list) and item_name_to_find in item_list:
-                # 해당 품목의 state_data 키 생성
-                key = f"qty_{current_move_type}_{section}_{item_name_to_find}"
-                # state_data에 키가 존재하면 값 반환 시도
-                if key in state_data:
-                    try:
-                        # state_data 값 가져오기 (None일 경우 0으로 처리)
-                        value = state_data.get(key, 0)
-                        # 정수로 변환하여 반환 (변환 실패 시 0 반환)
-                        return int(value or 0)
-                    except (ValueError, TypeError):
-                        # print(f"Warning [get_item_qty]: Could not convert value for key '{key}' to int.")
-                        return 0 # 변환 실패 시 0 반환
-                # else: 키가 state_data에 없으면 다음 섹션 검색 계속
-    else:
-         print(f"Warning [get_item_qty]: item_definitions for '{current_move_type}' is not a dictionary.")
+    # 품목이 속한 섹션별 키를 카탈로그에서 바로 조회 (섹션 순서 유지)
+    for key in item_catalog.CATALOG.qty_keys_for_item(current_move_type, item_name_to_find):
+        # state_data에 키가 존재하면 값 반환 시도
+        if key in state_data:
+            try:
+                # state_data 값 가져오기 (None일 경우 0으로 처리)
+                value = state_data.get(key, 0)
+                # 정수로 변환하여 반환 (변환 실패 시 0 반환)
+                return int(value or 0)
+            except (ValueError, TypeError):
+                # print(f"Warning [get_item_qty]: Could not convert value for key '{key}' to int.")
+                return 0 # 변환 실패 시 0 반환
+        # else: 키가 state_data에 없으면 다음 섹션 검색 계속
 
 
     # 모든 섹션에서 못 찾았으면 0 반환